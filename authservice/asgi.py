@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'authservice.settings')
 
 application = get_asgi_application()
+
+# Después de cargar Django: el SDK de LaunchDarkly se conecta sin demorar el arranque.
+from feature_flags.ld_client import iniciar_en_segundo_plano  # noqa: E402
+
+iniciar_en_segundo_plano()
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 from email.policy import default
+from datetime import timedelta
 from pathlib import Path
 from decouple import config
 
@@ -24,7 +25,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = config('SECRET_KEY')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = config('DEBUG', default=True)
+DEBUG = config('DEBUG', default=True, cast=bool)
 
 ALLOWED_HOSTS = ["*"]
 
@@ -38,6 +39,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework.authtoken',
     'users',
@@ -52,6 +54,7 @@ MIDDLEWARE = [
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'feature_flags.middleware.FeatureFlagsMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
@@ -77,6 +80,30 @@ WSGI_APPLICATION = 'authservice.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
+#
+# Conexiones (ver "Conexiones a la Base de Datos" en el README):
+# - DB_POOL_ENABLED=true: pool nativo de psycopg 3 por proceso. Es el modo para
+#   SERVER_MODE=asgi, donde cada petición corre en un hilo distinto y una
+#   conexión persistente por hilo no se reutilizaría.
+# - Si no, DB_CONN_MAX_AGE > 0 mantiene abierta la conexión de cada hilo entre
+#   peticiones (0 = una conexión por petición). runserver cierra todas las
+#   conexiones tras cada petición, así que con él no tiene efecto.
+# - DB_PGBOUNCER=true: detrás de un pooler en modo transacción; sin cursores
+#   del lado del servidor, que no sobreviven entre transacciones (la
+#   exportación pagina por id en su lugar).
+DB_POOL_ENABLED = config('DB_POOL_ENABLED', default=False, cast=bool)
+DB_PGBOUNCER = config('DB_PGBOUNCER', default=False, cast=bool)
+DB_OPTIONS = {}
+if DB_POOL_ENABLED:
+    DB_OPTIONS['pool'] = {
+        'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+        'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+        # Segundos de espera por una conexión libre antes de fallar.
+        'timeout': config('DB_POOL_TIMEOUT', default=10, cast=float),
+        'max_lifetime': config('DB_POOL_MAX_LIFETIME', default=1800, cast=float),
+        'max_idle': config('DB_POOL_MAX_IDLE', default=300, cast=float),
+    }
+
 DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.postgresql',
@@ -85,6 +112,13 @@ DATABASES = {
             'PASSWORD': config('POSTGRES_PASSWORD'),
             'HOST': config('POSTGRES_HOST', default='localhost'),
             'PORT': config('POSTGRES_PORT', default='5432'),
+            # El pool de psycopg requiere CONN_MAX_AGE = 0.
+            'CONN_MAX_AGE': 0 if DB_POOL_ENABLED else config('DB_CONN_MAX_AGE', default=0, cast=int),
+            # Verifica la conexión reutilizada (o la que entrega el pool) antes de
+            # usarla y descarta las que el servidor o la red cortaron.
+            'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
+            'DISABLE_SERVER_SIDE_CURSORS': DB_PGBOUNCER,
+            'OPTIONS': DB_OPTIONS,
             'TEST': {
                 'NAME': 'test_authservice_db',
             }
@@ -96,7 +130,14 @@ LAUNCHDARKLY_CONFIG = {
     'connect_timeout': 5,
     'read_timeout': 10,
     'events_max_pending': 10000,
+    # Segundos que /api/ready/ espera la conexión inicial antes de dar el pod por listo.
+    'start_wait': config('LAUNCHDARKLY_START_WAIT', default=5, cast=float),
 }
+# Sin flags activos cada flag toma su valor por defecto (feature_flags/flags.py)
+# y no se crea el cliente de LaunchDarkly.
+FEATURE_FLAGS_ENABLED = config('FEATURE_FLAGS_ENABLED', default=False, cast=bool)
+# Archivo JSON con los flags (fuente de datos local, sin conexión a LaunchDarkly).
+LAUNCHDARKLY_FLAGS_FILE = config('LAUNCHDARKLY_FLAGS_FILE', default='')
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -117,6 +158,27 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# El primer hasher define el formato de los hashes nuevos. PBKDF2 se calcula
+# en un pool acotado; si está lleno las peticiones reciben 503 + Retry-After.
+PASSWORD_HASHERS = [
+    'users.hashers.PBKDF2PoolPasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+# Costo de PBKDF2. Calibrar con `python manage.py calibrar_hasher`; los hashes
+# con otro costo se recalculan en el siguiente login exitoso.
+PASSWORD_HASH_ITERATIONS = config('PASSWORD_HASH_ITERATIONS', default=1_000_000, cast=int)
+
+PASSWORD_HASHING_POOL = {
+    'WORKERS': config('PASSWORD_HASHING_WORKERS', default=1, cast=int),
+    'QUEUE': config('PASSWORD_HASHING_QUEUE', default=4, cast=int),
+    'RETRY_AFTER': config('PASSWORD_HASHING_RETRY_AFTER', default=1, cast=int),
+}
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.0/topics/i18n/
 
@@ -139,8 +201,125 @@ STATIC_ROOT = BASE_DIR / 'static'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Máximo de filas por petición a /api/register/bulk/ (el comando
+# importar_usuarios no tiene límite: procesa el archivo por lotes). Cada fila
+# es un hash PBKDF2 dentro de la petición: con el costo por defecto y 4 hilos,
+# 200 filas toman unos segundos.
+BULK_IMPORT_MAX_FILAS = config('BULK_IMPORT_MAX_FILAS', default=200, cast=int)
+
+# Hilos del pool de hashing propio de /api/register/bulk/ y del comando
+# importar_usuarios (separado del pool de login y registro).
+BULK_IMPORT_HASHING_WORKERS = config('BULK_IMPORT_HASHING_WORKERS', default=4, cast=int)
+
+# Máximo de identificadores (ids + nombres) por petición a /api/users/batch/.
+BATCH_MAX_USUARIOS = config('BATCH_MAX_USUARIOS', default=100, cast=int)
+
+# Filas por bloque del cursor del servidor en /api/users/export/.
+EXPORTACION_CHUNK_SIZE = config('EXPORTACION_CHUNK_SIZE', default=2000, cast=int)
+
+# Días de historial completo del outbox de cambios (/api/users/changes/);
+# compactar_cambios solo compacta lo anterior.
+CAMBIOS_RETENCION_DIAS = config('CAMBIOS_RETENCION_DIAS', default=7, cast=int)
+
+# Despachador de webhooks (python manage.py despachar_webhooks). Reintentos
+# con backoff exponencial: BACKOFF * 2^n segundos, hasta BACKOFF_MAXIMO.
+WEBHOOKS = {
+    'WORKERS': config('WEBHOOKS_WORKERS', default=4, cast=int),
+    'LOTE': config('WEBHOOKS_LOTE', default=100, cast=int),
+    'TIMEOUT': config('WEBHOOKS_TIMEOUT', default=5, cast=float),
+    'REINTENTOS': config('WEBHOOKS_REINTENTOS', default=3, cast=int),
+    'BACKOFF': config('WEBHOOKS_BACKOFF', default=0.5, cast=float),
+    'BACKOFF_MAXIMO': config('WEBHOOKS_BACKOFF_MAXIMO', default=300, cast=float),
+    'INTERVALO': config('WEBHOOKS_INTERVALO', default=1, cast=float),
+}
+
+# Límites por token bucket ("N/s|min|h") por IP y por nombre_usuario. Con
+# BACKEND='cache' además se usa un bucket compartido en CACHES[CACHE_ALIAS].
+RATE_LIMITS = {
+    'ENABLED': config('RATE_LIMITS_ENABLED', default=True, cast=bool),
+    'BACKEND': config('RATE_LIMITS_BACKEND', default='local'),
+    'CACHE_ALIAS': config('RATE_LIMITS_CACHE_ALIAS', default='default'),
+    'CONFIAR_X_FORWARDED_FOR': config('RATE_LIMITS_TRUST_X_FORWARDED_FOR', default=False, cast=bool),
+    'ENDPOINTS': {
+        'login': {
+            'ip': config('RATE_LIMIT_LOGIN_IP', default='30/min'),
+            'usuario': config('RATE_LIMIT_LOGIN_USUARIO', default='10/min'),
+        },
+        'register': {
+            'ip': config('RATE_LIMIT_REGISTER_IP', default='30/min'),
+        },
+    },
+    'FALLOS_LOGIN': {
+        'UMBRAL': config('LOGIN_FALLOS_UMBRAL', default=5, cast=int),
+        'VENTANA': config('LOGIN_FALLOS_VENTANA', default=300, cast=int),
+    },
+}
+
+# Credencial de los servicios internos para /api/introspect/ (header
+# X-Authservice-Clave). Vacía, el endpoint rechaza todas las peticiones.
+INTROSPECCION_CLAVE = config('INTROSPECCION_CLAVE', default='')
+
+# Tokens JWT firmados (RS256). Conviven con los tokens opacos de authtoken:
+# con JWT_ENABLED el login devuelve ambos.
+JWT_ENABLED = config('JWT_ENABLED', default=False, cast=bool)
+JWT_PRIVATE_KEY = config('JWT_PRIVATE_KEY', default='').replace('\\n', '\n')
+JWT_PUBLIC_KEY = config('JWT_PUBLIC_KEY', default='').replace('\\n', '\n')
+JWT_KEY_ID = config('JWT_KEY_ID', default='authservice-1')
+
+SIMPLE_JWT = {
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=config('JWT_ACCESS_MINUTES', default=5, cast=int)),
+    'REFRESH_TOKEN_LIFETIME': timedelta(hours=config('JWT_REFRESH_HOURS', default=24, cast=int)),
+    'ALGORITHM': 'RS256',
+    'ISSUER': 'authservice',
+    'USER_ID_FIELD': 'id',
+    'USER_ID_CLAIM': 'id',
+    'AUTH_HEADER_TYPES': ('Bearer',),
+    'AUTH_TOKEN_CLASSES': ('users.tokens.UsuarioAccessToken',),
+    'UPDATE_LAST_LOGIN': False,
+}
+
+# Vigencia de los tokens opacos de authtoken (0 = sin vencimiento). Con
+# AUTH_TOKEN_SLIDING, usarlos pasada la mitad de su vigencia la renueva.
+AUTH_TOKEN_LIFETIME = config('AUTH_TOKEN_LIFETIME_HOURS', default=24, cast=int) * 3600
+AUTH_TOKEN_SLIDING = config('AUTH_TOKEN_SLIDING', default=True, cast=bool)
+
+# Caché token → usuario de CachedTokenAuthentication. SHARED_ALIAS activa el
+# segundo nivel en la caché de Django (compartida entre pods si el backend lo es).
+TOKEN_AUTH_CACHE = {
+    'MAX_ENTRIES': config('TOKEN_AUTH_CACHE_MAX_ENTRIES', default=10000, cast=int),
+    'TTL': config('TOKEN_AUTH_CACHE_TTL', default=30, cast=int),
+    'SHARED_ALIAS': config('TOKEN_AUTH_CACHE_ALIAS', default='') or None,
+    'SHARED_TTL': config('TOKEN_AUTH_CACHE_SHARED_TTL', default=300, cast=int),
+}
+
+# Caché de lectura de /api/users/<nombre_usuario>/ (users/cache_usuarios.py).
+# Mismo esquema que TOKEN_AUTH_CACHE: L1 en memoria y L2 opcional.
+USER_DETAIL_CACHE = {
+    'MAX_ENTRIES': config('USER_DETAIL_CACHE_MAX_ENTRIES', default=10000, cast=int),
+    'TTL': config('USER_DETAIL_CACHE_TTL', default=10, cast=int),
+    'SHARED_ALIAS': config('USER_DETAIL_CACHE_ALIAS', default='') or None,
+    'SHARED_TTL': config('USER_DETAIL_CACHE_SHARED_TTL', default=300, cast=int),
+}
+
 REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'users.authentication.CachedTokenAuthentication',
+        'rest_framework.authentication.SessionAuthentication',
+        'rest_framework.authentication.BasicAuthentication',
+    ] + (['rest_framework_simplejwt.authentication.JWTAuthentication'] if JWT_ENABLED else []),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
-    ]
+    ],
+    # JSON con orjson; MessagePack con Accept/Content-Type: application/msgpack.
+    'DEFAULT_RENDERER_CLASSES': [
+        'users.renderers.ORJSONRenderer',
+        'users.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'users.renderers.ORJSONParser',
+        'users.renderers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
@@ -35,5 +35,35 @@ else
   echo "No se creará superusuario: faltan valores DJANGO_SUPERUSER_*"
 fi
 
-# Iniciar Django (puedes cambiar a gunicorn si es para prod)
+# CPUs disponibles según el límite del cgroup (v2: cpu.max, v1: cfs_quota_us),
+# redondeado hacia arriba; sin límite se usa nproc.
+cpus_cgroup() {
+  local cuota="" periodo=""
+  if [ -f /sys/fs/cgroup/cpu.max ]; then
+    read -r cuota periodo < /sys/fs/cgroup/cpu.max
+  elif [ -f /sys/fs/cgroup/cpu/cpu.cfs_quota_us ]; then
+    cuota=$(cat /sys/fs/cgroup/cpu/cpu.cfs_quota_us)
+    periodo=$(cat /sys/fs/cgroup/cpu/cpu.cfs_period_us)
+  fi
+  if [[ -n "$cuota" ]] && [[ "$cuota" != "max" ]] && [[ "$cuota" -gt 0 ]]; then
+    echo $(( (cuota + periodo - 1) / periodo ))
+  else
+    nproc
+  fi
+}
+
+# SERVER_MODE=asgi: producción con uvicorn sobre authservice/asgi.py, un worker
+# por CPU del límite del pod (WEB_CONCURRENCY lo reemplaza). Por defecto,
+# servidor de desarrollo.
+if [[ "${SERVER_MODE:-runserver}" == "asgi" ]]; then
+  WORKERS="${WEB_CONCURRENCY:-$(cpus_cgroup)}"
+  echo "Iniciando uvicorn con $WORKERS worker(s)..."
+  exec uvicorn authservice.asgi:application \
+    --host 0.0.0.0 --port 8010 \
+    --workers "$WORKERS" \
+    --lifespan off \
+    --no-access-log \
+    --timeout-graceful-shutdown 20
+fi
+
 exec python manage.py runserver 0.0.0.0:8010
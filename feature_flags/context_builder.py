@@ -1,10 +1,14 @@
 def user_context(user):
+    # Diferido: el SDK se carga con la primera evaluación, no al arrancar.
+    from ldclient import Context
+
     if not user or not user.is_authenticated:
-        return {"kind": "user", "key": "anonymous"}
+        return Context.builder("anonymous").kind("user").anonymous(True).build()
 
-    return {
-        "kind": "user",
-        "key": str(user.id),
-        "email": user.email,
-        "role": getattr(user, "role", "user")
-    }
+    return (
+        Context.builder(str(user.id))
+        .kind("user")
+        .set("email", user.email_usuario)
+        .set("rol", user.rol)
+        .build()
+    )
@@ -6,3 +6,14 @@ ENABLE_USER_UPDATE = "enable-user-update"
 ENABLE_USER_DELETE = "enable-user-delete"
 ENABLE_USER_LIST = "enable-user-list"
 ENABLE_LOGIN = "enable-login"
+
+# Valor usado cuando los flags están desactivados, el cliente aún no conecta
+# o LaunchDarkly no conoce el flag: las funcionalidades quedan habilitadas.
+DEFAULTS = {
+    ENABLE_USER_REGISTRATION: True,
+    ENABLE_USER_DETAIL: True,
+    ENABLE_USER_UPDATE: True,
+    ENABLE_USER_DELETE: True,
+    ENABLE_USER_LIST: True,
+    ENABLE_LOGIN: True,
+}
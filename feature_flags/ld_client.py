@@ -1,4 +1,124 @@
-from ldclient.client import LDClient  
+"""
+Cliente único de LaunchDarkly del proceso.
+
+Se crea en el primer uso, no al importar: los comandos de gestión, las
+migraciones y los tests que no evalúan flags no abren conexiones. Con
+`LAUNCHDARKLY_FLAGS_FILE` los flags se leen de un archivo JSON local (tests y
+desarrollo) en lugar del streaming de LaunchDarkly.
+
+Los servidores (authservice/wsgi.py y asgi.py) llaman a
+`iniciar_en_segundo_plano()`: el cliente, el plugin de observabilidad y
+OpenTelemetry se cargan en un hilo aparte mientras el proceso ya atiende, y
+`/api/ready/` responde 503 hasta que el cliente conecta o vence
+`LAUNCHDARKLY_START_WAIT`. Vencido el plazo el pod queda listo igual y los
+flags usan su valor por defecto hasta que la conexión se complete.
+"""
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING
+
 from django.conf import settings
 
-ld_client = LDClient(settings.LAUNCHDARKLY_SDK_KEY)
+if TYPE_CHECKING:
+    from ldclient.client import LDClient
+    from ldclient.config import Config
+
+logger = logging.getLogger(__name__)
+
+_cliente = None
+_lock = threading.Lock()
+_listo = threading.Event()
+_hilo = None
+
+
+def _configuracion() -> 'Config':
+    from ldclient.config import Config, HTTPConfig
+
+    opciones = getattr(settings, 'LAUNCHDARKLY_CONFIG', {})
+    archivo = getattr(settings, 'LAUNCHDARKLY_FLAGS_FILE', '')
+    if archivo:
+        from ldclient.integrations import Files
+
+        return Config(
+            settings.LAUNCHDARKLY_SDK_KEY,
+            update_processor_class=Files.new_data_source(paths=[archivo]),
+            send_events=False,
+        )
+
+    from ldobserve import ObservabilityPlugin
+
+    return Config(
+        settings.LAUNCHDARKLY_SDK_KEY,
+        http=HTTPConfig(
+            connect_timeout=opciones.get('connect_timeout', 5),
+            read_timeout=opciones.get('read_timeout', 10),
+        ),
+        events_max_pending=opciones.get('events_max_pending', 10000),
+        plugins=[ObservabilityPlugin()],
+    )
+
+
+def obtener_cliente() -> 'LDClient':
+    global _cliente
+    if _cliente is None:
+        with _lock:
+            if _cliente is None:
+                from ldclient.client import LDClient
+
+                # start_wait=0: no bloquea la petición que lo crea. Hasta
+                # completar la conexión los flags toman su valor por defecto.
+                _cliente = LDClient(_configuracion(), start_wait=0)
+    return _cliente
+
+
+def reiniciar_cliente() -> None:
+    global _cliente
+    global _hilo
+    with _lock:
+        if _cliente is not None:
+            _cliente.close()
+        _cliente = None
+        _hilo = None
+        _listo.clear()
+
+
+def _inicializar(espera: float) -> None:
+    try:
+        cliente = obtener_cliente()
+        limite = time.monotonic() + espera
+        while not cliente.is_initialized() and time.monotonic() < limite:
+            time.sleep(0.05)
+        if not cliente.is_initialized():
+            logger.warning('LaunchDarkly no conectó en %.1f s; se usan los valores por defecto de los flags.', espera)
+    except Exception:
+        logger.exception('No se pudo crear el cliente de LaunchDarkly.')
+    finally:
+        _listo.set()
+
+
+def iniciar_en_segundo_plano() -> None:
+    """
+    Crea el cliente en un hilo daemon. Sin flags activos el proceso queda
+    listo de inmediato.
+    """
+    global _hilo
+    if not getattr(settings, 'FEATURE_FLAGS_ENABLED', False):
+        _listo.set()
+        return
+    with _lock:
+        if _hilo is not None:
+            return
+        espera = getattr(settings, 'LAUNCHDARKLY_CONFIG', {}).get('start_wait', 5)
+        _hilo = threading.Thread(target=_inicializar, args=(espera,), name='launchdarkly-init', daemon=True)
+        _hilo.start()
+
+
+def cliente_listo() -> bool:
+    """
+    True cuando el proceso puede recibir tráfico: flags desactivados, cliente
+    conectado o plazo de conexión vencido.
+    """
+    if not getattr(settings, 'FEATURE_FLAGS_ENABLED', False):
+        return True
+    return _listo.is_set()
@@ -0,0 +1,62 @@
+"""
+Evaluación de flags una vez por petición.
+
+El middleware deja en `request.feature_flags` un objeto perezoso: el primer
+`flag_activo()` evalúa todos los flags con `all_flags_state` y los siguientes
+son búsquedas en el diccionario resultante. La evaluación ocurre dentro de la
+vista, cuando DRF ya autenticó al usuario, y las peticiones que no consultan
+flags no llaman al SDK.
+
+El middleware admite peticiones síncronas y async: bajo ASGI no obliga a
+Django a pasar cada petición a un hilo (las vistas async siguen en el event
+loop).
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from .flags import DEFAULTS
+from .provider import evaluar_flags
+
+
+class FlagsPeticion:
+    def __init__(self):
+        self._valores = None
+
+    def valores(self, user) -> dict:
+        if self._valores is None:
+            self._valores = evaluar_flags(user)
+        return self._valores
+
+    def activo(self, flag: str, user) -> bool:
+        return bool(self.valores(user).get(flag, DEFAULTS.get(flag, False)))
+
+
+class FeatureFlagsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        request.feature_flags = FlagsPeticion()
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        request.feature_flags = FlagsPeticion()
+        return await self.get_response(request)
+
+
+def flag_activo(request, flag: str) -> bool:
+    """
+    `request` puede ser la petición de Django o la de DRF (que delega los
+    atributos en la primera).
+    """
+    flags = getattr(request, 'feature_flags', None)
+    if flags is None:
+        flags = request.feature_flags = FlagsPeticion()
+    return flags.activo(flag, getattr(request, 'user', None))
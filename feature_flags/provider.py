@@ -1,4 +1,26 @@
-from .ld_client import ld_client
+from django.conf import settings
+
+from .context_builder import user_context
+from .ld_client import obtener_cliente
+
+
+def evaluar_flags(user) -> dict:
+    """
+    Evalúa todos los flags para `user` en una sola llamada al SDK.
+
+    Retorna {} (valores por defecto) si los flags están desactivados o el
+    cliente todavía no está inicializado.
+    """
+    if not settings.FEATURE_FLAGS_ENABLED:
+        return {}
+    cliente = obtener_cliente()
+    if not cliente.is_initialized():
+        return {}
+    estado = cliente.all_flags_state(user_context(user))
+    return estado.to_values_map() if estado.valid else {}
+
 
 def is_enabled(flag_key, context, default=False):
-    return ld_client.variation(flag_key, context, default)
+    if not settings.FEATURE_FLAGS_ENABLED:
+        return default
+    return obtener_cliente().variation(flag_key, context, default)
@@ -2,11 +2,6 @@
 """Django's command-line utility for administrative tasks."""
 import os
 import sys
-import ldclient
-from ldclient import Context
-from ldobserve import ObservabilityPlugin
-from ldclient.config import Config
-from decouple import config
 
 def main():
     """Run administrative tasks."""
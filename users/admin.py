@@ -1,3 +1,10 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import SuscriptorWebhook
+
+
+@admin.register(SuscriptorWebhook)
+class SuscriptorWebhookAdmin(admin.ModelAdmin):
+    list_display = ('nombre', 'url', 'activo', 'ultimo_seq', 'fallos', 'proximo_intento')
+    list_filter = ('activo',)
+    readonly_fields = ('fallos', 'proximo_intento', 'ultimo_error', 'creado')
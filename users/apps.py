@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        # Con JWT habilitado, una clave ausente o inválida falla al arrancar y
+        # no en el primer login.
+        if settings.JWT_ENABLED:
+            from .tokens import signing_keys
+            signing_keys()
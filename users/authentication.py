@@ -0,0 +1,244 @@
+"""
+Autenticación por token con caché del usuario asociado.
+
+Cada petición autenticada resolvía `Authorization: Token <key>` con una
+consulta a `authtoken_token` + `usuarios`. Aquí se guarda una instantánea del
+usuario por token en dos niveles:
+
+- L1: caché TTL/LRU acotada en memoria del proceso.
+- L2 (opcional): alias de la caché de Django compartida entre pods
+  (`TOKEN_AUTH_CACHE['SHARED_ALIAS']`).
+
+Las escrituras sobre el usuario deben llamar a `invalidar_usuario` para que
+un usuario desactivado quede bloqueado de inmediato en este proceso y en la
+caché compartida. En otros pods el L1 caduca a los `TTL` segundos.
+
+Los tokens vencen a las `AUTH_TOKEN_LIFETIME` desde su emisión (campo
+`created`). Con `AUTH_TOKEN_SLIDING`, usar un token que ya consumió más de la
+mitad de su vigencia la renueva; así solo se escribe en la base de datos una
+vez por media vigencia y no en cada petición.
+"""
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from .models import Usuario
+from .utils.metrics import metricas
+from .utils.ttl_cache import TTLCache
+
+CAMPOS_SNAPSHOT = ('id', 'nombre_usuario', 'email_usuario', 'rol', 'is_active', 'is_staff', 'is_superuser')
+# v2: la entrada es {'usuario': snapshot, 'creado': fecha}. Las de la versión
+# anterior (snapshot sin envolver) quedan bajo otro prefijo y no se leen, lo que
+# permite convivir con pods viejos durante un despliegue gradual.
+PREFIJO_L2 = 'auth:token:v2:'
+
+_l1 = None
+_l1_lock = threading.Lock()
+# Se incrementa en cada invalidación; un fallo de caché que leyó la base de
+# datos antes de una invalidación no debe repoblar la caché con datos viejos.
+_generacion = 0
+
+
+def _config() -> dict:
+    return getattr(settings, 'TOKEN_AUTH_CACHE', {})
+
+
+def _cache_l1() -> TTLCache:
+    global _l1
+    if _l1 is None:
+        with _l1_lock:
+            if _l1 is None:
+                config = _config()
+                _l1 = TTLCache(config.get('MAX_ENTRIES', 10000), config.get('TTL', 30))
+    return _l1
+
+
+def _cache_l2():
+    alias = _config().get('SHARED_ALIAS')
+    return caches[alias] if alias else None
+
+
+def reiniciar_cache() -> None:
+    """
+    Descarta el L1 (se recrea con la configuración vigente). Útil en pruebas.
+    """
+    global _l1
+    with _l1_lock:
+        _l1 = None
+
+
+def snapshot_usuario(user) -> dict:
+    return {campo: getattr(user, campo) for campo in CAMPOS_SNAPSHOT}
+
+
+def usuario_desde_snapshot(snapshot: dict) -> Usuario:
+    """
+    Reconstruye un `Usuario` sin consultar la base de datos.
+
+    La instancia no tiene contraseña cargada: es de solo lectura y no debe
+    guardarse con `save()`.
+    """
+    user = Usuario(**snapshot)
+    user._state.adding = False
+    user._state.db = 'default'
+    return user
+
+
+def vigencia_token() -> timedelta | None:
+    segundos = getattr(settings, 'AUTH_TOKEN_LIFETIME', 0)
+    return timedelta(seconds=segundos) if segundos else None
+
+
+def token_expirado(creado, ahora=None) -> bool:
+    vigencia = vigencia_token()
+    if vigencia is None:
+        return False
+    return (ahora or timezone.now()) - creado >= vigencia
+
+
+def emitir_token(user) -> Token:
+    """
+    Retorna el token vigente del usuario o lo rota si ya venció.
+    """
+    token, creado = Token.objects.get_or_create(user=user)
+    if not creado and token_expirado(token.created):
+        invalidar_token(token.key)
+        token.delete()
+        token = Token.objects.create(user=user)
+    return token
+
+
+def _evictar(keys) -> None:
+    global _generacion
+    with _l1_lock:
+        _generacion += 1
+    l1 = _cache_l1()
+    for key in keys:
+        l1.delete(key)
+    l2 = _cache_l2()
+    if l2 is not None and keys:
+        l2.delete_many([PREFIJO_L2 + key for key in keys])
+    metricas.incrementar('token_cache.invalidaciones', len(keys))
+
+
+def invalidar_token(key: str) -> None:
+    _evictar([key])
+
+
+def invalidar_tokens(keys) -> None:
+    _evictar(list(keys))
+
+
+def invalidar_usuario(user_id, keys=None) -> None:
+    """
+    Elimina de ambos niveles las entradas de los tokens del usuario.
+
+    Si quien llama ya conoce las claves de los tokens (`keys`) no se consulta
+    `authtoken_token`.
+
+    Se ejecuta también al confirmar la transacción en curso, para que una
+    lectura concurrente no vuelva a cachear el estado previo al cambio.
+    """
+    def _invalidar():
+        _cache_l1().delete_where(lambda _, entrada: entrada['usuario']['id'] == user_id)
+        _evictar(list(keys) if keys is not None else
+                 list(Token.objects.filter(user_id=user_id).values_list('key', flat=True)))
+
+    _invalidar()
+    transaction.on_commit(_invalidar)
+
+
+def invalidar_usuarios(user_ids, keys) -> None:
+    """
+    `invalidar_usuario` para varios usuarios con una sola pasada por el L1.
+    """
+    ids, keys = set(user_ids), list(keys)
+
+    def _invalidar():
+        _cache_l1().delete_where(lambda _, entrada: entrada['usuario']['id'] in ids)
+        _evictar(keys)
+
+    _invalidar()
+    transaction.on_commit(_invalidar)
+
+
+def estadisticas() -> dict:
+    return {
+        'l1_hit': metricas.valor('token_cache.l1_hit'),
+        'l2_hit': metricas.valor('token_cache.l2_hit'),
+        'miss': metricas.valor('token_cache.miss'),
+        'invalidaciones': metricas.valor('token_cache.invalidaciones'),
+        'renovaciones': metricas.valor('token_cache.renovaciones'),
+        'l1_entradas': len(_cache_l1()),
+    }
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    `TokenAuthentication` de DRF con caché de dos niveles de token → usuario.
+    """
+
+    def authenticate_credentials(self, key):
+        entrada = self._buscar(key)
+
+        if entrada is None:
+            metricas.incrementar('token_cache.miss')
+            generacion = _generacion
+            try:
+                token = Token.objects.select_related('user').get(key=key)
+            except Token.DoesNotExist:
+                raise exceptions.AuthenticationFailed('Token inválido.')
+
+            entrada = {'usuario': snapshot_usuario(token.user), 'creado': token.created}
+            if generacion == _generacion:
+                self._guardar(key, entrada)
+
+        snapshot = entrada['usuario']
+        if not snapshot['is_active']:
+            raise exceptions.AuthenticationFailed('Usuario inactivo o eliminado.')
+
+        self._verificar_vigencia(key, entrada)
+        return (usuario_desde_snapshot(snapshot), Token(key=key, user_id=snapshot['id'], created=entrada['creado']))
+
+    def _verificar_vigencia(self, key, entrada):
+        vigencia = vigencia_token()
+        if vigencia is None:
+            return
+
+        ahora = timezone.now()
+        if token_expirado(entrada['creado'], ahora):
+            invalidar_token(key)
+            raise exceptions.AuthenticationFailed('Token expirado.')
+
+        if getattr(settings, 'AUTH_TOKEN_SLIDING', False) and ahora - entrada['creado'] >= vigencia / 2:
+            Token.objects.filter(key=key).update(created=ahora)
+            self._guardar(key, {**entrada, 'creado': ahora})
+            metricas.incrementar('token_cache.renovaciones')
+
+    def _buscar(self, key):
+        entrada = _cache_l1().get(key)
+        if entrada is not None:
+            metricas.incrementar('token_cache.l1_hit')
+            return entrada
+
+        l2 = _cache_l2()
+        if l2 is not None:
+            entrada = l2.get(PREFIJO_L2 + key)
+            if entrada is not None:
+                metricas.incrementar('token_cache.l2_hit')
+                _cache_l1().set(key, entrada)
+                return entrada
+        return None
+
+    def _guardar(self, key, entrada):
+        _cache_l1().set(key, entrada)
+        l2 = _cache_l2()
+        if l2 is not None:
+            l2.set(PREFIJO_L2 + key, entrada, _config().get('SHARED_TTL', 300))
@@ -0,0 +1,176 @@
+"""
+Caché de lectura del detalle de usuario (`/api/users/<nombre_usuario>/`).
+
+Mismo esquema de dos niveles que la caché de tokens (`authentication.py`):
+
+- L1: caché TTL/LRU acotada en memoria del proceso.
+- L2 (opcional): alias de la caché de Django (`USER_DETAIL_CACHE['SHARED_ALIAS']`).
+
+Se guarda la fila completa (`lectura.CAMPOS` + `updated_at` y `version`) por
+`nombre_usuario`; `?fields=` y el ETag se calculan a partir de ella. Los
+nombres inexistentes también se cachean, por eso el registro invalida.
+
+Si varias peticiones fallan la caché para el mismo nombre a la vez, solo una
+consulta la base de datos y las demás esperan su resultado (single-flight,
+dentro del proceso).
+
+Las escrituras deben llamar a `invalidar_detalle`. En otros pods el L1
+caduca a los `TTL` segundos.
+
+`aobtener_detalle` es la variante para vistas async: un acierto del L1 no
+sale del event loop; el resto pasa por `obtener_detalle` en el hilo del ORM.
+"""
+import threading
+from concurrent.futures import Future
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from .lectura import CAMPOS, leer
+from .models import Usuario
+from .utils.metrics import metricas
+from .utils.ttl_cache import TTLCache
+
+PREFIJO_L2 = 'usuarios:detalle:'
+# Marca de "no existe" (None es el valor de fallo de caché).
+NO_EXISTE = {}
+
+_l1 = None
+_lock = threading.Lock()
+_en_vuelo: dict[str, Future] = {}
+_generacion = 0
+
+
+def _config() -> dict:
+    return getattr(settings, 'USER_DETAIL_CACHE', {})
+
+
+def _cache_l1() -> TTLCache:
+    global _l1
+    if _l1 is None:
+        with _lock:
+            if _l1 is None:
+                config = _config()
+                _l1 = TTLCache(config.get('MAX_ENTRIES', 10000), config.get('TTL', 10))
+    return _l1
+
+
+def _cache_l2():
+    alias = _config().get('SHARED_ALIAS')
+    return caches[alias] if alias else None
+
+
+def reiniciar_cache() -> None:
+    """
+    Descarta el L1 (se recrea con la configuración vigente). Útil en pruebas.
+    """
+    global _l1
+    with _lock:
+        _l1 = None
+        _en_vuelo.clear()
+
+
+def _consultar(nombre_usuario):
+    fila = leer(Usuario.objects.filter(nombre_usuario=nombre_usuario), CAMPOS + ('updated_at', 'version')).first()
+    return NO_EXISTE if fila is None else fila
+
+
+def _guardar(nombre_usuario, fila):
+    _cache_l1().set(nombre_usuario, fila)
+    l2 = _cache_l2()
+    if l2 is not None:
+        l2.set(PREFIJO_L2 + nombre_usuario, fila, _config().get('SHARED_TTL', 300))
+
+
+def obtener_detalle(nombre_usuario: str) -> dict | None:
+    """
+    Fila del usuario (con `updated_at` y `version`) o None si no existe.
+
+    La fila retornada es compartida: no debe modificarse.
+    """
+    fila = _cache_l1().get(nombre_usuario)
+    if fila is not None:
+        metricas.incrementar('detalle_cache.l1_hit')
+        return fila or None
+
+    l2 = _cache_l2()
+    if l2 is not None:
+        fila = l2.get(PREFIJO_L2 + nombre_usuario)
+        if fila is not None:
+            metricas.incrementar('detalle_cache.l2_hit')
+            _cache_l1().set(nombre_usuario, fila)
+            return fila or None
+
+    with _lock:
+        future = _en_vuelo.get(nombre_usuario)
+        lider = future is None
+        if lider:
+            future = _en_vuelo[nombre_usuario] = Future()
+            generacion = _generacion
+
+    if not lider:
+        metricas.incrementar('detalle_cache.coalescidas')
+        return future.result() or None
+
+    metricas.incrementar('detalle_cache.miss')
+    try:
+        fila = _consultar(nombre_usuario)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _lock:
+            if _en_vuelo.get(nombre_usuario) is future:
+                del _en_vuelo[nombre_usuario]
+
+    # Una invalidación durante la consulta pudo dejar la fila vieja.
+    if generacion == _generacion:
+        _guardar(nombre_usuario, fila)
+    future.set_result(fila)
+    return fila or None
+
+
+async def aobtener_detalle(nombre_usuario: str) -> dict | None:
+    fila = _cache_l1().get(nombre_usuario)
+    if fila is not None:
+        metricas.incrementar('detalle_cache.l1_hit')
+        return fila or None
+    return await sync_to_async(obtener_detalle)(nombre_usuario)
+
+
+def invalidar_detalle(*nombres_usuario) -> None:
+    """
+    Elimina de ambos niveles las entradas de esos nombres (también al
+    confirmar la transacción en curso).
+    """
+    nombres = [nombre for nombre in nombres_usuario if nombre]
+
+    def _invalidar():
+        global _generacion
+        with _lock:
+            _generacion += 1
+            for nombre in nombres:
+                _en_vuelo.pop(nombre, None)
+        l1 = _cache_l1()
+        for nombre in nombres:
+            l1.delete(nombre)
+        l2 = _cache_l2()
+        if l2 is not None and nombres:
+            l2.delete_many([PREFIJO_L2 + nombre for nombre in nombres])
+        metricas.incrementar('detalle_cache.invalidaciones', len(nombres))
+
+    _invalidar()
+    transaction.on_commit(_invalidar)
+
+
+def estadisticas() -> dict:
+    return {
+        'l1_hit': metricas.valor('detalle_cache.l1_hit'),
+        'l2_hit': metricas.valor('detalle_cache.l2_hit'),
+        'miss': metricas.valor('detalle_cache.miss'),
+        'coalescidas': metricas.valor('detalle_cache.coalescidas'),
+        'invalidaciones': metricas.valor('detalle_cache.invalidaciones'),
+        'l1_entradas': len(_cache_l1()),
+    }
@@ -0,0 +1,106 @@
+"""
+Outbox transaccional de cambios de usuarios y feed incremental.
+
+Cada alta, actualización o (des)activación agrega filas a `usuarios_cambios`
+en la misma transacción que la escritura: si esta se revierte, el cambio
+tampoco existe. `GET /api/users/changes/?since=<seq>` las retorna en orden de
+`seq`, para que otros servicios mantengan una réplica leyendo solo lo nuevo
+en lugar de volver a recorrer `/api/users/`.
+
+`seq` sale de una secuencia, que asigna valores al insertar y no al
+confirmar: una transacción con seq 10 podría confirmarse después de otra con
+seq 11, y un consumidor que ya avanzó hasta 11 nunca vería la 10. Por eso
+`registrar_cambios` toma un advisory lock de transacción antes de insertar:
+las filas del outbox se confirman en orden de `seq`. El lock solo abarca el
+INSERT del outbox y el COMMIT.
+
+`compactar_cambios` elimina los cambios que ya tienen uno posterior del
+mismo usuario, así que cualquier cursor sigue llegando al estado final.
+"""
+from django.db import connection, transaction
+from django.db.models import Max
+
+from .lectura import CAMPOS
+from .models import CambioUsuario, Usuario
+
+LIMITE = 500
+LIMITE_MAXIMO = 5000
+# Clave del advisory lock que ordena las escrituras del outbox.
+LOCK_OUTBOX = 0x75737263
+
+CAMPOS_CAMBIO = ('seq', 'usuario_id', 'operacion', 'datos', 'creado')
+_DATOS = CAMPOS + ('version',)
+
+
+class ParametroInvalido(ValueError):
+    pass
+
+
+def registrar_cambios(operacion: str, ids) -> None:
+    """
+    Agrega un cambio por usuario con la fila tal como está en la transacción
+    en curso (un solo INSERT ... SELECT). Debe llamarse dentro de
+    `transaction.atomic()`, después de la escritura.
+    """
+    ids = sorted(set(ids))
+    if not ids:
+        return
+    if not transaction.get_connection().in_atomic_block:
+        raise RuntimeError('registrar_cambios debe llamarse dentro de transaction.atomic().')
+    datos = ', '.join(f"'{campo}', {campo}" for campo in _DATOS)
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_xact_lock(%s)', [LOCK_OUTBOX])
+        cursor.execute(
+            f'INSERT INTO {CambioUsuario._meta.db_table} (usuario_id, operacion, datos, creado) '
+            f'SELECT id, %s, jsonb_build_object({datos}), now() '
+            f'FROM {Usuario._meta.db_table} WHERE id = ANY(%s) ORDER BY id',
+            [operacion, ids]
+        )
+
+
+def _entero(valor, nombre: str, minimo: int) -> int:
+    try:
+        entero = int(valor)
+    except (TypeError, ValueError):
+        entero = None
+    if entero is None or entero < minimo:
+        raise ParametroInvalido(f"'{nombre}' debe ser un entero mayor o igual a {minimo}.")
+    return entero
+
+
+def leer_cambios(params) -> dict:
+    """
+    Cambios con `seq` mayor a `?since=` (default 0), hasta `?limit=`.
+
+    `siguiente` es el `since` de la próxima lectura; `hay_mas` indica si
+    quedaron cambios sin retornar. Lanza ParametroInvalido.
+    """
+    since = _entero(params.get('since', 0), 'since', 0)
+    limite = min(_entero(params.get('limit', LIMITE), 'limit', 1), LIMITE_MAXIMO)
+    filas = list(
+        CambioUsuario.objects.filter(seq__gt=since).order_by('seq').values(*CAMPOS_CAMBIO)[:limite + 1]
+    )
+    return {
+        'cambios': filas[:limite],
+        'siguiente': filas[:limite][-1]['seq'] if filas else since,
+        'hay_mas': len(filas) > limite,
+    }
+
+
+def ultimo_seq() -> int:
+    """
+    `seq` del último cambio (0 si no hay).
+
+    Sirve como versión del directorio: toda escritura de la API agrega un
+    cambio y `compactar_cambios` conserva el último de cada usuario, así que
+    nunca retrocede. PostgreSQL lo resuelve con el índice de la llave
+    primaria, sin recorrer la tabla.
+    """
+    return CambioUsuario.objects.aggregate(ultimo=Max('seq'))['ultimo'] or 0
+
+
+async def aultimo_seq() -> int:
+    """
+    Versión async de `ultimo_seq`.
+    """
+    return (await CambioUsuario.objects.aaggregate(ultimo=Max('seq')))['ultimo'] or 0
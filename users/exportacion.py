@@ -0,0 +1,106 @@
+"""
+Exportación del directorio de usuarios en NDJSON o CSV.
+
+Las filas se leen con `iterator(chunk_size=...)`, que en PostgreSQL usa un
+cursor del lado del servidor: el proceso solo mantiene en memoria un bloque
+de filas a la vez, sin importar el tamaño de la tabla. Cada bloque se
+convierte en un único fragmento de la respuesta.
+
+Con `DISABLE_SERVER_SIDE_CURSORS` (detrás de PgBouncer) psycopg traería el
+resultado completo de la consulta a memoria, así que se pagina por `id`
+(keyset): una consulta `id > último ... LIMIT chunk_size` por bloque. Cada
+bloque es su propia consulta, así que la exportación no es una foto única de
+la tabla.
+
+Bajo ASGI, `StreamingHttpResponse` recibe `exportar_async`: con un iterador
+síncrono Django lo consumiría completo (`list`) antes de enviar el primer
+byte. La versión async pide cada bloque al cursor con `sync_to_async`, en el
+hilo de la petición que mantiene la conexión.
+"""
+import csv
+import json
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+
+from .lectura import CAMPOS
+from .models import Usuario
+
+FORMATOS = ('ndjson', 'csv')
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+class _Eco:
+    """
+    "Archivo" cuyo write retorna lo escrito, para usar csv.writer sin buffer.
+    """
+    def write(self, valor):
+        return valor
+
+
+def consultar_filas(queryset, chunk_size: int):
+    filas = queryset.order_by('id').values_list(*CAMPOS)
+    if connections[queryset.db].settings_dict.get('DISABLE_SERVER_SIDE_CURSORS'):
+        return _por_id(filas, chunk_size)
+    return filas.iterator(chunk_size=chunk_size)
+
+
+def _por_id(filas, chunk_size):
+    bloque = list(filas[:chunk_size])
+    while bloque:
+        yield from bloque
+        if len(bloque) < chunk_size:
+            return
+        # CAMPOS empieza por id.
+        bloque = list(filas.filter(id__gt=bloque[-1][0])[:chunk_size])
+
+
+def _por_bloques(filas, chunk_size):
+    bloque = []
+    for fila in filas:
+        bloque.append(fila)
+        if len(bloque) >= chunk_size:
+            yield bloque
+            bloque = []
+    if bloque:
+        yield bloque
+
+
+def exportar(queryset, formato: str, chunk_size: int = 2000):
+    """
+    Genera la exportación de `queryset` en fragmentos de `chunk_size` filas.
+    """
+    bloques = _por_bloques(consultar_filas(queryset, chunk_size), chunk_size)
+    if formato == 'csv':
+        writer = csv.writer(_Eco())
+        yield writer.writerow(CAMPOS)
+        for bloque in bloques:
+            yield ''.join(writer.writerow(fila) for fila in bloque)
+    elif formato == 'ndjson':
+        for bloque in bloques:
+            yield ''.join(
+                json.dumps(dict(zip(CAMPOS, fila)), ensure_ascii=False) + '\n' for fila in bloque
+            )
+    else:
+        raise ValueError(f"Formato no soportado. Use uno de: {', '.join(FORMATOS)}.")
+
+
+async def exportar_async(queryset, formato: str, chunk_size: int = 2000):
+    """
+    `exportar` para ASGI: un fragmento por llamada al cursor, sin acumular.
+    """
+    fragmentos = exportar(queryset, formato, chunk_size)
+    siguiente = sync_to_async(next)
+    try:
+        while (fragmento := await siguiente(fragmentos, None)) is not None:
+            yield fragmento
+    finally:
+        # Cierra el cursor en el mismo hilo, también si el cliente se desconecta.
+        await sync_to_async(fragmentos.close)()
+
+
+def nombre_archivo(formato: str) -> str:
+    return f'{Usuario._meta.db_table}.{formato}'
@@ -0,0 +1,58 @@
+"""
+Filtros del listado de usuarios a partir de los parámetros de query.
+
+- `rol`: 'superuser' o 'profesor'.
+- `is_active`: true/false.
+- `search`: texto buscado en `nombre_usuario` o `email_usuario`, sin
+  distinguir mayúsculas.
+- `search_mode`: 'prefix' (default) o 'contains'.
+
+Cada filtro tiene su índice (migración 0003): compuesto (rol, id),
+parcial para inactivos, `text_pattern_ops` para prefijos y trigramas para
+subcadenas.
+"""
+from django.db.models import Q
+
+from .models import Usuario
+
+MODOS_BUSQUEDA = ('prefix', 'contains')
+BOOLEANOS = {'true': True, '1': True, 'false': False, '0': False}
+
+
+class FiltroInvalido(ValueError):
+    pass
+
+
+def filtrar_usuarios(queryset, params):
+    """
+    Aplica los filtros presentes en `params` (QueryDict o dict).
+
+    Lanza FiltroInvalido si algún valor no es válido.
+    """
+    rol = params.get('rol')
+    if rol:
+        if rol not in dict(Usuario.ROLES):
+            raise FiltroInvalido(f"'rol' debe ser uno de: {', '.join(dict(Usuario.ROLES))}.")
+        queryset = queryset.filter(rol=rol)
+
+    is_active = params.get('is_active')
+    if is_active:
+        if is_active.lower() not in BOOLEANOS:
+            raise FiltroInvalido("'is_active' debe ser true o false.")
+        queryset = queryset.filter(is_active=BOOLEANOS[is_active.lower()])
+
+    search = (params.get('search') or '').strip()
+    if search:
+        modo = params.get('search_mode', 'prefix')
+        if modo == 'prefix':
+            queryset = queryset.filter(
+                Q(nombre_usuario__istartswith=search) | Q(email_usuario__istartswith=search)
+            )
+        elif modo == 'contains':
+            queryset = queryset.filter(
+                Q(nombre_usuario__icontains=search) | Q(email_usuario__icontains=search)
+            )
+        else:
+            raise FiltroInvalido(f"'search_mode' debe ser uno de: {', '.join(MODOS_BUSQUEDA)}.")
+
+    return queryset
@@ -0,0 +1,199 @@
+"""
+Hashing de contraseñas en un pool acotado de hilos con control de admisión.
+
+PBKDF2 consume CPU durante cientos de milisegundos por llamada. Ejecutarlo en
+el hilo de la petición permite que unos pocos logins concurrentes saturen el
+límite de CPU del pod. El hasher de este módulo delega el cálculo a un pool con
+concurrencia fija; si el pool y su cola están llenos, rechaza de inmediato con
+`HashingSaturado` (503 + Retry-After) en lugar de encolar sin límite.
+
+El hashlib de CPython libera el GIL durante PBKDF2, así que el hilo de la
+petición solo espera; ninguna consulta a la base de datos ocurre en el pool.
+"""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, get_hasher
+
+from .utils.metrics import metricas
+
+
+class HashingSaturado(Exception):
+    """
+    El pool de hashing no admite más trabajos en este momento.
+    """
+
+    def __init__(self, retry_after: int):
+        super().__init__('El servicio está ocupado, intente nuevamente.')
+        self.retry_after = retry_after
+
+
+class PoolHashing:
+    def __init__(self, workers: int, cola: int, retry_after: int = 1):
+        self.workers = workers
+        self.capacidad = workers + cola
+        self.retry_after = retry_after
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='hashing')
+        self._lock = threading.Condition()
+        self._admitidos = 0
+        self._en_curso = 0
+
+    def ejecutar(self, fn, *args, **kwargs):
+        """
+        Ejecuta `fn` en el pool y espera su resultado. Si no hay capacidad
+        lanza `HashingSaturado` de inmediato.
+        """
+        return self.enviar(fn, *args, **kwargs).result()
+
+    def enviar(self, fn, *args, esperar: bool = False, **kwargs) -> Future:
+        """
+        Encola `fn` y retorna el Future.
+
+        Con `esperar=True` (trabajos por lotes) no falla: espera hasta que haya
+        un worker libre y nunca ocupa los lugares de la cola, que quedan para
+        las peticiones interactivas.
+        """
+        with self._lock:
+            if esperar:
+                while self._admitidos >= self.workers:
+                    self._lock.wait()
+            elif self._admitidos >= self.capacidad:
+                metricas.incrementar('hashing.rechazos')
+                raise HashingSaturado(self.retry_after)
+            self._admitidos += 1
+            self._actualizar_medidores()
+
+        encolado = time.perf_counter()
+
+        def tarea():
+            inicio = time.perf_counter()
+            with self._lock:
+                self._en_curso += 1
+                self._actualizar_medidores()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                fin = time.perf_counter()
+                with self._lock:
+                    self._en_curso -= 1
+                metricas.incrementar('hashing.total')
+                metricas.incrementar('hashing.latencia_ms_total', round((fin - inicio) * 1000))
+                metricas.medir('hashing.latencia_ms_ultima', round((fin - inicio) * 1000, 2))
+                metricas.medir('hashing.espera_ms_ultima', round((inicio - encolado) * 1000, 2))
+
+        future = self._executor.submit(tarea)
+        future.add_done_callback(self._liberar)
+        return future
+
+    def _liberar(self, _future):
+        with self._lock:
+            self._admitidos -= 1
+            self._actualizar_medidores()
+            self._lock.notify_all()
+
+    def _actualizar_medidores(self):
+        metricas.medir('hashing.en_curso', self._en_curso)
+        metricas.medir('hashing.cola', self._admitidos - self._en_curso)
+
+    def cerrar(self):
+        self._executor.shutdown(wait=False)
+
+
+_pool = None
+_pool_importacion = None
+_pool_lock = threading.Lock()
+
+
+def obtener_pool() -> PoolHashing:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                config = getattr(settings, 'PASSWORD_HASHING_POOL', {})
+                _pool = PoolHashing(
+                    workers=config.get('WORKERS', 1),
+                    cola=config.get('QUEUE', 4),
+                    retry_after=config.get('RETRY_AFTER', 1),
+                )
+    return _pool
+
+
+def obtener_pool_importacion() -> PoolHashing:
+    """
+    Pool propio de /api/register/bulk/ (`BULK_IMPORT_HASHING_WORKERS` hilos,
+    sin cola): un lote no espera detrás de los logins ni les quita el worker.
+    """
+    global _pool_importacion
+    if _pool_importacion is None:
+        with _pool_lock:
+            if _pool_importacion is None:
+                _pool_importacion = PoolHashing(
+                    workers=getattr(settings, 'BULK_IMPORT_HASHING_WORKERS', 4),
+                    cola=0,
+                )
+    return _pool_importacion
+
+
+def reiniciar_pool() -> None:
+    """
+    Descarta los pools (se recrean con la configuración vigente). Útil en pruebas.
+    """
+    global _pool, _pool_importacion
+    with _pool_lock:
+        for pool in (_pool, _pool_importacion):
+            if pool is not None:
+                pool.cerrar()
+        _pool = _pool_importacion = None
+
+
+def estadisticas() -> dict:
+    total = metricas.valor('hashing.total')
+    return {
+        'workers': obtener_pool().workers,
+        'capacidad': obtener_pool().capacidad,
+        'en_curso': metricas.valor('hashing.en_curso'),
+        'cola': metricas.valor('hashing.cola'),
+        'total': total,
+        'rechazos': metricas.valor('hashing.rechazos'),
+        'latencia_ms_promedio': round(metricas.valor('hashing.latencia_ms_total') / total, 2) if total else 0,
+        'latencia_ms_ultima': metricas.valor('hashing.latencia_ms_ultima'),
+        'espera_ms_ultima': metricas.valor('hashing.espera_ms_ultima'),
+    }
+
+
+def hashear_lote(contrasenias, pool: PoolHashing | None = None) -> list[str]:
+    """
+    Calcula en paralelo (hasta `pool.workers` a la vez) los hashes de una lista
+    de contraseñas con el hasher preferido. Pensado para importaciones: por
+    defecto usa el pool de importación.
+    """
+    pool = pool or obtener_pool_importacion()
+    hasher = get_hasher()
+    encode = hasher.encode
+    if isinstance(hasher, PBKDF2PoolPasswordHasher):
+        # Se llama al encode base para no volver a pasar por el pool.
+        def encode(password, salt):
+            return PBKDF2PasswordHasher.encode(hasher, password, salt)
+    futures = [pool.enviar(encode, contrasenia, hasher.salt(), esperar=True) for contrasenia in contrasenias]
+    return [future.result() for future in futures]
+
+
+class PBKDF2PoolPasswordHasher(PBKDF2PasswordHasher):
+    """
+    Mismo algoritmo y formato que `PBKDF2PasswordHasher` (los hashes existentes
+    siguen siendo válidos), pero el cálculo corre en el pool acotado.
+
+    Las iteraciones salen de `PASSWORD_HASH_ITERATIONS` (ver el comando
+    `calibrar_hasher`). Si difieren de las de un hash almacenado,
+    `must_update` lo marca y Django lo recalcula en el siguiente login exitoso,
+    así que cambiar el costo no requiere reiniciar contraseñas.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(settings, 'PASSWORD_HASH_ITERATIONS', None) or PBKDF2PasswordHasher.iterations
+
+    def encode(self, password, salt, iterations=None):
+        return obtener_pool().ejecutar(super().encode, password, salt, iterations)
@@ -0,0 +1,191 @@
+"""
+Importación masiva de usuarios (JSON, NDJSON o CSV).
+
+Por cada lote de filas:
+
+1. Valida el formato de cada fila con `RegistroUsuarioSerializer` (que no
+   consulta la base de datos).
+2. Verifica la unicidad de nombres y correos de todo el lote con una consulta.
+3. Calcula los hashes en paralelo en el pool de hashing.
+4. Inserta con `bulk_create`.
+
+El resultado es un reporte por fila con el usuario creado o sus errores.
+"""
+import codecs
+import csv
+import json
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from .cache_usuarios import invalidar_detalle
+from .cambios import registrar_cambios
+from .hashers import hashear_lote
+from .models import Usuario
+from .serializers import RegistroUsuarioSerializer
+from .utils import format_serializer_errors
+
+FORMATOS = ('json', 'ndjson', 'csv')
+CAMPOS_CSV = ('nombre_usuario', 'email_usuario', 'contrasenia_usuario', 'rol', 'is_active')
+
+
+def leer_filas(stream, formato: str):
+    """
+    Genera las filas (dict) de un stream binario sin cargarlo completo en
+    memoria (salvo `json`, que es un único documento).
+
+    Lanza ValueError si el contenido no respeta el formato.
+    """
+    texto = codecs.getreader('utf-8-sig')(stream)
+
+    if formato == 'csv':
+        for fila in csv.DictReader(texto):
+            yield {campo: valor for campo, valor in fila.items() if campo in CAMPOS_CSV and valor != ''}
+    elif formato == 'ndjson':
+        for numero, linea in enumerate(texto, start=1):
+            if not linea.strip():
+                continue
+            try:
+                yield json.loads(linea)
+            except json.JSONDecodeError:
+                raise ValueError(f'Línea {numero}: JSON inválido.')
+    elif formato == 'json':
+        try:
+            datos = json.load(texto)
+        except json.JSONDecodeError:
+            raise ValueError('JSON inválido.')
+        yield from filas_json(datos)
+    else:
+        raise ValueError(f"Formato no soportado. Use uno de: {', '.join(FORMATOS)}.")
+
+
+def filas_json(datos):
+    """
+    Acepta una lista de usuarios o {"usuarios": [...]}.
+    """
+    if isinstance(datos, dict):
+        datos = datos.get('usuarios')
+    if not isinstance(datos, list):
+        raise ValueError('Se esperaba una lista de usuarios.')
+    return datos
+
+
+def importar_usuarios(filas, tamanio_lote: int = 1000, pool=None) -> dict:
+    """
+    Importa las filas en lotes de `tamanio_lote` y retorna el reporte.
+    """
+    resultados = []
+    filas = iter(filas)
+    while True:
+        lote = list(islice(filas, tamanio_lote))
+        if not lote:
+            break
+        resultados.extend(_importar_lote(lote, len(resultados), pool))
+
+    creados = sum(1 for r in resultados if r['estado'] == 'creado')
+    return {
+        'total': len(resultados),
+        'creados': creados,
+        'errores': len(resultados) - creados,
+        'filas': resultados,
+    }
+
+
+def _error(numero, fila, mensaje):
+    nombre = fila.get('nombre_usuario') if isinstance(fila, dict) else None
+    return {'fila': numero, 'nombre_usuario': nombre, 'estado': 'error', 'error': mensaje}
+
+
+def _importar_lote(filas, desplazamiento, pool):
+    resultados = {}
+    validas = []
+
+    for numero, fila in enumerate(filas, start=desplazamiento + 1):
+        if not isinstance(fila, dict):
+            resultados[numero] = _error(numero, fila, 'La fila debe ser un objeto.')
+            continue
+        serializer = RegistroUsuarioSerializer(data=fila)
+        if not serializer.is_valid():
+            resultados[numero] = _error(numero, fila, format_serializer_errors(serializer.errors))
+            continue
+        validas.append((numero, serializer.validated_data))
+
+    validas = _filtrar_duplicados_en_lote(validas, resultados)
+
+    for intento in range(2):
+        validas = _filtrar_existentes(validas, resultados)
+        if not validas:
+            break
+        hashes = hashear_lote([datos['contrasenia_usuario'] for _, datos in validas], pool)
+        usuarios = [
+            Usuario(
+                nombre_usuario=datos['nombre_usuario'],
+                email_usuario=datos['email_usuario'],
+                password=password,
+                rol=datos.get('rol', 'profesor'),
+                is_active=datos.get('is_active', True),
+            )
+            for (_, datos), password in zip(validas, hashes)
+        ]
+        try:
+            with transaction.atomic():
+                Usuario.objects.bulk_create(usuarios, batch_size=500)
+                registrar_cambios('create', [usuario.id for usuario in usuarios])
+        except IntegrityError:
+            # Otro proceso insertó un nombre o correo del lote entre la
+            # verificación y el INSERT: se vuelve a verificar una vez.
+            continue
+        # Los nombres nuevos pudieron quedar cacheados como inexistentes.
+        invalidar_detalle(*(usuario.nombre_usuario for usuario in usuarios))
+        for (numero, datos), usuario in zip(validas, usuarios):
+            resultados[numero] = {
+                'fila': numero,
+                'nombre_usuario': usuario.nombre_usuario,
+                'estado': 'creado',
+                'id': usuario.id,
+            }
+        break
+    else:
+        for numero, datos in validas:
+            resultados[numero] = _error(numero, datos, 'El usuario o correo ya está registrado.')
+
+    return [resultados[numero] for numero in sorted(resultados)]
+
+
+def _filtrar_duplicados_en_lote(validas, resultados):
+    nombres, correos, unicas = set(), set(), []
+    for numero, datos in validas:
+        if datos['nombre_usuario'] in nombres:
+            resultados[numero] = _error(numero, datos, 'El nombre de usuario está repetido en el lote.')
+        elif datos['email_usuario'] in correos:
+            resultados[numero] = _error(numero, datos, 'El correo electrónico está repetido en el lote.')
+        else:
+            nombres.add(datos['nombre_usuario'])
+            correos.add(datos['email_usuario'])
+            unicas.append((numero, datos))
+    return unicas
+
+
+def _filtrar_existentes(validas, resultados):
+    if not validas:
+        return validas
+    nombres = [datos['nombre_usuario'] for _, datos in validas]
+    correos = [datos['email_usuario'] for _, datos in validas]
+    existentes = Usuario.objects.filter(
+        Q(nombre_usuario__in=nombres) | Q(email_usuario__in=correos)
+    ).values_list('nombre_usuario', 'email_usuario')
+    nombres_usados, correos_usados = set(), set()
+    for nombre, correo in existentes:
+        nombres_usados.add(nombre)
+        correos_usados.add(correo)
+
+    disponibles = []
+    for numero, datos in validas:
+        if datos['nombre_usuario'] in nombres_usados:
+            resultados[numero] = _error(numero, datos, 'El nombre de usuario ya está en uso.')
+        elif datos['email_usuario'] in correos_usados:
+            resultados[numero] = _error(numero, datos, 'El correo electrónico ya está en uso.')
+        else:
+            disponibles.append((numero, datos))
+    return disponibles
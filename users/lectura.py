@@ -0,0 +1,49 @@
+"""
+Lectura de usuarios sin pasar por `ModelSerializer`.
+
+El listado y el detalle solo exponen columnas planas, así que basta con
+`.values()`: no se construyen instancias del modelo ni se recorren los campos
+de DRF por cada fila. La salida es idéntica a la de `RegistroUsuarioSerializer`
+(mismas claves, mismo orden, mismos tipos); ver el comando
+`medir_serializacion`.
+
+`?fields=id,nombre_usuario` restringe las columnas leídas y retornadas.
+"""
+CAMPOS = ('id', 'nombre_usuario', 'email_usuario', 'rol', 'is_active')
+
+
+class CampoInvalido(ValueError):
+    pass
+
+
+def campos_solicitados(params) -> tuple[str, ...]:
+    """
+    Campos de `?fields=` en el orden canónico, o todos si no se envía.
+
+    Lanza CampoInvalido si alguno no existe.
+    """
+    valor = params.get('fields')
+    if not valor:
+        return CAMPOS
+    pedidos = {campo.strip() for campo in valor.split(',') if campo.strip()}
+    desconocidos = pedidos - set(CAMPOS)
+    if desconocidos or not pedidos:
+        raise CampoInvalido(f"'fields' admite: {', '.join(CAMPOS)}.")
+    return tuple(campo for campo in CAMPOS if campo in pedidos)
+
+
+def leer(queryset, campos=CAMPOS, con_id: bool = False):
+    """
+    `.values()` con los campos pedidos. Con `con_id` siempre se lee `id`
+    (la paginación por cursor lo necesita); `proyectar` lo quita después.
+    """
+    if con_id and 'id' not in campos:
+        return queryset.values('id', *campos)
+    return queryset.values(*campos)
+
+
+def proyectar(filas, campos=CAMPOS) -> list[dict]:
+    filas = list(filas)
+    if filas and len(filas[0]) != len(campos):
+        return [{campo: fila[campo] for campo in campos} for fila in filas]
+    return filas
@@ -0,0 +1,93 @@
+import hashlib
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, PBKDF2SHA1PasswordHasher, ScryptPasswordHasher
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError
+
+from users.models import Usuario
+
+# Mínimo recomendado por OWASP (2023) para PBKDF2-HMAC-SHA256.
+MINIMO_OWASP_PBKDF2_SHA256 = 600_000
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide el costo de los hashers de contraseñas en esta máquina y recomienda '
+        'PASSWORD_HASH_ITERATIONS para un tiempo objetivo por hash.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--objetivo-ms', type=float, default=250,
+                            help='Latencia objetivo por hash en milisegundos (default: 250).')
+        parser.add_argument('--muestras', type=int, default=3,
+                            help='Repeticiones por medición; se usa la mediana (default: 3).')
+        parser.add_argument('--iteraciones', type=int, nargs='+',
+                            default=[100_000, 300_000, 600_000, 1_000_000],
+                            help='Iteraciones de PBKDF2 a medir.')
+        parser.add_argument('--sin-scrypt', action='store_true',
+                            help='Omite la medición de scrypt.')
+
+    def handle(self, *args, **options):
+        objetivo = options['objetivo_ms']
+        muestras = options['muestras']
+
+        self.stdout.write(f'Objetivo: {objetivo:.0f} ms por hash, {muestras} muestras por medición.\n')
+        self.stdout.write(f'{"hasher":<16}{"parámetros":>22}{"ms":>10}')
+
+        costos = {}
+        for hasher in (PBKDF2PasswordHasher(), PBKDF2SHA1PasswordHasher()):
+            for iteraciones in options['iteraciones']:
+                ms = self._medir(lambda: hasher.encode('calibracion', 'salcalibracion', iteraciones), muestras)
+                costos.setdefault(hasher.algorithm, []).append(ms / iteraciones)
+                self.stdout.write(f'{hasher.algorithm:<16}{f"iteraciones={iteraciones}":>22}{ms:>10.1f}')
+
+        if not options['sin_scrypt'] and hasattr(hashlib, 'scrypt'):
+            scrypt = ScryptPasswordHasher()
+            for n in (2 ** 13, 2 ** 14, 2 ** 15):
+                try:
+                    ms = self._medir(lambda: scrypt.encode('calibracion', 'salcalibracion', n=n), muestras)
+                except ValueError:
+                    # Excede la memoria máxima que admite OpenSSL con maxmem por defecto.
+                    self.stdout.write(f'{scrypt.algorithm:<16}{f"n={n},r=8,p=1":>22}{"memoria":>10}')
+                    continue
+                self.stdout.write(f'{scrypt.algorithm:<16}{f"n={n},r=8,p=1":>22}{ms:>10.1f}')
+
+        por_iteracion = statistics.median(costos['pbkdf2_sha256'])
+        recomendado = max(10_000, int(round(objetivo / por_iteracion, -4)))
+        ms = self._medir(lambda: PBKDF2PasswordHasher().encode('calibracion', 'salcalibracion', recomendado), muestras)
+
+        self.stdout.write('')
+        self.stdout.write(self.style.SUCCESS(
+            f'Recomendado: PASSWORD_HASH_ITERATIONS={recomendado} ({ms:.1f} ms medidos)'
+        ))
+        if recomendado < MINIMO_OWASP_PBKDF2_SHA256:
+            self.stdout.write(self.style.WARNING(
+                f'Por debajo del mínimo de OWASP ({MINIMO_OWASP_PBKDF2_SHA256}); '
+                'considere más CPU o un objetivo mayor.'
+            ))
+        self.stdout.write(f'Actual: PASSWORD_HASH_ITERATIONS={settings.PASSWORD_HASH_ITERATIONS}')
+        self._reportar_pendientes(settings.PASSWORD_HASH_ITERATIONS)
+
+    def _medir(self, fn, muestras) -> float:
+        tiempos = []
+        for _ in range(muestras):
+            inicio = time.perf_counter()
+            fn()
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        return statistics.median(tiempos)
+
+    def _reportar_pendientes(self, iteraciones):
+        """
+        Cuántos usuarios tienen un hash con otro costo; se recalcula en su
+        próximo login.
+        """
+        try:
+            pendientes = Usuario.objects.exclude(
+                password__startswith=f'pbkdf2_sha256${iteraciones}$'
+            ).count()
+        except DatabaseError:
+            return
+        self.stdout.write(f'Contraseñas pendientes de rehash: {pendientes}')
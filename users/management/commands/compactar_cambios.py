@@ -0,0 +1,49 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from users.models import CambioUsuario
+
+
+class Command(BaseCommand):
+    help = (
+        'Compacta el outbox de cambios de usuarios: elimina por lotes los '
+        'cambios más antiguos que la retención que ya tienen uno posterior del '
+        'mismo usuario. Cualquier cursor del feed sigue llegando al estado final.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dias', type=int, default=settings.CAMBIOS_RETENCION_DIAS,
+                            help='Se conserva el historial completo de los últimos N días '
+                                 '(default: CAMBIOS_RETENCION_DIAS).')
+        parser.add_argument('--lote', type=int, default=5000,
+                            help='Cambios revisados por transacción (default: 5000).')
+        parser.add_argument('--pausa', type=float, default=0.1,
+                            help='Segundos de espera entre lotes (default: 0.1).')
+
+    def handle(self, *args, **options):
+        limite = timezone.now() - timedelta(days=options['dias'])
+        posterior = CambioUsuario.objects.filter(usuario_id=OuterRef('usuario_id'), seq__gt=OuterRef('seq'))
+        lote, desde, total = options['lote'], 0, 0
+        while True:
+            # Se avanza por seq (la PK) para no volver a revisar los que quedan.
+            seqs = list(
+                CambioUsuario.objects.filter(seq__gt=desde, creado__lt=limite)
+                .order_by('seq').values_list('seq', flat=True)[:lote]
+            )
+            if not seqs:
+                break
+            desde = seqs[-1]
+            with transaction.atomic():
+                eliminados, _ = CambioUsuario.objects.filter(seq__in=seqs).filter(Exists(posterior)).delete()
+            total += eliminados
+            if len(seqs) < lote:
+                break
+            time.sleep(options['pausa'])
+
+        self.stdout.write(self.style.SUCCESS(f'Cambios eliminados: {total}'))
@@ -0,0 +1,64 @@
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from users.webhooks import Despachador
+
+
+class Command(BaseCommand):
+    help = (
+        'Entrega por webhook los cambios del outbox a los suscriptores activos, '
+        'en lotes y en paralelo, con reintentos y backoff. Se ejecuta como un '
+        'proceso aparte (una sola réplica).'
+    )
+
+    def add_arguments(self, parser):
+        config = settings.WEBHOOKS
+        parser.add_argument('--intervalo', type=float, default=config['INTERVALO'],
+                            help='Segundos de espera cuando no hubo cambios que entregar '
+                                 '(default: WEBHOOKS_INTERVALO).')
+        parser.add_argument('--workers', type=int, default=config['WORKERS'],
+                            help='Entregas simultáneas (default: WEBHOOKS_WORKERS).')
+        parser.add_argument('--una-vez', action='store_true',
+                            help='Ejecuta un solo ciclo y termina.')
+
+    def handle(self, *args, **options):
+        self._detener = False
+        if not options['una_vez']:
+            # Termina el ciclo en curso antes de salir (p. ej. al reiniciar el pod).
+            signal.signal(signal.SIGTERM, self._senal)
+            signal.signal(signal.SIGINT, self._senal)
+
+        with ThreadPoolExecutor(max_workers=options['workers'], thread_name_prefix='webhooks') as pool:
+            despachador = Despachador(pool)
+            while True:
+                # Espera a que termine alguna entrega, no a todas: un
+                # suscriptor lento no frena los lotes de los demás.
+                resultado = despachador.ciclo(timeout=options['intervalo'], todos=options['una_vez'])
+                self._informar(resultado)
+                if options['una_vez'] or self._detener:
+                    break
+                # Con atraso se sigue de inmediato hasta ponerse al día; con
+                # entregas en curso el ciclo ya esperó.
+                if not resultado['entregados'] and not despachador.en_curso:
+                    time.sleep(options['intervalo'])
+                if self._detener:
+                    break
+                # Proceso de larga duración: descarta conexiones caídas o vencidas.
+                close_old_connections()
+            # Registra las entregas en curso antes de salir.
+            self._informar(despachador.esperar())
+
+    def _informar(self, resultado):
+        if resultado['entregados'] or resultado['fallidos']:
+            self.stdout.write(
+                f"Cambios entregados: {resultado['entregados']}, "
+                f"suscriptores con error: {resultado['fallidos']}"
+            )
+
+    def _senal(self, *args):
+        self._detener = True
@@ -0,0 +1,48 @@
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from users.hashers import PoolHashing
+from users.importacion import FORMATOS, importar_usuarios, leer_filas
+
+
+class Command(BaseCommand):
+    help = (
+        'Importa usuarios desde un archivo JSON, NDJSON o CSV (o "-" para stdin), '
+        'leyéndolo por lotes y con los hashes calculados en paralelo.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help='Ruta del archivo o "-" para leer de stdin.')
+        parser.add_argument('--formato', choices=FORMATOS,
+                            help='Formato del archivo (por defecto se deduce de la extensión).')
+        parser.add_argument('--lote', type=int, default=1000,
+                            help='Filas por lote: una consulta de unicidad y un bulk_create por lote.')
+        parser.add_argument('--workers', type=int,
+                            help='Hilos para calcular hashes (default: BULK_IMPORT_HASHING_WORKERS).')
+
+    def handle(self, *args, **options):
+        archivo = options['archivo']
+        formato = options['formato'] or archivo.rsplit('.', 1)[-1].lower()
+        if formato not in FORMATOS:
+            raise CommandError(f"No se pudo deducir el formato; use --formato ({', '.join(FORMATOS)}).")
+
+        workers = options['workers'] or settings.BULK_IMPORT_HASHING_WORKERS
+        pool = PoolHashing(workers=workers, cola=0)
+        stream = sys.stdin.buffer if archivo == '-' else open(archivo, 'rb')
+        try:
+            reporte = importar_usuarios(leer_filas(stream, formato), tamanio_lote=options['lote'], pool=pool)
+        except ValueError as e:
+            raise CommandError(str(e))
+        finally:
+            pool.cerrar()
+            if stream is not sys.stdin.buffer:
+                stream.close()
+
+        for fila in reporte['filas']:
+            if fila['estado'] == 'error':
+                self.stdout.write(self.style.WARNING(f"Fila {fila['fila']} ({fila['nombre_usuario']}): {fila['error']}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"{reporte['creados']} de {reporte['total']} usuarios creados, {reporte['errores']} con errores."
+        ))
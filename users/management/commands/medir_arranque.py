@@ -0,0 +1,102 @@
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Se ejecuta en un proceso nuevo: el actual ya tiene todo importado.
+SCRIPT = '''
+import json, sys, time
+inicio = time.perf_counter()
+import django
+django.setup()
+setup = time.perf_counter()
+from django.urls import get_resolver
+get_resolver().url_patterns
+urls = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+wsgi = time.perf_counter()
+print(json.dumps({
+    'setup': (setup - inicio) * 1000,
+    'urls': (urls - setup) * 1000,
+    'wsgi': (wsgi - urls) * 1000,
+    'cargados': sorted({m.split('.')[0] for m in sys.modules}),
+}))
+'''
+
+# Paquetes que deben cargarse después del arranque (feature_flags/ld_client.py).
+DIFERIDOS = ('ldclient', 'ldobserve', 'opentelemetry')
+
+IMPORTTIME = re.compile(r'^import time:\s+(\d+) \|\s+\d+ \|\s+(\S+)$')
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide el arranque en procesos nuevos: django.setup() (settings y '
+        'apps), carga de URLs y vistas, y creación de la aplicación WSGI '
+        '(middleware). Lista los paquetes que más tardan en importarse y '
+        'verifica que el SDK de LaunchDarkly y OpenTelemetry no se carguen '
+        'al arrancar.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--muestras', type=int, default=3,
+                            help='Procesos a medir; se usa la mediana (default: 3).')
+        parser.add_argument('--top', type=int, default=10,
+                            help='Paquetes más lentos a mostrar (default: 10).')
+        parser.add_argument('--limite-ms', type=float, default=None,
+                            help='Falla si el arranque total supera este valor.')
+
+    def handle(self, *args, **options):
+        muestras = [self._medir() for _ in range(max(1, options['muestras']))]
+
+        self.stdout.write(f'{"fase":<24}{"ms":>10}')
+        fases = (('django.setup()', 'setup'), ('URLs y vistas', 'urls'), ('aplicación WSGI', 'wsgi'))
+        for nombre, clave in fases:
+            self.stdout.write(f'{nombre:<24}{statistics.median(m[clave] for m in muestras):>10.1f}')
+        total = statistics.median(m['setup'] + m['urls'] + m['wsgi'] for m in muestras)
+        self.stdout.write(f'{"total":<24}{total:>10.1f}')
+
+        self.stdout.write(f'\n{"paquete":<32}{"import ms":>10}')
+        paquetes = defaultdict(list)
+        for muestra in muestras:
+            for paquete, ms in muestra['imports'].items():
+                paquetes[paquete].append(ms)
+        lentos = sorted(((statistics.median(v), k) for k, v in paquetes.items()), reverse=True)
+        for ms, paquete in lentos[:options['top']]:
+            self.stdout.write(f'{paquete:<32}{ms:>10.1f}')
+
+        cargados = [paquete for paquete in DIFERIDOS if paquete in muestras[0]['cargados']]
+        if cargados:
+            self.stdout.write(self.style.WARNING(f'\nCargados al arrancar (deberían diferirse): {", ".join(cargados)}'))
+        else:
+            self.stdout.write(f'\nDiferidos correctamente: {", ".join(DIFERIDOS)}')
+
+        if options['limite_ms'] is not None and total > options['limite_ms']:
+            raise CommandError(f'El arranque tarda {total:.1f} ms, más que el límite de {options["limite_ms"]:.1f} ms.')
+
+    def _medir(self) -> dict:
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'authservice.settings'))
+        proceso = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', SCRIPT],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True
+        )
+        if proceso.returncode != 0:
+            raise CommandError(f'El proceso de medición falló:\n{proceso.stderr[-2000:]}')
+        resultado = json.loads(proceso.stdout.strip().splitlines()[-1])
+
+        # Tiempo propio de cada módulo sumado por paquete raíz: el acumulado
+        # de un import incluye a los paquetes que este importa.
+        imports = defaultdict(float)
+        for linea in proceso.stderr.splitlines():
+            coincidencia = IMPORTTIME.match(linea)
+            if coincidencia:
+                imports[coincidencia.group(2).split('.')[0]] += int(coincidencia.group(1)) / 1000
+        resultado['imports'] = imports
+        return resultado
@@ -0,0 +1,97 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+# Variables de entorno de cada modo (ver DATABASES en authservice/settings.py).
+MODOS = {
+    'sin-persistencia': {'DB_POOL_ENABLED': 'false', 'DB_CONN_MAX_AGE': '0'},
+    'persistentes': {'DB_POOL_ENABLED': 'false', 'DB_CONN_MAX_AGE': '60'},
+    'pool': {'DB_POOL_ENABLED': 'true'},
+}
+
+# Se ejecuta en un proceso nuevo por modo: la configuración de conexiones se
+# lee al cargar settings. Las peticiones pasan por WSGIHandler como en un
+# servidor real, con las señales que abren y cierran conexiones.
+SCRIPT = '''
+import io, json, sys, time
+import django
+django.setup()
+from django.core.handlers.wsgi import WSGIHandler
+
+handler = WSGIHandler()
+ruta, _, consulta = sys.argv[1].partition('?')
+peticiones, calentamiento = int(sys.argv[2]), int(sys.argv[3])
+
+
+def peticion():
+    environ = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': ruta, 'QUERY_STRING': consulta,
+        'SERVER_NAME': 'localhost', 'SERVER_PORT': '8010', 'HTTP_HOST': 'localhost',
+        'HTTP_ACCEPT': 'application/json', 'wsgi.input': io.BytesIO(b''), 'wsgi.url_scheme': 'http',
+    }
+    estado = []
+    respuesta = handler(environ, lambda status, headers: estado.append(status))
+    b''.join(respuesta)
+    respuesta.close()
+    if not estado[0].startswith('200'):
+        raise SystemExit('Respuesta ' + estado[0])
+
+
+for _ in range(calentamiento):
+    peticion()
+tiempos = []
+for _ in range(peticiones):
+    inicio = time.perf_counter()
+    peticion()
+    tiempos.append((time.perf_counter() - inicio) * 1000)
+print(json.dumps(tiempos))
+'''
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara la latencia por petición del listado con una conexión nueva '
+        'por petición, conexiones persistentes (CONN_MAX_AGE) y el pool de '
+        'psycopg. Cada modo corre en un proceso nuevo contra la base '
+        'configurada; solo ejecuta lecturas.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--peticiones', type=int, default=500,
+                            help='Peticiones medidas por modo (default: 500).')
+        parser.add_argument('--calentamiento', type=int, default=20,
+                            help='Peticiones previas sin medir (default: 20).')
+        parser.add_argument('--ruta', default='/api/users/?offset=10&include_total=false',
+                            help='Ruta GET a medir (default: listado sin total).')
+        parser.add_argument('--modos', nargs='+', choices=list(MODOS), default=list(MODOS),
+                            help='Modos a comparar (default: todos).')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('El benchmark requiere PostgreSQL.')
+
+        self.stdout.write(f'{"modo":<20}{"p50 ms":>10}{"p95 ms":>10}{"media ms":>10}')
+        for modo in options['modos']:
+            tiempos = sorted(self._medir(modo, options))
+            p95 = tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))]
+            self.stdout.write(
+                f'{modo:<20}{statistics.median(tiempos):>10.2f}{p95:>10.2f}{statistics.mean(tiempos):>10.2f}'
+            )
+
+    def _medir(self, modo, options) -> list[float]:
+        # Misma base que este proceso (en los tests, la base de pruebas).
+        env = dict(os.environ, POSTGRES_DB=connection.settings_dict['NAME'], **MODOS[modo])
+        env.setdefault('DJANGO_SETTINGS_MODULE', 'authservice.settings')
+        proceso = subprocess.run(
+            [sys.executable, '-c', SCRIPT, options['ruta'], str(options['peticiones']), str(options['calentamiento'])],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True
+        )
+        if proceso.returncode != 0:
+            raise CommandError(f'El modo {modo} falló:\n{(proceso.stderr or proceso.stdout)[-2000:]}')
+        return json.loads(proceso.stdout.strip().splitlines()[-1])
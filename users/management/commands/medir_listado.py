@@ -0,0 +1,125 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.http import QueryDict
+
+from users.cambios import ultimo_seq
+from users.filtros import filtrar_usuarios
+from users.lectura import CAMPOS, leer
+from users.models import CambioUsuario, Usuario
+
+# Consultas representativas del listado: (descripción, query string).
+CONSULTAS = (
+    ('rol poco frecuente', 'rol=superuser'),
+    ('inactivos', 'is_active=false'),
+    ('rol + activo', 'rol=profesor&is_active=false'),
+    ('prefijo de nombre', 'search=UA1B'),
+    ('prefijo de correo', 'search=a1b2'),
+    ('subcadena', 'search=1b2c&search_mode=contains'),
+)
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Inserta usuarios sintéticos en una transacción que se revierte al '
+        'final y muestra el plan y el tiempo de las consultas filtradas del '
+        'listado, del validador (ETag) y del COUNT de include_total=true. '
+        'Falla si alguna página recorre la tabla completa (Seq Scan).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, default=1_000_000,
+                            help='Usuarios sintéticos a insertar (default: 1000000).')
+        parser.add_argument('--offset', type=int, default=10,
+                            help='Tamaño de página de las consultas (default: 10).')
+        parser.add_argument('--planes', action='store_true',
+                            help='Imprime el plan completo de cada consulta.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('El benchmark requiere PostgreSQL.')
+
+        self.secuenciales = []
+        try:
+            with transaction.atomic():
+                self._poblar(options['filas'])
+                for descripcion, query in CONSULTAS:
+                    self._medir(descripcion, query, options['offset'], options['planes'])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        if not self._hay_trigramas():
+            self.stdout.write(self.style.WARNING(
+                'Sin índices de trigramas (pg_trgm no disponible): la búsqueda por '
+                'subcadena recorre la llave primaria hasta llenar la página.'
+            ))
+        if self.secuenciales:
+            raise CommandError(f"Consultas con Seq Scan: {', '.join(self.secuenciales)}")
+        self.stdout.write(self.style.SUCCESS('Todas las consultas usan índices.'))
+
+    def _hay_trigramas(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_indexes WHERE indexname = 'usuarios_nombre_trgm_idx'")
+            return cursor.fetchone() is not None
+
+    def _poblar(self, filas):
+        inicio = time.perf_counter()
+        with connection.cursor() as cursor:
+            # 1 de cada 1000 superusuarios y 1 de cada 20 inactivos.
+            cursor.execute(
+                f'''
+                INSERT INTO {Usuario._meta.db_table}
+                    (password, is_superuser, nombre_usuario, email_usuario, rol, is_active, is_staff,
+                     updated_at, version)
+                SELECT '!', false, 'u' || md5(i::text), md5(i::text || 'c') || '@udla.edu.ec',
+                       CASE WHEN i %% 1000 = 0 THEN 'superuser' ELSE 'profesor' END,
+                       i %% 20 <> 0, false, now(), 1
+                FROM generate_series(1, %s) AS i
+                ''',
+                [filas],
+            )
+            # Un alta en el outbox por usuario, como al registrarlos por la API.
+            cursor.execute(
+                f"""
+                INSERT INTO {CambioUsuario._meta.db_table} (usuario_id, operacion, datos, creado)
+                SELECT id, 'create', jsonb_build_object('id', id), now() FROM {Usuario._meta.db_table}
+                """
+            )
+            cursor.execute(f'ANALYZE {Usuario._meta.db_table}')
+            cursor.execute(f'ANALYZE {CambioUsuario._meta.db_table}')
+        self.stdout.write(f'{filas} usuarios insertados en {time.perf_counter() - inicio:.1f} s\n')
+        self.stdout.write(f'{"consulta":<22}{"página ms":>10}{"validador":>10}{"COUNT ms":>10}  nodos')
+
+    def _medir(self, descripcion, query, offset, planes):
+        filtrados = filtrar_usuarios(Usuario.objects.all(), QueryDict(query))
+        # Las mismas columnas que lee el listado (id y updated_at para el validador).
+        usuarios = leer(filtrados.order_by('id'), CAMPOS + ('updated_at',), con_id=True)[:offset + 1]
+        plan = json.loads(usuarios.explain(format='json', analyze=True))[0]
+        validador = self._cronometrar(ultimo_seq)
+        conteo = self._cronometrar(filtrados.count)
+        nodos = list(self._nodos(plan['Plan']))
+        if any(tipo == 'Seq Scan' for tipo, _ in nodos):
+            self.secuenciales.append(descripcion)
+        resumen = ', '.join(f'{tipo} ({indice})' if indice else tipo for tipo, indice in nodos)
+        self.stdout.write(
+            f'{descripcion:<22}{plan["Execution Time"]:>10.2f}{validador:>10.2f}{conteo:>10.2f}  {resumen}'
+        )
+        if planes:
+            self.stdout.write(usuarios.explain(analyze=True))
+
+    def _cronometrar(self, funcion) -> float:
+        inicio = time.perf_counter()
+        funcion()
+        return (time.perf_counter() - inicio) * 1000
+
+    def _nodos(self, nodo):
+        yield nodo['Node Type'], nodo.get('Index Name')
+        for hijo in nodo.get('Plans', []):
+            yield from self._nodos(hijo)
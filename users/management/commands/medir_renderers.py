@@ -0,0 +1,73 @@
+import statistics
+import time
+
+import msgpack
+import orjson
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from users.lectura import leer
+from users.models import Usuario
+from users.renderers import MessagePackRenderer, ORJSONRenderer
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara tiempo de render y tamaño de una página del listado con '
+        'JSONRenderer de DRF, orjson y MessagePack. Los usuarios sintéticos se '
+        'insertan en una transacción que se revierte.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, nargs='+', default=[100, 1000, 10000],
+                            help='Tamaños de página a medir (default: 100 1000 10000).')
+        parser.add_argument('--muestras', type=int, default=20,
+                            help='Repeticiones por medición; se usa la mediana (default: 20).')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                Usuario.objects.bulk_create([
+                    Usuario(nombre_usuario=f'bench{i}', email_usuario=f'bench{i}@udla.edu.ec', password='!')
+                    for i in range(max(options['filas']))
+                ], batch_size=1000)
+                self.stdout.write(
+                    f'{"filas":>8}{"drf ms":>10}{"orjson ms":>11}{"msgpack ms":>12}'
+                    f'{"drf KB":>10}{"orjson KB":>11}{"msgpack KB":>12}'
+                )
+                for filas in options['filas']:
+                    self._medir(filas, options['muestras'])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _medir(self, filas, muestras):
+        resultados = list(leer(Usuario.objects.order_by('id'))[:filas])
+        # Mismo sobre que pagination_response.
+        pagina = {'count': filas, 'page': 1, 'offset': filas, 'pages': 1, 'results': resultados}
+
+        renderers = [JSONRenderer(), ORJSONRenderer(), MessagePackRenderer()]
+        salidas = [renderer.render(pagina) for renderer in renderers]
+        drf, rapido, binario = salidas
+        if orjson.loads(rapido) != orjson.loads(drf) or msgpack.unpackb(binario) != orjson.loads(drf):
+            raise CommandError('Los renderers producen datos distintos.')
+
+        tiempos = [self._tiempo(lambda r=renderer: r.render(pagina), muestras) for renderer in renderers]
+        tamanos = [len(salida) / 1024 for salida in salidas]
+        self.stdout.write(
+            f'{filas:>8}{tiempos[0]:>10.2f}{tiempos[1]:>11.2f}{tiempos[2]:>12.2f}'
+            f'{tamanos[0]:>10.1f}{tamanos[1]:>11.1f}{tamanos[2]:>12.1f}'
+        )
+
+    def _tiempo(self, fn, muestras) -> float:
+        tiempos = []
+        for _ in range(muestras):
+            inicio = time.perf_counter()
+            fn()
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        return statistics.median(tiempos)
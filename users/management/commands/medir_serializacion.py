@@ -0,0 +1,66 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from users.lectura import leer
+from users.models import Usuario
+from users.serializers import RegistroUsuarioSerializer
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara el costo de serializar una página del listado con '
+        'RegistroUsuarioSerializer frente a la lectura con .values(). Los '
+        'usuarios sintéticos se insertan en una transacción que se revierte.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, nargs='+', default=[10, 100, 1000],
+                            help='Tamaños de página a medir (default: 10 100 1000).')
+        parser.add_argument('--muestras', type=int, default=20,
+                            help='Repeticiones por medición; se usa la mediana (default: 20).')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                Usuario.objects.bulk_create([
+                    Usuario(nombre_usuario=f'bench{i}', email_usuario=f'bench{i}@udla.edu.ec', password='!')
+                    for i in range(max(options['filas']))
+                ], batch_size=1000)
+                self.stdout.write(f'{"filas":>8}{"serializer ms":>16}{".values() ms":>16}{"x":>8}')
+                for filas in options['filas']:
+                    self._medir(filas, options['muestras'])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _medir(self, filas, muestras):
+        usuarios = Usuario.objects.order_by('id')
+        renderer = JSONRenderer()
+
+        def con_serializer():
+            return renderer.render(RegistroUsuarioSerializer(usuarios[:filas], many=True).data)
+
+        def con_values():
+            return renderer.render(list(leer(usuarios)[:filas]))
+
+        if con_serializer() != con_values():
+            raise CommandError('La salida de .values() difiere de la del serializer.')
+
+        antes, despues = self._tiempo(con_serializer, muestras), self._tiempo(con_values, muestras)
+        self.stdout.write(f'{filas:>8}{antes:>16.2f}{despues:>16.2f}{antes / despues:>8.1f}')
+
+    def _tiempo(self, fn, muestras) -> float:
+        tiempos = []
+        for _ in range(muestras):
+            inicio = time.perf_counter()
+            fn()
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        return statistics.median(tiempos)
@@ -0,0 +1,63 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from users.authentication import invalidar_tokens, vigencia_token
+from users.models import Usuario
+
+
+class Command(BaseCommand):
+    help = (
+        'Elimina por lotes los tokens vencidos y los de usuarios desactivados. '
+        'Cada lote es una transacción corta para no mantener bloqueos largos.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=1000,
+                            help='Tokens eliminados por transacción (default: 1000).')
+        parser.add_argument('--pausa', type=float, default=0.1,
+                            help='Segundos de espera entre lotes (default: 0.1).')
+        parser.add_argument('--simular', action='store_true',
+                            help='Solo cuenta los tokens que se eliminarían.')
+
+    def handle(self, *args, **options):
+        # Dos pasadas separadas para que cada una use su índice
+        # (authtoken_token.created y authtoken_token.user_id).
+        consultas = {
+            'usuarios inactivos': Token.objects.filter(
+                user_id__in=Usuario.objects.filter(is_active=False).values('id')
+            ),
+        }
+        vigencia = vigencia_token()
+        if vigencia is not None:
+            consultas['vencidos'] = Token.objects.filter(created__lt=timezone.now() - vigencia)
+
+        total = 0
+        for descripcion, candidatos in consultas.items():
+            candidatos = candidatos.order_by()
+            if options['simular']:
+                self.stdout.write(f'Tokens a eliminar ({descripcion}): {candidatos.count()}')
+                continue
+            eliminados = self._purgar(candidatos, options['lote'], options['pausa'])
+            self.stdout.write(f'Tokens eliminados ({descripcion}): {eliminados}')
+            total += eliminados
+
+        if not options['simular']:
+            self.stdout.write(self.style.SUCCESS(f'Tokens eliminados: {total}'))
+
+    def _purgar(self, candidatos, lote, pausa) -> int:
+        total = 0
+        while True:
+            keys = list(candidatos.values_list('key', flat=True)[:lote])
+            if not keys:
+                return total
+            with transaction.atomic():
+                eliminados, _ = Token.objects.filter(key__in=keys).delete()
+            invalidar_tokens(keys)
+            total += eliminados
+            if len(keys) < lote:
+                return total
+            time.sleep(pausa)
@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Índice sobre authtoken_token.created para que la purga de tokens vencidos
+    no recorra la tabla completa en cada lote.
+    """
+
+    dependencies = [
+        ('users', '0001_initial'),
+        ('authtoken', '0004_alter_tokenproxy_options'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE INDEX IF NOT EXISTS authtoken_token_created_idx ON authtoken_token (created);',
+            reverse_sql='DROP INDEX IF EXISTS authtoken_token_created_idx;',
+        ),
+    ]
@@ -0,0 +1,81 @@
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+TRIGRAMAS = {
+    'usuarios_nombre_trgm_idx': 'nombre_usuario',
+    'usuarios_email_trgm_idx': 'email_usuario',
+}
+
+
+def crear_trigramas(apps, schema_editor):
+    """
+    Los índices de subcadena requieren pg_trgm (incluida en las imágenes
+    oficiales de PostgreSQL). Si el servidor no la trae se omiten: la búsqueda
+    por subcadena sigue funcionando, pero sin índice.
+    """
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for nombre, columna in TRIGRAMAS.items():
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {nombre} '
+            f'ON usuarios USING gin (UPPER({columna}) gin_trgm_ops)'
+        )
+
+
+def borrar_trigramas(apps, schema_editor):
+    for nombre in TRIGRAMAS:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {nombre}')
+
+
+class Migration(migrations.Migration):
+    """
+    Índices para filtrar y buscar en el listado de usuarios (rol, is_active,
+    prefijo y subcadena de nombre/correo).
+
+    Se crean con CONCURRENTLY para no bloquear escrituras en tablas grandes,
+    por eso la migración no es atómica. pg_trgm es una extensión confiable
+    desde PostgreSQL 13: basta con privilegio CREATE sobre la base de datos.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ('users', '0002_authtoken_created_index'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='usuario',
+            index=models.Index(fields=['rol', 'id'], name='usuarios_rol_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='usuario',
+            index=models.Index(condition=models.Q(('is_active', False)), fields=['id'], name='usuarios_inactivos_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='usuario',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('nombre_usuario'), name='text_pattern_ops'), name='usuarios_nombre_prefijo_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='usuario',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('email_usuario'), name='text_pattern_ops'), name='usuarios_email_prefijo_idx'),
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[migrations.RunPython(crear_trigramas, borrar_trigramas)],
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='usuario',
+                    index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('nombre_usuario'), name='gin_trgm_ops'), name='usuarios_nombre_trgm_idx'),
+                ),
+                migrations.AddIndex(
+                    model_name='usuario',
+                    index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('email_usuario'), name='gin_trgm_ops'), name='usuarios_email_trgm_idx'),
+                ),
+            ],
+        ),
+    ]
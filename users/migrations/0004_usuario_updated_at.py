@@ -0,0 +1,30 @@
+import django.utils.timezone
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Marca de modificación para ETag/Last-Modified. Las filas existentes toman
+    la fecha de la migración (un valor constante: PostgreSQL agrega la
+    columna sin reescribir la tabla). El índice se crea con CONCURRENTLY.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ('users', '0003_usuario_indices_busqueda'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usuario',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        AddIndexConcurrently(
+            model_name='usuario',
+            index=models.Index(fields=['updated_at'], name='usuarios_updated_at_idx'),
+        ),
+    ]
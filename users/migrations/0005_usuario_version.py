@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Versión de la fila para If-Match. El default es constante: PostgreSQL
+    agrega la columna sin reescribir la tabla.
+    """
+
+    dependencies = [
+        ('users', '0004_usuario_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usuario',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
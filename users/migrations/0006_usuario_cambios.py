@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-18 06:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_usuario_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CambioUsuario',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('usuario_id', models.BigIntegerField()),
+                ('operacion', models.CharField(choices=[('create', 'Alta'), ('update', 'Actualización'), ('deactivate', 'Desactivación'), ('activate', 'Reactivación')], max_length=20)),
+                ('datos', models.JSONField()),
+                ('creado', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'usuarios_cambios',
+                'indexes': [models.Index(fields=['usuario_id', 'seq'], name='usuarios_cambios_usuario_idx')],
+            },
+        ),
+    ]
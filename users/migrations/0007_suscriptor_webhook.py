@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-18 06:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_usuario_cambios'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SuscriptorWebhook',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=100, unique=True)),
+                ('url', models.URLField(max_length=500)),
+                ('secreto', models.CharField(blank=True, max_length=128)),
+                ('activo', models.BooleanField(default=True)),
+                ('ultimo_seq', models.BigIntegerField(blank=True, null=True)),
+                ('fallos', models.PositiveIntegerField(default=0)),
+                ('proximo_intento', models.DateTimeField(blank=True, null=True)),
+                ('ultimo_error', models.TextField(blank=True)),
+                ('creado', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'webhooks_suscriptores',
+            },
+        ),
+    ]
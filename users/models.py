@@ -1,8 +1,40 @@
 #Models.py
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import Upper
 from decouple import config
 
+
+class UsuarioDuplicado(ValueError):
+    """
+    Violación de una restricción única de `Usuario`; `campo` indica cuál.
+    """
+    def __init__(self, campo, mensaje):
+        super().__init__(mensaje)
+        self.campo = campo
+
+
+class VersionObsoleta(Exception):
+    """
+    La fila cambió desde que el cliente (o la petición) la leyó: el UPDATE
+    condicionado por `version` no afectó ninguna fila.
+    """
+
+
+def campo_duplicado(error: IntegrityError):
+    """
+    Retorna 'nombre_usuario' o 'email_usuario' si el IntegrityError proviene
+    de su restricción única, o None si es otro error.
+    """
+    diag = getattr(error.__cause__, 'diag', None)
+    origen = getattr(diag, 'constraint_name', None) or str(error)
+    for campo in ('nombre_usuario', 'email_usuario'):
+        if campo in origen:
+            return campo
+    return None
+
+
 class UsuarioManager(BaseUserManager):
     def create_user(self, nombre_usuario, email_usuario, contrasenia_usuario=None, **extra_fields):
         if not email_usuario:
@@ -10,18 +42,24 @@ class UsuarioManager(BaseUserManager):
 
         email_usuario = self.normalize_email(email_usuario)
 
-        if Usuario.objects.filter(nombre_usuario=nombre_usuario).exists():
-            raise ValueError('Ya existe un usuario con ese nombre de usuario')
-        if Usuario.objects.filter(email_usuario=email_usuario).exists():
-            raise ValueError('Ya existe un usuario con ese correo electrónico')
-
         user = self.model(
             nombre_usuario=nombre_usuario,
             email_usuario=email_usuario,
             **extra_fields
         )
         user.set_password(contrasenia_usuario)
-        user.save(using=self._db)
+        # La unicidad la garantizan las restricciones de la tabla: un INSERT en
+        # lugar de dos exists() previos que además no evitan la carrera.
+        try:
+            with transaction.atomic(using=self._db):
+                user.save(using=self._db)
+        except IntegrityError as e:
+            campo = campo_duplicado(e)
+            if campo == 'nombre_usuario':
+                raise UsuarioDuplicado(campo, 'Ya existe un usuario con ese nombre de usuario')
+            if campo == 'email_usuario':
+                raise UsuarioDuplicado(campo, 'Ya existe un usuario con ese correo electrónico')
+            raise
         return user
 
     def create_superuser(self, nombre_usuario, email_usuario, contrasenia_usuario=None, **extra_fields):
@@ -47,6 +85,12 @@ class Usuario(AbstractBaseUser, PermissionsMixin):
     rol = models.CharField(max_length=20, choices=ROLES, default='profesor')
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
+    # Validador de las lecturas condicionales (ETag/Last-Modified). Las
+    # escrituras con .update() deben incluirlo (y `version`).
+    updated_at = models.DateTimeField(auto_now=True)
+    # Control de concurrencia optimista (If-Match en PATCH): toda escritura
+    # la incrementa con F('version') + 1.
+    version = models.PositiveIntegerField(default=1)
 
     objects = UsuarioManager()
 
@@ -58,3 +102,70 @@ class Usuario(AbstractBaseUser, PermissionsMixin):
     
     class Meta:
         db_table = 'usuarios'
+        # Índices del listado filtrado (ver users/filtros.py). Las búsquedas
+        # usan istartswith/icontains, que PostgreSQL evalúa como
+        # UPPER(columna::text) LIKE ...; por eso los índices son sobre UPPER().
+        indexes = [
+            # ?rol= ordenado por id (paginación keyset); is_active se filtra sobre él.
+            models.Index(fields=['rol', 'id'], name='usuarios_rol_id_idx'),
+            # Los inactivos son pocos: índice parcial en lugar de recorrer la PK.
+            models.Index(fields=['id'], condition=models.Q(is_active=False), name='usuarios_inactivos_id_idx'),
+            # Búsqueda por prefijo.
+            models.Index(OpClass(Upper('nombre_usuario'), name='text_pattern_ops'), name='usuarios_nombre_prefijo_idx'),
+            models.Index(OpClass(Upper('email_usuario'), name='text_pattern_ops'), name='usuarios_email_prefijo_idx'),
+            # MAX(updated_at) del validador del listado.
+            models.Index(fields=['updated_at'], name='usuarios_updated_at_idx'),
+            # Búsqueda por subcadena (pg_trgm).
+            GinIndex(OpClass(Upper('nombre_usuario'), name='gin_trgm_ops'), name='usuarios_nombre_trgm_idx'),
+            GinIndex(OpClass(Upper('email_usuario'), name='gin_trgm_ops'), name='usuarios_email_trgm_idx'),
+        ]
+
+
+class CambioUsuario(models.Model):
+    """
+    Outbox de cambios de usuarios (ver users/cambios.py). `datos` es la fila
+    del usuario tal como quedó después del cambio.
+    """
+    OPERACIONES = [
+        ('create', 'Alta'),
+        ('update', 'Actualización'),
+        ('deactivate', 'Desactivación'),
+        ('activate', 'Reactivación'),
+    ]
+
+    seq = models.BigAutoField(primary_key=True)
+    usuario_id = models.BigIntegerField()
+    operacion = models.CharField(max_length=20, choices=OPERACIONES)
+    datos = models.JSONField()
+    creado = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'usuarios_cambios'
+        indexes = [
+            # Compactación: ¿hay un cambio posterior del mismo usuario?
+            models.Index(fields=['usuario_id', 'seq'], name='usuarios_cambios_usuario_idx'),
+        ]
+
+
+class SuscriptorWebhook(models.Model):
+    """
+    Servicio que recibe por webhook los cambios del outbox (ver
+    users/webhooks.py). `ultimo_seq` es su cursor: último cambio entregado.
+    """
+    nombre = models.CharField(max_length=100, unique=True)
+    url = models.URLField(max_length=500)
+    # Firma HMAC-SHA256 del cuerpo (header X-Authservice-Firma).
+    secreto = models.CharField(max_length=128, blank=True)
+    activo = models.BooleanField(default=True)
+    # None: empieza por los cambios nuevos. 0: recibe todo el historial.
+    ultimo_seq = models.BigIntegerField(null=True, blank=True)
+    fallos = models.PositiveIntegerField(default=0)
+    proximo_intento = models.DateTimeField(null=True, blank=True)
+    ultimo_error = models.TextField(blank=True)
+    creado = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'webhooks_suscriptores'
+
+    def __str__(self):
+        return self.nombre
@@ -0,0 +1,123 @@
+"""
+Paginación por cursor (keyset) y conteo opcional del listado de usuarios.
+
+Con `page`/`offset` cada página ejecuta `COUNT(*)` y un `OFFSET` que recorre
+todas las filas anteriores, así que las páginas profundas son cada vez más
+lentas. El modo cursor filtra por `id` (`WHERE id > n ORDER BY id LIMIT k`)
+usando la llave primaria: cualquier página cuesta lo mismo que la primera.
+
+El cursor es opaco para el cliente: base64 de `{"id": n, "d": "n" | "p"}`
+(siguiente o anterior a `id`).
+"""
+import base64
+import json
+
+from django.db import connection
+
+SIGUIENTE = 'n'
+ANTERIOR = 'p'
+MODOS_TOTAL = ('true', 'false', 'estimate')
+
+
+class CursorInvalido(ValueError):
+    pass
+
+
+def codificar_cursor(id_usuario: int, direccion: str) -> str:
+    crudo = json.dumps({'id': id_usuario, 'd': direccion}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(crudo.encode()).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor: str) -> tuple[int | None, str]:
+    """
+    Retorna (id, dirección). Un cursor vacío es la primera página.
+
+    Lanza CursorInvalido si el cursor no es válido.
+    """
+    if not cursor:
+        return None, SIGUIENTE
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        datos = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        id_usuario, direccion = datos['id'], datos['d']
+    except (ValueError, TypeError, KeyError):
+        raise CursorInvalido('Cursor inválido.')
+    if not isinstance(id_usuario, int) or direccion not in (SIGUIENTE, ANTERIOR):
+        raise CursorInvalido('Cursor inválido.')
+    return id_usuario, direccion
+
+
+def _consulta_cursor(queryset, cursor: str, limite: int):
+    id_cursor, direccion = decodificar_cursor(cursor)
+    if direccion == SIGUIENTE:
+        if id_cursor is not None:
+            queryset = queryset.filter(id__gt=id_cursor)
+        return queryset.order_by('id')[:limite + 1], id_cursor, direccion
+    return queryset.filter(id__lt=id_cursor).order_by('-id')[:limite + 1], id_cursor, direccion
+
+
+def _pagina_cursor(filas: list, id_cursor, direccion: str, limite: int):
+    hay_mas = len(filas) > limite
+    if direccion == SIGUIENTE:
+        filas = filas[:limite]
+        hay_siguiente, hay_anterior = hay_mas, id_cursor is not None
+    else:
+        filas = filas[:limite][::-1]
+        hay_siguiente, hay_anterior = True, hay_mas
+
+    if not filas:
+        # Página vacía: se puede volver desde donde se pidió.
+        anterior = codificar_cursor(id_cursor, ANTERIOR) if direccion == SIGUIENTE and id_cursor else None
+        return filas, None, anterior
+
+    ultimo, primero = _id(filas[-1]), _id(filas[0])
+    siguiente = codificar_cursor(ultimo, SIGUIENTE) if hay_siguiente else None
+    anterior = codificar_cursor(primero, ANTERIOR) if hay_anterior else None
+    return filas, siguiente, anterior
+
+
+def paginar_por_cursor(queryset, cursor: str, limite: int):
+    """
+    Retorna (filas, cursor siguiente, cursor anterior) de una página de
+    `limite` filas. Se lee una fila extra para saber si hay más.
+    """
+    consulta, id_cursor, direccion = _consulta_cursor(queryset, cursor, limite)
+    return _pagina_cursor(list(consulta), id_cursor, direccion, limite)
+
+
+async def apaginar_por_cursor(queryset, cursor: str, limite: int):
+    """
+    Versión async de `paginar_por_cursor` (ORM async de Django).
+    """
+    consulta, id_cursor, direccion = _consulta_cursor(queryset, cursor, limite)
+    return _pagina_cursor([fila async for fila in consulta], id_cursor, direccion, limite)
+
+
+def _id(fila):
+    return fila['id'] if isinstance(fila, dict) else fila.id
+
+
+def contar(queryset, modo: str) -> int | None:
+    """
+    Total según `include_total`: exacto ('true'), omitido ('false') o
+    estimado por el planificador de PostgreSQL ('estimate'), que no recorre
+    la tabla.
+    """
+    if modo == 'false':
+        return None
+    if modo == 'estimate' and connection.vendor == 'postgresql':
+        plan = json.loads(queryset.order_by().explain(format='json'))
+        return int(plan[0]['Plan']['Plan Rows'])
+    return queryset.count()
+
+
+async def acontar(queryset, modo: str) -> int | None:
+    """
+    Versión async de `contar`.
+    """
+    if modo == 'false':
+        return None
+    if modo == 'estimate' and connection.vendor == 'postgresql':
+        plan = json.loads(await queryset.order_by().aexplain(format='json'))
+        return int(plan[0]['Plan']['Plan Rows'])
+    return await queryset.acount()
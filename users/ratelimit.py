@@ -0,0 +1,248 @@
+"""
+Límite de peticiones por token bucket para login y registro.
+
+Cada intento de login cuesta un hash PBKDF2 completo, así que una ráfaga de
+credenciales inválidas es una forma barata de agotar la CPU del pod. Los
+límites se verifican antes de `authenticate()`:
+
+- Por endpoint, con claves por IP y por `nombre_usuario`
+  (`RATE_LIMITS['ENDPOINTS']`, formato "N/periodo").
+- Por intentos fallidos de login (`RATE_LIMITS['FALLOS_LOGIN']`): al superar
+  el umbral se rechaza sin calcular el hash hasta que el bucket se recargue.
+
+Siempre se consulta primero el bucket en memoria del proceso (camino rápido);
+con `BACKEND = 'cache'` además se consulta un bucket compartido en la caché de
+Django. El backend compartido hace lectura-modificación-escritura sin bloqueo,
+así que bajo concurrencia extrema puede admitir algunas peticiones de más.
+"""
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .utils.metrics import metricas
+from .utils.ttl_cache import TTLCache
+
+PERIODOS = {'s': 1, 'sec': 1, 'm': 60, 'min': 60, 'h': 3600, 'hour': 3600}
+
+
+def parsear_tasa(tasa: str) -> tuple[int, int]:
+    """
+    "20/min" -> (20, 60): capacidad del bucket y segundos para recargarlo.
+    """
+    cantidad, periodo = tasa.split('/')
+    return int(cantidad), PERIODOS[periodo]
+
+
+def _recargar(estado, capacidad, periodo, ahora):
+    if estado is None:
+        return float(capacidad)
+    tokens, ultimo = estado
+    return min(float(capacidad), tokens + max(0.0, ahora - ultimo) * capacidad / periodo)
+
+
+def _espera(tokens, capacidad, periodo) -> int:
+    return max(1, math.ceil((1 - tokens) * periodo / capacidad))
+
+
+class LocalBackend:
+    """
+    Buckets en memoria del proceso (acotados por LRU).
+    """
+
+    def __init__(self, max_entries: int = 50000, clock=time.monotonic):
+        self._buckets = TTLCache(max_entries, ttl=3600)
+        self._lock = threading.Lock()
+        self._clock = clock
+
+    def consumir(self, key, capacidad, periodo) -> tuple[bool, int]:
+        with self._lock:
+            ahora = self._clock()
+            tokens = _recargar(self._buckets.get(key), capacidad, periodo, ahora)
+            if tokens >= 1:
+                self._buckets.set(key, (tokens - 1, ahora), ttl=periodo)
+                return True, 0
+            self._buckets.set(key, (tokens, ahora), ttl=periodo)
+            return False, _espera(tokens, capacidad, periodo)
+
+    def disponible(self, key, capacidad, periodo) -> tuple[bool, int]:
+        with self._lock:
+            tokens = _recargar(self._buckets.get(key), capacidad, periodo, self._clock())
+            return tokens >= 1, 0 if tokens >= 1 else _espera(tokens, capacidad, periodo)
+
+    def limpiar(self, key):
+        self._buckets.delete(key)
+
+
+class CacheBackend:
+    """
+    Buckets en la caché de Django, compartidos entre procesos/pods.
+    """
+
+    prefijo = 'ratelimit:'
+
+    def __init__(self, alias: str = 'default', clock=time.time):
+        self._cache = caches[alias]
+        self._clock = clock
+
+    def consumir(self, key, capacidad, periodo) -> tuple[bool, int]:
+        ahora = self._clock()
+        tokens = _recargar(self._cache.get(self.prefijo + key), capacidad, periodo, ahora)
+        permitido = tokens >= 1
+        if permitido:
+            tokens -= 1
+        self._cache.set(self.prefijo + key, (tokens, ahora), timeout=periodo)
+        return permitido, 0 if permitido else _espera(tokens, capacidad, periodo)
+
+    def disponible(self, key, capacidad, periodo) -> tuple[bool, int]:
+        tokens = _recargar(self._cache.get(self.prefijo + key), capacidad, periodo, self._clock())
+        return tokens >= 1, 0 if tokens >= 1 else _espera(tokens, capacidad, periodo)
+
+    def limpiar(self, key):
+        self._cache.delete(self.prefijo + key)
+
+
+class Limitador:
+    def __init__(self, config: dict):
+        self.config = config
+        self.local = LocalBackend()
+        self.compartido = CacheBackend(config.get('CACHE_ALIAS', 'default')) \
+            if config.get('BACKEND') == 'cache' else None
+
+    def _backends(self):
+        return [self.local] + ([self.compartido] if self.compartido else [])
+
+    def consumir(self, key, capacidad, periodo) -> tuple[bool, int]:
+        for backend in self._backends():
+            permitido, espera = backend.consumir(key, capacidad, periodo)
+            if not permitido:
+                return False, espera
+        return True, 0
+
+    def disponible(self, key, capacidad, periodo) -> tuple[bool, int]:
+        for backend in self._backends():
+            permitido, espera = backend.disponible(key, capacidad, periodo)
+            if not permitido:
+                return False, espera
+        return True, 0
+
+    def limpiar(self, key):
+        for backend in self._backends():
+            backend.limpiar(key)
+
+
+_limitador = None
+_limitador_lock = threading.Lock()
+
+
+def _config() -> dict:
+    return getattr(settings, 'RATE_LIMITS', {})
+
+
+def obtener_limitador() -> Limitador:
+    global _limitador
+    if _limitador is None:
+        with _limitador_lock:
+            if _limitador is None:
+                _limitador = Limitador(_config())
+    return _limitador
+
+
+def reiniciar_limites() -> None:
+    """
+    Descarta el estado de los buckets. Útil en pruebas.
+    """
+    global _limitador
+    with _limitador_lock:
+        _limitador = None
+
+
+def ip_cliente(request) -> str:
+    if _config().get('CONFIAR_X_FORWARDED_FOR'):
+        reenviada = request.META.get('HTTP_X_FORWARDED_FOR')
+        if reenviada:
+            return reenviada.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _claves(request, nombre_usuario):
+    claves = {'ip': ip_cliente(request)}
+    if isinstance(nombre_usuario, str) and nombre_usuario:
+        claves['usuario'] = nombre_usuario.strip().lower()
+    return claves
+
+
+def verificar_limite(endpoint: str, request, nombre_usuario=None) -> tuple[bool, int]:
+    """
+    Consume un token de cada bucket configurado para el endpoint.
+
+    Retorna (permitido, segundos de espera sugeridos).
+    """
+    config = _config()
+    if not config.get('ENABLED', True):
+        return True, 0
+
+    limites = config.get('ENDPOINTS', {}).get(endpoint, {})
+    claves = _claves(request, nombre_usuario)
+    limitador = obtener_limitador()
+    for tipo, tasa in limites.items():
+        if tipo not in claves:
+            continue
+        capacidad, periodo = parsear_tasa(tasa)
+        permitido, espera = limitador.consumir(f'{endpoint}:{tipo}:{claves[tipo]}', capacidad, periodo)
+        if not permitido:
+            metricas.incrementar(f'ratelimit.{endpoint}.rechazadas')
+            return False, espera
+    metricas.incrementar(f'ratelimit.{endpoint}.permitidas')
+    return True, 0
+
+
+def _fallos():
+    config = _config().get('FALLOS_LOGIN', {})
+    return config.get('UMBRAL', 5), config.get('VENTANA', 300)
+
+
+def login_bloqueado(request, nombre_usuario) -> tuple[bool, int]:
+    """
+    True si el usuario o la IP superaron el umbral de intentos fallidos.
+    No consume tokens: solo los fallos confirmados lo hacen.
+    """
+    if not _config().get('ENABLED', True):
+        return False, 0
+    umbral, ventana = _fallos()
+    limitador = obtener_limitador()
+    for tipo, valor in _claves(request, nombre_usuario).items():
+        permitido, espera = limitador.disponible(f'fallos:{tipo}:{valor}', umbral, ventana)
+        if not permitido:
+            metricas.incrementar('ratelimit.login.bloqueos_fallos')
+            return True, espera
+    return False, 0
+
+
+def registrar_fallo_login(request, nombre_usuario) -> None:
+    if not _config().get('ENABLED', True):
+        return
+    umbral, ventana = _fallos()
+    limitador = obtener_limitador()
+    for tipo, valor in _claves(request, nombre_usuario).items():
+        limitador.consumir(f'fallos:{tipo}:{valor}', umbral, ventana)
+    metricas.incrementar('ratelimit.login.fallos')
+
+
+def limpiar_fallos_login(request, nombre_usuario) -> None:
+    """
+    Un login exitoso reinicia el contador del usuario (no el de la IP).
+    """
+    claves = _claves(request, nombre_usuario)
+    if 'usuario' in claves:
+        obtener_limitador().limpiar(f'fallos:usuario:{claves["usuario"]}')
+
+
+def estadisticas() -> dict:
+    return {
+        nombre.removeprefix('ratelimit.'): valor
+        for nombre, valor in metricas.snapshot().items()
+        if nombre.startswith('ratelimit.')
+    }
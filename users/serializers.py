@@ -1,9 +1,51 @@
 import re
 from rest_framework import serializers
-from django.db import IntegrityError
-from .models import Usuario
+from rest_framework.validators import UniqueValidator
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from .cambios import registrar_cambios
+from .models import Usuario, UsuarioDuplicado, VersionObsoleta, campo_duplicado
 from django.contrib.auth import authenticate
 
+
+def validar_formato_nombre_usuario(value):
+    patron = r"^[a-zA-ZáéíóúÁÉÍÓÚñÑüÜ ]+$"
+    if not value or not value.strip():
+        raise serializers.ValidationError("El nombre de usuario no puede estar vacío.")
+    if not re.match(patron, value):
+        raise serializers.ValidationError("El nombre de usuario debe contener solo letras y espacios.")
+    if value.lower().strip() == 'admin':
+        raise serializers.ValidationError("El nombre de usuario 'admin' no está permitido.")
+    return value
+
+
+def validar_formato_email_usuario(value):
+    patron = r'^[a-zA-Z0-9._%+-]+@udla\.edu\.ec$'
+    if not value or not value.strip():
+        raise serializers.ValidationError("El correo electrónico no puede estar vacío.")
+
+    value = value.lower()
+
+    if not re.match(patron, value):
+        raise serializers.ValidationError("El correo electrónico debe pertenecer al dominio udla.edu.ec.")
+    return value
+
+
+def sin_validadores_unicos(fields):
+    """
+    Quita los UniqueValidator que DRF deriva de `unique=True`: cada uno es una
+    consulta previa a la escritura. La unicidad la garantiza la restricción de
+    la tabla y su IntegrityError se traduce al mismo error de campo.
+    """
+    for campo in ('nombre_usuario', 'email_usuario'):
+        if campo in fields:
+            fields[campo].validators = [
+                v for v in fields[campo].validators if not isinstance(v, UniqueValidator)
+            ]
+    return fields
+
+
 class ActualizarUsuarioSerializer(serializers.ModelSerializer):
     contrasenia_usuario = serializers.CharField(
         write_only=True,
@@ -20,11 +62,55 @@ class ActualizarUsuarioSerializer(serializers.ModelSerializer):
             'is_active'
         ]
 
+    mensajes_duplicado = {
+        'nombre_usuario': "El nombre ya está en uso.",
+        'email_usuario': "El correo ya está en uso.",
+    }
+
+    def get_fields(self):
+        return sin_validadores_unicos(super().get_fields())
+
     def update(self, instance, validated_data):
+        """
+        Escribe solo las columnas que cambiaron; si nada cambió no se
+        ejecuta el UPDATE.
+
+        El UPDATE está condicionado por la versión leída (`WHERE version = n`)
+        y la incrementa: si otra petición escribió antes, no afecta filas y se
+        lanza VersionObsoleta en lugar de sobrescribir su cambio. El cambio se
+        registra en el outbox dentro de la misma transacción.
+        """
+        campos = []
         if 'contrasenia_usuario' in validated_data:
             instance.set_password(validated_data.pop('contrasenia_usuario'))
-
-        return super().update(instance, validated_data)
+            campos.append('password')
+
+        for campo, valor in validated_data.items():
+            if getattr(instance, campo) != valor:
+                setattr(instance, campo, valor)
+                campos.append(campo)
+
+        if campos:
+            ahora = timezone.now()
+            try:
+                with transaction.atomic():
+                    actualizadas = Usuario.objects.filter(pk=instance.pk, version=instance.version).update(
+                        **{campo: getattr(instance, campo) for campo in campos},
+                        updated_at=ahora,
+                        version=F('version') + 1
+                    )
+                    if actualizadas:
+                        registrar_cambios('update', [instance.pk])
+            except IntegrityError as e:
+                campo = campo_duplicado(e)
+                if campo is None:
+                    raise
+                raise serializers.ValidationError({campo: [self.mensajes_duplicado[campo]]})
+            if not actualizadas:
+                raise VersionObsoleta(f'El usuario {instance.pk} cambió desde la versión {instance.version}.')
+            instance.updated_at = ahora
+            instance.version += 1
+        return instance
 
     def validate_nombre_usuario(self, value):
         patron = r"^[a-zA-ZáéíóúÁÉÍÓÚñÑüÜ ]+$"
@@ -36,11 +122,6 @@ class ActualizarUsuarioSerializer(serializers.ModelSerializer):
         if value.lower() == 'admin':
             raise serializers.ValidationError("El nombre 'admin' no está permitido.")
 
-        if Usuario.objects.exclude(
-            id=self.instance.id
-        ).filter(nombre_usuario=value).exists():
-            raise serializers.ValidationError("El nombre ya está en uso.")
-
         return value
 
     def validate_email_usuario(self, value):
@@ -52,11 +133,6 @@ class ActualizarUsuarioSerializer(serializers.ModelSerializer):
                 "El correo debe pertenecer al dominio udla.edu.ec."
             )
 
-        if Usuario.objects.exclude(
-            id=self.instance.id
-        ).filter(email_usuario=value).exists():
-            raise serializers.ValidationError("El correo ya está en uso.")
-
         return value
 
 class RegistroUsuarioSerializer(serializers.ModelSerializer):
@@ -68,6 +144,14 @@ class RegistroUsuarioSerializer(serializers.ModelSerializer):
         fields = ['id', 'nombre_usuario', 'email_usuario', 'contrasenia_usuario', 'rol', 'is_active']
         read_only_fields = ['id']
 
+    mensajes_duplicado = {
+        'nombre_usuario': "El nombre de usuario ya está en uso.",
+        'email_usuario': "El correo electrónico ya está en uso.",
+    }
+
+    def get_fields(self):
+        return sin_validadores_unicos(super().get_fields())
+
     def create(self, validated_data):
         try:
             user = Usuario.objects.create_user( # type: ignore
@@ -78,6 +162,8 @@ class RegistroUsuarioSerializer(serializers.ModelSerializer):
                 is_active=validated_data.get('is_active', True)
             )
             return user
+        except UsuarioDuplicado as e:
+            raise serializers.ValidationError({e.campo: [self.mensajes_duplicado[e.campo]]})
         except ValueError as e:
             raise serializers.ValidationError({'error': str(e)})
         except IntegrityError:
@@ -103,32 +189,10 @@ class RegistroUsuarioSerializer(serializers.ModelSerializer):
         return instance
     
     def validate_nombre_usuario(self, value):
-        patron = r"^[a-zA-ZáéíóúÁÉÍÓÚñÑüÜ ]+$"
-        if not value or not value.strip():
-            raise serializers.ValidationError("El nombre de usuario no puede estar vacío.")
-        if not re.match(patron, value):
-            raise serializers.ValidationError("El nombre de usuario debe contener solo letras y espacios.")
-        if value.lower().strip() == 'admin':
-            raise serializers.ValidationError("El nombre de usuario 'admin' no está permitido.")
-        if Usuario.objects.filter(nombre_usuario=value).exists():
-            raise serializers.ValidationError("El nombre de usuario ya está en uso.")
-        
-        return value
+        return validar_formato_nombre_usuario(value)
 
     def validate_email_usuario(self, value):
-        patron = r'^[a-zA-Z0-9._%+-]+@udla\.edu\.ec$'
-        if not value or not value.strip():
-            raise serializers.ValidationError("El correo electrónico no puede estar vacío.")
-
-        value = value.lower()
-
-        if not re.match(patron, value):
-            raise serializers.ValidationError("El correo electrónico debe pertenecer al dominio udla.edu.ec.")
-
-        if Usuario.objects.filter(email_usuario=value).exists():
-            raise serializers.ValidationError("El correo electrónico ya está en uso.")
-        
-        return value
+        return validar_formato_email_usuario(value)
 
 
 class LoginUsuarioSerializer(serializers.Serializer):
@@ -146,3 +210,29 @@ class LoginUsuarioSerializer(serializers.Serializer):
         if not user.is_active:
             raise serializers.ValidationError("La cuenta está desactivada", code='authorization')
         return user
+
+
+class IntrospeccionTokensSerializer(serializers.Serializer):
+    tokens = serializers.ListField(
+        child=serializers.CharField(max_length=40),
+        allow_empty=False,
+        max_length=100
+    )
+
+
+class ConsultaMasivaSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False)
+    nombres_usuario = serializers.ListField(child=serializers.CharField(max_length=50), required=False)
+
+    def validate(self, attrs):
+        total = len(attrs.get('ids', [])) + len(attrs.get('nombres_usuario', []))
+        if not total:
+            raise serializers.ValidationError("Envíe 'ids' o 'nombres_usuario'.")
+        maximo = self.context.get('maximo', 100)
+        if total > maximo:
+            raise serializers.ValidationError(f"Se permiten como máximo {maximo} identificadores por petición.")
+        return attrs
+
+
+class CambioEstadoMasivoSerializer(ConsultaMasivaSerializer):
+    is_active = serializers.BooleanField()
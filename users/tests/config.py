@@ -2,6 +2,8 @@ from django.test import TestCase
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
 from rest_framework.authtoken.models import Token
+from users.cache_usuarios import reiniciar_cache as reiniciar_cache_detalle
+from users.ratelimit import reiniciar_limites
 
 
 Usuario = get_user_model()
@@ -12,6 +14,8 @@ class UsuarioAPITestCase(TestCase):
     def setUp(self):
         """Configuración inicial: cliente API y usuarios base."""
         self.client = APIClient()
+        reiniciar_limites()
+        reiniciar_cache_detalle()
 
         self.superuser = Usuario.objects.create_superuser(
             nombre_usuario="admin",
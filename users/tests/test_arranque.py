@@ -0,0 +1,69 @@
+import json
+import tempfile
+import time
+from io import StringIO
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from django.core.management import call_command
+from django.test import override_settings
+from feature_flags.ld_client import cliente_listo, iniciar_en_segundo_plano, reiniciar_cliente
+from users.tests.config import UsuarioAPITestCase
+
+
+class ArranqueTestCase(UsuarioAPITestCase):
+    def setUp(self):
+        super().setUp()
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        self.archivo = Path(directorio.name) / "flags.json"
+        self.archivo.write_text(json.dumps({"flagValues": {"enable-login": True}}))
+        reiniciar_cliente()
+        self.addCleanup(reiniciar_cliente)
+
+    def _esperar_listo(self, segundos=5):
+        limite = time.monotonic() + segundos
+        while not cliente_listo() and time.monotonic() < limite:
+            time.sleep(0.02)
+        return cliente_listo()
+
+    @override_settings(FEATURE_FLAGS_ENABLED=False)
+    def test_sin_flags_listo_de_inmediato(self):
+        """✅ Sin FEATURE_FLAGS_ENABLED /api/ready/ responde 200 sin crear el cliente"""
+        with patch("feature_flags.ld_client.obtener_cliente") as obtener:
+            iniciar_en_segundo_plano()
+            response = self.client.get("/api/ready/")
+        self.assertEqual(response.status_code, 200)
+        obtener.assert_not_called()
+
+    def test_listo_cuando_el_cliente_conecta(self):
+        """✅ /api/ready/ responde 503 hasta que el cliente se inicializa en segundo plano"""
+        with override_settings(FEATURE_FLAGS_ENABLED=True, LAUNCHDARKLY_FLAGS_FILE=str(self.archivo)):
+            response = self.client.get("/api/ready/")
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response["Retry-After"], "1")
+
+            iniciar_en_segundo_plano()
+            self.assertTrue(self._esperar_listo())
+            self.assertEqual(self.client.get("/api/ready/").status_code, 200)
+
+    def test_plazo_vencido_no_bloquea_el_pod(self):
+        """❌ Si LaunchDarkly no conecta, el pod queda listo al vencer start_wait"""
+        cliente = MagicMock()
+        cliente.is_initialized.return_value = False
+        ajustes = override_settings(FEATURE_FLAGS_ENABLED=True, LAUNCHDARKLY_CONFIG={"start_wait": 0.2})
+        with ajustes, patch("feature_flags.ld_client.obtener_cliente", return_value=cliente):
+            inicio = time.monotonic()
+            with self.assertLogs("feature_flags.ld_client", "WARNING"):
+                iniciar_en_segundo_plano()
+                self.assertFalse(cliente_listo())
+                self.assertTrue(self._esperar_listo())
+            self.assertLess(time.monotonic() - inicio, 2)
+
+    def test_medir_arranque(self):
+        """✅ medir_arranque reporta las fases y que el SDK no se carga al arrancar"""
+        salida = StringIO()
+        call_command("medir_arranque", muestras=1, top=3, stdout=salida)
+        texto = salida.getvalue()
+        self.assertIn("django.setup()", texto)
+        self.assertIn("Diferidos correctamente", texto)
@@ -0,0 +1,60 @@
+import asyncio
+import inspect
+
+from django.test import AsyncClient, override_settings
+from rest_framework.authtoken.models import Token
+from users.tests.config import UsuarioAPITestCase
+from users.views import (
+    ConsultaMasivaUsuariosView, HealthView, IntrospeccionTokensView, ReadyView, UsuarioAllView, UsuarioDetailView
+)
+
+
+class VistasAsyncTestCase(UsuarioAPITestCase):
+    """Lectura por ASGI (AsyncClient) con las vistas async."""
+
+    def setUp(self):
+        super().setUp()
+        self.token = Token.objects.get(user=self.superuser).key
+        self.async_client = AsyncClient(headers={"authorization": f"Token {self.token}"})
+
+    def test_vistas_de_lectura_son_async(self):
+        """✅ Detalle, listado, consulta masiva, introspección, health y ready tienen handlers async"""
+        for vista, metodo in ((UsuarioDetailView, "get"), (UsuarioAllView, "get"), (ConsultaMasivaUsuariosView, "post"),
+                              (IntrospeccionTokensView, "post"), (HealthView, "get"), (ReadyView, "get")):
+            self.assertTrue(inspect.iscoroutinefunction(getattr(vista, metodo)), vista.__name__)
+            self.assertTrue(vista.view_is_async, vista.__name__)
+
+    async def test_detalle_y_listado_por_asgi(self):
+        """✅ Detalle, listado (offset y cursor) y conteo estimado responden por ASGI"""
+        detalle = await self.async_client.get("/api/users/profe/")
+        self.assertEqual(detalle.status_code, 200)
+        self.assertEqual(detalle.json()["data"]["email_usuario"], "profe@udla.edu.ec")
+        self.assertIn("ETag", detalle.headers)
+
+        listado = await self.async_client.get("/api/users/", {"offset": 1})
+        self.assertEqual((listado.json()["count"], len(listado.json()["results"])), (2, 1))
+
+        siguiente = await self.async_client.get("/api/users/", {"offset": 1, "cursor": "", "include_total": "estimate"})
+        self.assertEqual(siguiente.status_code, 200)
+        self.assertIsNotNone(siguiente.json()["cursor"]["next"])
+
+    async def test_no_encontrado(self):
+        """❌ Un usuario inexistente responde 404 desde la vista async"""
+        response = await self.async_client.get("/api/users/noexiste/")
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(INTROSPECCION_CLAVE="clave")
+    async def test_peticiones_concurrentes(self):
+        """✅ Varias lecturas en vuelo a la vez en el mismo event loop"""
+        respuestas = await asyncio.gather(
+            self.async_client.get("/api/users/profe/"),
+            self.async_client.get("/api/users/admin/"),
+            self.async_client.get("/api/users/"),
+            self.async_client.post("/api/users/batch/", {"nombres_usuario": ["profe", "nadie"]},
+                                   content_type="application/json"),
+            self.async_client.post("/api/introspect/", {"tokens": [self.token]}, content_type="application/json",
+                                   headers={"x-authservice-clave": "clave"}),
+        )
+        self.assertEqual([r.status_code for r in respuestas], [200] * 5)
+        self.assertIsNone(respuestas[3].json()["data"]["nombres_usuario"]["nadie"])
+        self.assertTrue(respuestas[4].json()["data"][0]["active"])
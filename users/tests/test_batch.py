@@ -0,0 +1,36 @@
+from django.test import override_settings
+from users.tests.config import UsuarioAPITestCase
+
+
+class ConsultaMasivaTestCase(UsuarioAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.auth_as_superuser()
+
+    def test_resuelve_por_id_y_nombre_en_una_consulta(self):
+        """✅ Ids y nombres se resuelven con una sola consulta IN"""
+        payload = {"ids": [self.profesor.id, 999999], "nombres_usuario": ["admin", "noexiste"]}
+        with self.assertNumQueries(1):
+            response = self.client.post("/api/users/batch/", payload, format="json")
+        self.assertEqual(response.status_code, 200)
+        data = response.data["data"]
+        self.assertEqual(data["ids"][str(self.profesor.id)]["nombre_usuario"], "profe")
+        self.assertIsNone(data["ids"]["999999"])
+        self.assertEqual(data["nombres_usuario"]["admin"]["id"], self.superuser.id)
+        self.assertIsNone(data["nombres_usuario"]["noexiste"])
+
+    def test_campos_dispersos(self):
+        """✅ ?fields= limita las columnas retornadas"""
+        response = self.client.post("/api/users/batch/?fields=rol", {"nombres_usuario": ["profe"]}, format="json")
+        self.assertEqual(response.data["data"]["nombres_usuario"]["profe"], {"rol": "profesor"})
+
+    def test_sin_identificadores(self):
+        """❌ Una petición vacía es rechazada"""
+        response = self.client.post("/api/users/batch/", {}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(BATCH_MAX_USUARIOS=2)
+    def test_limite_de_identificadores(self):
+        """❌ Más identificadores que BATCH_MAX_USUARIOS es rechazado"""
+        response = self.client.post("/api/users/batch/", {"ids": [1, 2], "nombres_usuario": ["a"]}, format="json")
+        self.assertEqual(response.status_code, 400)
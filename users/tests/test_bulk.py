@@ -0,0 +1,116 @@
+import json
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.test import override_settings
+from users.hashers import obtener_pool, obtener_pool_importacion, reiniciar_pool
+from users.tests.config import UsuarioAPITestCase, Usuario
+
+
+@override_settings(PASSWORD_HASH_ITERATIONS=1000)
+class RegistroMasivoTestCase(UsuarioAPITestCase):
+    def _usuarios(self, n, inicio=0):
+        nombres = ["Ana", "Beto", "Carla", "Dario", "Elena", "Fabian"]
+        return [
+            {
+                "nombre_usuario": nombres[i],
+                "email_usuario": f"{nombres[i].lower()}@udla.edu.ec",
+                "contrasenia_usuario": "test1234",
+            }
+            for i in range(inicio, inicio + n)
+        ]
+
+    def _reporte(self, response):
+        return json.loads(response.content.decode('utf-8'))['data']
+
+    def test_importar_json(self):
+        """✅ Importa una lista JSON con una consulta de unicidad y un INSERT"""
+        self.auth_as_superuser()
+        # Unicidad del lote + INSERT y cambios del outbox (con su savepoint)
+        with self.assertNumQueries(6):
+            response = self.client.post("/api/register/bulk/", self._usuarios(4), format="json")
+        self.assertEqual(response.status_code, 201)
+        reporte = self._reporte(response)
+        self.assertEqual(reporte["creados"], 4)
+        self.assertTrue(all(fila["id"] for fila in reporte["filas"]))
+        self.assertTrue(Usuario.objects.get(nombre_usuario="Ana").check_password("test1234"))
+
+    def test_reporte_por_fila(self):
+        """✅ Reporta errores de validación, duplicados y usuarios existentes por fila"""
+        self.auth_as_superuser()
+        filas = self._usuarios(2) + [
+            {"nombre_usuario": "Ana", "email_usuario": "otra@udla.edu.ec", "contrasenia_usuario": "x"},
+            {"nombre_usuario": "profe", "email_usuario": "nuevo@udla.edu.ec", "contrasenia_usuario": "x"},
+            {"nombre_usuario": "User 1", "email_usuario": "u1@udla.edu.ec", "contrasenia_usuario": "x"},
+            {"nombre_usuario": "Gmail", "email_usuario": "g@gmail.com", "contrasenia_usuario": "x"},
+        ]
+        response = self.client.post("/api/register/bulk/", {"usuarios": filas}, format="json")
+        reporte = self._reporte(response)
+        self.assertEqual(reporte["creados"], 2)
+        estados = [(fila["fila"], fila["estado"]) for fila in reporte["filas"]]
+        self.assertEqual(estados, [(1, "creado"), (2, "creado"), (3, "error"), (4, "error"), (5, "error"), (6, "error")])
+        self.assertIn("repetido", reporte["filas"][2]["error"])
+        self.assertIn("en uso", reporte["filas"][3]["error"])
+
+    def test_importar_csv(self):
+        """✅ Importa CSV leyendo el cuerpo como stream"""
+        self.auth_as_superuser()
+        csv = "nombre_usuario,email_usuario,contrasenia_usuario,rol\nAna,ana@udla.edu.ec,test1234,profesor\nBeto,beto@udla.edu.ec,test1234,superuser\n"
+        response = self.client.post("/api/register/bulk/", csv, content_type="text/csv")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Usuario.objects.get(nombre_usuario="Beto").rol, "superuser")
+
+    def test_importar_ndjson(self):
+        """✅ Importa NDJSON"""
+        self.auth_as_superuser()
+        cuerpo = "\n".join(json.dumps(u) for u in self._usuarios(3))
+        response = self.client.post("/api/register/bulk/", cuerpo, content_type="application/x-ndjson")
+        self.assertEqual(self._reporte(response)["creados"], 3)
+
+    def test_ndjson_invalido(self):
+        """❌ Una línea con JSON inválido rechaza la petición"""
+        self.auth_as_superuser()
+        response = self.client.post("/api/register/bulk/", '{"a": 1}\n{malo', content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(BULK_IMPORT_MAX_FILAS=2)
+    def test_limite_de_filas(self):
+        """❌ No se aceptan más filas que BULK_IMPORT_MAX_FILAS"""
+        self.auth_as_superuser()
+        response = self.client.post("/api/register/bulk/", self._usuarios(3), format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_formato_json_con_otro_content_type(self):
+        """❌ ?formato=json con un cuerpo que no es JSON responde 415, no 500"""
+        self.auth_as_superuser()
+        response = self.client.post(
+            "/api/register/bulk/?formato=json",
+            "nombre_usuario\nAna\n",
+            content_type="text/csv"
+        )
+        self.assertEqual(response.status_code, 415)
+        self.assertEqual(Usuario.objects.filter(nombre_usuario="Ana").count(), 0)
+
+    @override_settings(
+        BULK_IMPORT_HASHING_WORKERS=3,
+        PASSWORD_HASHING_POOL={'WORKERS': 1, 'QUEUE': 0, 'RETRY_AFTER': 1}
+    )
+    def test_pool_de_importacion(self):
+        """✅ La importación usa su propio pool, dimensionado por BULK_IMPORT_HASHING_WORKERS"""
+        reiniciar_pool()
+        self.addCleanup(reiniciar_pool)
+        self.auth_as_superuser()
+        response = self.client.post("/api/register/bulk/", self._usuarios(3), format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(obtener_pool_importacion().workers, 3)
+        self.assertIsNot(obtener_pool_importacion(), obtener_pool())
+
+    def test_comando_importar_usuarios(self):
+        """✅ El comando importa un archivo por lotes"""
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson") as archivo:
+            archivo.write("\n".join(json.dumps(u) for u in self._usuarios(5)))
+            archivo.flush()
+            salida = StringIO()
+            call_command("importar_usuarios", archivo.name, "--lote", "2", "--workers", "2", stdout=salida)
+        self.assertIn("5 de 5 usuarios creados", salida.getvalue())
+        self.assertEqual(Usuario.objects.filter(nombre_usuario__in=["Ana", "Elena"]).count(), 2)
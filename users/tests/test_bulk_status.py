@@ -0,0 +1,75 @@
+from django.test import override_settings
+from rest_framework.authtoken.models import Token
+from users.models import Usuario
+from users.tests.config import UsuarioAPITestCase
+
+
+class CambioEstadoMasivoTestCase(UsuarioAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.auth_as_superuser()
+        self.otros = Usuario.objects.bulk_create([
+            Usuario(nombre_usuario=f"cohorte{i}", email_usuario=f"cohorte{i}@udla.edu.ec", password="!")
+            for i in range(3)
+        ])
+        for usuario in [self.profesor, *self.otros]:
+            Token.objects.create(user=usuario)
+
+    def test_desactiva_con_un_update_y_revoca_tokens(self):
+        """✅ Desactivar una cohorte es un SELECT, un UPDATE, un DELETE de tokens y un INSERT al outbox"""
+        payload = {"ids": [u.id for u in self.otros], "nombres_usuario": ["profe"], "is_active": False}
+        # SAVEPOINT + SELECT FOR UPDATE + UPDATE + DELETE + lock e INSERT del outbox + RELEASE.
+        with self.assertNumQueries(7):
+            response = self.client.post("/api/users/bulk-status/", payload, format="json")
+        self.assertEqual(response.status_code, 200)
+        data = response.data["data"]
+        self.assertEqual(sorted(data["actualizados"]), ["cohorte0", "cohorte1", "cohorte2", "profe"])
+        self.assertEqual(data["tokens_revocados"], 4)
+        self.assertFalse(Usuario.objects.filter(nombre_usuario__startswith="cohorte", is_active=True).exists())
+        self.assertFalse(Token.objects.filter(user__in=[self.profesor, *self.otros]).exists())
+
+    def test_reporta_sin_cambios_y_no_encontrados(self):
+        """✅ Los usuarios ya en el estado pedido y los inexistentes se reportan aparte"""
+        Usuario.objects.filter(pk=self.otros[0].pk).update(is_active=False)
+        payload = {"ids": [self.otros[0].id, 999999], "nombres_usuario": ["cohorte1", "noexiste"], "is_active": False}
+        data = self.client.post("/api/users/bulk-status/", payload, format="json").data["data"]
+        self.assertEqual(data["actualizados"], ["cohorte1"])
+        self.assertEqual(data["sin_cambios"], ["cohorte0"])
+        self.assertEqual(data["no_encontrados"], {"ids": [999999], "nombres_usuario": ["noexiste"]})
+
+    def test_activar_no_revoca_tokens(self):
+        """✅ Activar cambia is_active sin tocar los tokens"""
+        Usuario.objects.filter(pk=self.otros[0].pk).update(is_active=False)
+        payload = {"nombres_usuario": ["cohorte0", "cohorte1"], "is_active": True}
+        data = self.client.post("/api/users/bulk-status/", payload, format="json").data["data"]
+        self.assertEqual(data["actualizados"], ["cohorte0"])
+        self.assertEqual(data["sin_cambios"], ["cohorte1"])
+        self.assertEqual(data["tokens_revocados"], 0)
+        self.assertTrue(Token.objects.filter(user=self.otros[0]).exists())
+
+    def test_token_revocado_deja_de_autenticar(self):
+        """❌ El token de un usuario desactivado en bloque ya no autentica"""
+        token = Token.objects.get(user=self.profesor).key
+        self.client.force_authenticate(user=None)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+        self.assertEqual(self.client.get("/api/users/").status_code, 200)
+
+        self.client.credentials()
+        self.auth_as_superuser()
+        self.client.post("/api/users/bulk-status/", {"ids": [self.profesor.id], "is_active": False}, format="json")
+
+        self.client.force_authenticate(user=None)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+        self.assertEqual(self.client.get("/api/users/").status_code, 401)
+
+    def test_sin_is_active(self):
+        """❌ is_active es obligatorio"""
+        response = self.client.post("/api/users/bulk-status/", {"ids": [self.profesor.id]}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(BATCH_MAX_USUARIOS=2)
+    def test_limite_de_identificadores(self):
+        """❌ Más identificadores que BATCH_MAX_USUARIOS es rechazado"""
+        payload = {"ids": [1, 2, 3], "is_active": False}
+        response = self.client.post("/api/users/bulk-status/", payload, format="json")
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,54 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import override_settings
+from users.tests.config import UsuarioAPITestCase, Usuario
+
+
+class RehashLoginTestCase(UsuarioAPITestCase):
+    def _iteraciones(self, nombre_usuario):
+        return int(Usuario.objects.get(nombre_usuario=nombre_usuario).password.split('$')[1])
+
+    def test_login_rehashea_al_costo_configurado(self):
+        """✅ El login recalcula el hash con las iteraciones configuradas"""
+        with override_settings(PASSWORD_HASH_ITERATIONS=20_000):
+            Usuario.objects.create_user(
+                nombre_usuario="rehash",
+                email_usuario="rehash@udla.edu.ec",
+                contrasenia_usuario="abc12345"
+            ) # type: ignore
+        self.assertEqual(self._iteraciones("rehash"), 20_000)
+
+        with override_settings(PASSWORD_HASH_ITERATIONS=30_000):
+            response = self.client.post("/api/login/", {
+                "nombre_usuario": "rehash",
+                "contrasenia_usuario": "abc12345"
+            }, format="json")
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._iteraciones("rehash"), 30_000)
+
+    def test_login_fallido_no_rehashea(self):
+        """❌ Un login fallido no modifica el hash almacenado"""
+        with override_settings(PASSWORD_HASH_ITERATIONS=20_000):
+            Usuario.objects.create_user(
+                nombre_usuario="norehash",
+                email_usuario="norehash@udla.edu.ec",
+                contrasenia_usuario="abc12345"
+            ) # type: ignore
+        with override_settings(PASSWORD_HASH_ITERATIONS=30_000):
+            self.client.post("/api/login/", {
+                "nombre_usuario": "norehash",
+                "contrasenia_usuario": "incorrecta"
+            }, format="json")
+        self.assertEqual(self._iteraciones("norehash"), 20_000)
+
+    def test_comando_calibrar_hasher(self):
+        """✅ El comando mide los hashers y recomienda iteraciones"""
+        salida = StringIO()
+        call_command(
+            "calibrar_hasher", "--objetivo-ms", "5", "--muestras", "1",
+            "--iteraciones", "1000", "2000", "--sin-scrypt", stdout=salida
+        )
+        texto = salida.getvalue()
+        self.assertIn("pbkdf2_sha256", texto)
+        self.assertIn("Recomendado: PASSWORD_HASH_ITERATIONS=", texto)
+        self.assertIn("Contraseñas pendientes de rehash:", texto)
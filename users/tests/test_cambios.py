@@ -0,0 +1,91 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from users.models import CambioUsuario
+from users.tests.config import UsuarioAPITestCase
+
+
+@override_settings(PASSWORD_HASH_ITERATIONS=1000)
+class CambiosUsuariosTestCase(UsuarioAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.auth_as_superuser()
+
+    def _cambios(self, **params):
+        response = self.client.get("/api/users/changes/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.data["data"]
+
+    def test_escrituras_agregan_cambios_en_orden(self):
+        """✅ Alta, actualización y baja agregan un cambio cada una con la fila resultante"""
+        inicio = CambioUsuario.objects.order_by("-seq").values_list("seq", flat=True).first() or 0
+        self.client.post("/api/register/", {
+            "nombre_usuario": "nuevo", "email_usuario": "nuevo@udla.edu.ec", "contrasenia_usuario": "abc123"
+        }, format="json")
+        self.client.patch("/api/users/nuevo/update/", {"rol": "superuser"}, format="json")
+        self.client.delete("/api/users/nuevo/delete/")
+
+        data = self._cambios(since=inicio)
+        self.assertEqual([c["operacion"] for c in data["cambios"]], ["create", "update", "deactivate"])
+        ultimo = data["cambios"][-1]["datos"]
+        self.assertEqual((ultimo["rol"], ultimo["is_active"], ultimo["version"]), ("superuser", False, 3))
+        self.assertEqual(data["siguiente"], data["cambios"][-1]["seq"])
+        self.assertFalse(data["hay_mas"])
+        self.assertEqual(self._cambios(since=data["siguiente"])["cambios"], [])
+
+    def test_sin_escritura_no_hay_cambio(self):
+        """✅ Un PATCH sin cambios o uno rechazado no agrega filas al outbox"""
+        antes = CambioUsuario.objects.count()
+        self.client.patch("/api/users/profe/update/", {"rol": "profesor"}, format="json")
+        self.client.patch("/api/users/profe/update/", {"email_usuario": "admin@udla.edu.ec"}, format="json")
+        self.client.post("/api/register/", {
+            "nombre_usuario": "profe", "email_usuario": "x@udla.edu.ec", "contrasenia_usuario": "abc123"
+        }, format="json")
+        self.assertEqual(CambioUsuario.objects.count(), antes)
+
+    def test_cambio_masivo_de_estado(self):
+        """✅ bulk-status agrega un cambio por usuario modificado"""
+        antes = CambioUsuario.objects.count()
+        self.client.post("/api/users/bulk-status/", {
+            "nombres_usuario": ["profe", "admin"], "is_active": False
+        }, format="json")
+        self.client.post("/api/users/bulk-status/", {"nombres_usuario": ["profe"], "is_active": True}, format="json")
+        nuevos = CambioUsuario.objects.order_by("seq")[antes:]
+        self.assertEqual([(c.operacion, c.datos["nombre_usuario"]) for c in nuevos],
+                         [("deactivate", "admin"), ("deactivate", "profe"), ("activate", "profe")])
+
+    def test_limite_y_cursor_reanudable(self):
+        """✅ Con limit el feed se lee por tramos sin repetir ni saltar cambios"""
+        for rol in ("superuser", "profesor", "superuser"):
+            self.client.patch("/api/users/profe/update/", {"rol": rol}, format="json")
+        vistos, since = [], 0
+        while True:
+            data = self._cambios(since=since, limit=1)
+            vistos += [c["seq"] for c in data["cambios"]]
+            since = data["siguiente"]
+            if not data["hay_mas"]:
+                break
+        self.assertEqual(vistos, list(CambioUsuario.objects.order_by("seq").values_list("seq", flat=True)))
+
+    def test_parametros_invalidos(self):
+        """❌ since o limit no numéricos o negativos son rechazados"""
+        for params in ({"since": "abc"}, {"since": -1}, {"limit": 0}):
+            self.assertEqual(self.client.get("/api/users/changes/", params).status_code, 400)
+
+    def test_compactacion(self):
+        """✅ compactar_cambios elimina los cambios antiguos ya superados y conserva el último de cada usuario"""
+        for rol in ("superuser", "profesor"):
+            self.client.patch("/api/users/profe/update/", {"rol": rol}, format="json")
+        self.client.patch("/api/users/admin/update/", {"email_usuario": "root@udla.edu.ec"}, format="json")
+        CambioUsuario.objects.update(creado=timezone.now() - timedelta(days=30))
+        self.client.patch("/api/users/profe/update/", {"rol": "superuser"}, format="json")
+
+        call_command("compactar_cambios", dias=7, lote=1, pausa=0, stdout=StringIO())
+
+        self.assertEqual(
+            [(c.usuario_id, c.datos["rol"]) for c in CambioUsuario.objects.order_by("seq")],
+            [(self.superuser.id, "superuser"), (self.profesor.id, "superuser")]
+        )
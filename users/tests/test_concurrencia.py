@@ -0,0 +1,68 @@
+from unittest.mock import patch
+
+from django.db.models import F
+from django.test import override_settings
+from users.models import Usuario
+from users.tests.config import UsuarioAPITestCase
+from users.views import UsuarioUpdateView
+
+
+@override_settings(PASSWORD_HASH_ITERATIONS=1000)
+class ConcurrenciaOptimistaTestCase(UsuarioAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.auth_as_superuser()
+
+    def _etag(self):
+        return self.client.get("/api/users/profe/")["ETag"]
+
+    def test_if_match_vigente_actualiza(self):
+        """✅ Con el ETag vigente el PATCH aplica y retorna el ETag de la nueva versión"""
+        etag = self._etag()
+        response = self.client.patch("/api/users/profe/update/", {"rol": "superuser"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response["ETag"], self._etag())
+        self.assertEqual(Usuario.objects.get(nombre_usuario="profe").version, 2)
+
+    def test_if_match_obsoleto_es_412(self):
+        """❌ Un segundo PATCH con el mismo ETag no sobrescribe el primero"""
+        etag = self._etag()
+        self.client.patch("/api/users/profe/update/", {"rol": "superuser"}, format="json", HTTP_IF_MATCH=etag)
+        with self.assertNumQueries(1):
+            response = self.client.patch(
+                "/api/users/profe/update/", {"email_usuario": "otro@udla.edu.ec"}, format="json", HTTP_IF_MATCH=etag
+            )
+        self.assertEqual(response.status_code, 412)
+        usuario = Usuario.objects.get(nombre_usuario="profe")
+        self.assertEqual((usuario.rol, usuario.email_usuario), ("superuser", "profe@udla.edu.ec"))
+
+    def test_escritura_concurrente_entre_lectura_y_update(self):
+        """❌ Si la fila cambia tras leerla, el UPDATE condicional no afecta filas y responde 412"""
+        leido = Usuario.objects.get(nombre_usuario="profe")
+        Usuario.objects.filter(pk=leido.pk).update(rol="superuser", version=F("version") + 1)
+        with patch.object(UsuarioUpdateView, "get_object", return_value=leido):
+            response = self.client.patch("/api/users/profe/update/", {"email_usuario": "otro@udla.edu.ec"}, format="json")
+        self.assertEqual(response.status_code, 412)
+        usuario = Usuario.objects.get(nombre_usuario="profe")
+        self.assertEqual((usuario.rol, usuario.email_usuario), ("superuser", "profe@udla.edu.ec"))
+
+    def test_sin_if_match_incrementa_version(self):
+        """✅ Sin If-Match el PATCH sigue funcionando e incrementa la versión"""
+        response = self.client.patch("/api/users/profe/update/", {"rol": "superuser"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Usuario.objects.get(nombre_usuario="profe").version, 2)
+
+    def test_if_match_asterisco_o_invalido(self):
+        """✅ If-Match: * no condiciona; ❌ un ETag débil o ajeno es 412"""
+        response = self.client.patch("/api/users/profe/update/", {"rol": "superuser"}, format="json", HTTP_IF_MATCH="*")
+        self.assertEqual(response.status_code, 200)
+        for valor in ('W/"2-abc"', '"abc"'):
+            response = self.client.patch("/api/users/profe/update/", {"rol": "profesor"}, format="json", HTTP_IF_MATCH=valor)
+            self.assertEqual(response.status_code, 412)
+
+    def test_baja_invalida_etag(self):
+        """✅ Desactivar incrementa la versión y cambia el ETag del detalle"""
+        etag = self._etag()
+        self.client.delete("/api/users/profe/delete/")
+        self.assertNotEqual(self._etag(), etag)
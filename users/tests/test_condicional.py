@@ -0,0 +1,81 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from users.tests.config import UsuarioAPITestCase
+
+
+class LecturaCondicionalTestCase(UsuarioAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.auth_as_superuser()
+
+    def test_detalle_304_con_if_none_match(self):
+        """✅ El detalle responde 304 si el ETag coincide, sin serializar"""
+        response = self.client.get("/api/users/profe/")
+        etag = response["ETag"]
+        self.assertIn("Last-Modified", response)
+        # La fila sale de la caché de detalle: ni siquiera hay consulta.
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/users/profe/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_detalle_304_con_if_modified_since(self):
+        """✅ If-Modified-Since con la fecha vigente responde 304"""
+        response = self.client.get("/api/users/profe/")
+        response = self.client.get("/api/users/profe/", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_detalle_cambia_tras_actualizar(self):
+        """✅ Actualizar el usuario cambia el ETag"""
+        etag = self.client.get("/api/users/profe/")["ETag"]
+        self.client.patch("/api/users/profe/update/", {"rol": "superuser"}, format="json")
+        response = self.client.get("/api/users/profe/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_etag_depende_de_los_campos(self):
+        """✅ Representaciones con distinto ?fields= tienen distinto ETag"""
+        completo = self.client.get("/api/users/profe/")["ETag"]
+        parcial = self.client.get("/api/users/profe/?fields=id")["ETag"]
+        self.assertNotEqual(completo, parcial)
+
+    def test_listado_304(self):
+        """✅ El listado responde 304 mientras no cambie ningún usuario del filtro"""
+        etag = self.client.get("/api/users/?page=1&offset=10")["ETag"]
+        response = self.client.get("/api/users/?page=1&offset=10", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_listado_cambia_tras_desactivar(self):
+        """✅ Desactivar un usuario invalida el ETag del listado"""
+        etag = self.client.get("/api/users/?cursor=")["ETag"]
+        self.client.delete("/api/users/profe/delete/")
+        response = self.client.get("/api/users/?cursor=", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_listado_filtrado_cambia_si_sale_una_fila(self):
+        """✅ Con filtro y sin total, desactivar un usuario que no es el último modificado cambia el ETag"""
+        self.client.patch("/api/users/admin/update/", {"email_usuario": "root@udla.edu.ec"}, format="json")
+        url = "/api/users/?is_active=true&include_total=false"
+        etag = self.client.get(url)["ETag"]
+        self.client.delete("/api/users/profe/delete/")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([u["nombre_usuario"] for u in response.data["results"]], ["admin"])
+
+    def test_listado_cambia_si_cambia_otra_pagina(self):
+        """✅ Un cambio fuera de la página (que mueve el total) también cambia el ETag"""
+        url = "/api/users/?page=1&offset=1"
+        etag = self.client.get(url)["ETag"]
+        self.client.delete("/api/users/profe/delete/")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 2)
+
+    def test_listado_304_sin_contar(self):
+        """✅ Con include_total=true el 304 se decide sin ejecutar el COUNT"""
+        etag = self.client.get("/api/users/?include_total=true")["ETag"]
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get("/api/users/?include_total=true", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse([q["sql"] for q in consultas if "COUNT(" in q["sql"]])
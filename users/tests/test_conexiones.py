@@ -0,0 +1,20 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from users.tests.config import UsuarioAPITestCase
+
+
+class ConexionesTestCase(UsuarioAPITestCase):
+    def test_medir_conexiones_en_todos_los_modos(self):
+        """✅ medir_conexiones atiende el listado sin persistencia, con conexiones persistentes y con el pool"""
+        salida = StringIO()
+        call_command("medir_conexiones", peticiones=5, calentamiento=1, stdout=salida)
+        filas = salida.getvalue().splitlines()[1:]
+        self.assertEqual([fila.split()[0] for fila in filas], ["sin-persistencia", "persistentes", "pool"])
+
+    def test_ruta_con_error(self):
+        """❌ Una ruta que no responde 200 hace fallar el modo"""
+        with self.assertRaises(CommandError):
+            call_command("medir_conexiones", peticiones=1, calentamiento=0, ruta="/api/users/noexiste/",
+                         modos=["pool"], stdout=StringIO())
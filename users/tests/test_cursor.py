@@ -0,0 +1,71 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from users.tests.config import UsuarioAPITestCase, Usuario
+
+
+class CursorPaginationTestCase(UsuarioAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.auth_as_superuser()
+        nombres = ["Ana", "Beto", "Carla", "Dario", "Elena"]
+        Usuario.objects.bulk_create([
+            Usuario(nombre_usuario=nombre, email_usuario=f"{nombre.lower()}@udla.edu.ec", password="!")
+            for nombre in nombres
+        ])
+        self.ids = list(Usuario.objects.order_by("id").values_list("id", flat=True))
+
+    def _pagina(self, query):
+        response = self.client.get(f"/api/users/?{query}")
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_recorre_todas_las_paginas(self):
+        """✅ Los cursores 'next' recorren todos los usuarios en orden y sin repetir"""
+        vistos, cursor = [], ""
+        while cursor is not None:
+            data = self._pagina(f"offset=3&cursor={cursor}")
+            vistos.extend(u["id"] for u in data["results"])
+            cursor = data["cursor"]["next"]
+        self.assertEqual(vistos, self.ids)
+
+    def test_cursor_anterior(self):
+        """✅ El cursor 'prev' devuelve la página anterior"""
+        primera = self._pagina("offset=3&cursor=")
+        self.assertIsNone(primera["cursor"]["prev"])
+        segunda = self._pagina(f"offset=3&cursor={primera['cursor']['next']}")
+        vuelta = self._pagina(f"offset=3&cursor={segunda['cursor']['prev']}")
+        self.assertEqual(vuelta["results"], primera["results"])
+
+    def test_sin_total(self):
+        """✅ Con include_total=false no se cuenta ni se agrega sobre el conjunto filtrado"""
+        with CaptureQueriesContext(connection) as consultas:
+            data = self._pagina("offset=3&cursor=&include_total=false")
+        self.assertFalse([q["sql"] for q in consultas if "COUNT(" in q["sql"]])
+        # El único agregado es el último seq del outbox (validador).
+        for sql in (q["sql"] for q in consultas if "MAX(" in q["sql"]):
+            self.assertIn('"usuarios_cambios"', sql)
+        self.assertIsNone(data["count"])
+        self.assertEqual(len(data["results"]), 3)
+
+    def test_total_estimado(self):
+        """✅ include_total=estimate retorna un número sin contar filas"""
+        data = self._pagina("offset=3&cursor=&include_total=estimate")
+        self.assertIsInstance(data["count"], int)
+
+    def test_modo_pagina_sin_cambios(self):
+        """✅ El modo page/offset mantiene su formato"""
+        data = self._pagina("page=2&offset=3")
+        self.assertEqual(data["count"], len(self.ids))
+        self.assertEqual(data["pages"], 3)
+        self.assertNotIn("cursor", data)
+        self.assertEqual([u["id"] for u in data["results"]], self.ids[3:6])
+
+    def test_cursor_invalido(self):
+        """❌ Un cursor manipulado es rechazado"""
+        response = self.client.get("/api/users/?cursor=no-es-un-cursor")
+        self.assertEqual(response.status_code, 400)
+
+    def test_include_total_invalido(self):
+        """❌ include_total solo admite true, false o estimate"""
+        response = self.client.get("/api/users/?include_total=quizas")
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,127 @@
+import asyncio
+import csv
+import io
+import json
+import warnings
+from unittest import mock
+
+from django.core.handlers.asgi import ASGIHandler
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from users.ratelimit import reiniciar_limites
+from users.tests.config import UsuarioAPITestCase, Usuario
+
+
+class ExportacionTestCase(UsuarioAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.auth_as_superuser()
+        Usuario.objects.bulk_create([
+            Usuario(nombre_usuario=f"Usuario {letra}", email_usuario=f"{letra}@udla.edu.ec", password="!")
+            for letra in "abcde"
+        ])
+
+    def _contenido(self, response):
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content).decode("utf-8")
+
+    def test_exportar_ndjson(self):
+        """✅ Exporta todos los usuarios como NDJSON sin contraseñas"""
+        response = self.client.get("/api/users/export/")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        filas = [json.loads(linea) for linea in self._contenido(response).splitlines()]
+        self.assertEqual(len(filas), Usuario.objects.count())
+        self.assertEqual(set(filas[0]), {"id", "nombre_usuario", "email_usuario", "rol", "is_active"})
+        self.assertEqual([f["id"] for f in filas], sorted(f["id"] for f in filas))
+
+    def test_exportar_csv_por_accept(self):
+        """✅ Con Accept: text/csv exporta CSV con encabezado"""
+        response = self.client.get("/api/users/export/", HTTP_ACCEPT="text/csv")
+        filas = list(csv.DictReader(io.StringIO(self._contenido(response))))
+        self.assertEqual(len(filas), Usuario.objects.count())
+        self.assertIn("attachment", response["Content-Disposition"])
+
+    @override_settings(EXPORTACION_CHUNK_SIZE=2)
+    def test_fragmentos_por_bloque(self):
+        """✅ Cada fragmento de la respuesta corresponde a un bloque del cursor"""
+        response = self.client.get("/api/users/export/?formato=ndjson")
+        fragmentos = list(response.streaming_content)
+        self.assertEqual(len(fragmentos), 4)
+        self.assertEqual(sum(f.count(b"\n") for f in fragmentos), 7)
+
+    @override_settings(EXPORTACION_CHUNK_SIZE=2)
+    def test_sin_cursores_del_servidor(self):
+        """✅ Sin cursores del lado del servidor (PgBouncer) pagina por id, una consulta por bloque"""
+        with mock.patch.dict(connection.settings_dict, {"DISABLE_SERVER_SIDE_CURSORS": True}):
+            with CaptureQueriesContext(connection) as consultas:
+                response = self.client.get("/api/users/export/?formato=ndjson")
+                fragmentos = list(response.streaming_content)
+        bloques = [c["sql"] for c in consultas if "LIMIT 2" in c["sql"]]
+        self.assertEqual(len(bloques), 4)
+        self.assertTrue(all('"id" >' in sql for sql in bloques[1:]))
+        filas = [json.loads(linea) for linea in b"".join(fragmentos).splitlines()]
+        self.assertEqual([f["id"] for f in filas], list(Usuario.objects.order_by("id").values_list("id", flat=True)))
+        self.assertEqual(len(fragmentos), 4)
+
+    def test_exportar_con_filtros(self):
+        """✅ Respeta los filtros del listado"""
+        response = self.client.get("/api/users/export/?formato=csv&rol=superuser")
+        filas = list(csv.DictReader(io.StringIO(self._contenido(response))))
+        self.assertEqual([f["nombre_usuario"] for f in filas], ["admin"])
+
+    def test_formato_invalido(self):
+        """❌ Un formato no soportado responde 406"""
+        self.assertEqual(self.client.get("/api/users/export/?formato=xml").status_code, 406)
+
+    def test_filtro_invalido(self):
+        """❌ Un filtro inválido responde 400"""
+        self.assertEqual(self.client.get("/api/users/export/?rol=director").status_code, 400)
+
+
+@override_settings(EXPORTACION_CHUNK_SIZE=2)
+class ExportacionASGITestCase(TransactionTestCase):
+    """Exportación servida por el ASGIHandler real (como con uvicorn)."""
+
+    def setUp(self):
+        reiniciar_limites()
+        admin = Usuario.objects.create_superuser(
+            nombre_usuario="admin", email_usuario="admin@udla.edu.ec", contrasenia_usuario="admin123"
+        )
+        self.token = Token.objects.create(user=admin).key
+        Usuario.objects.bulk_create([
+            Usuario(nombre_usuario=f"Usuario {letra}", email_usuario=f"{letra}@udla.edu.ec", password="!")
+            for letra in "abcd"
+        ])
+
+    async def _exportar(self):
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+            "path": "/api/users/export/", "raw_path": b"/api/users/export/", "query_string": b"formato=ndjson",
+            "headers": [(b"host", b"testserver"), (b"authorization", f"Token {self.token}".encode())],
+            "client": ("127.0.0.1", 1234), "server": ("testserver", 80),
+        }
+        entrada = asyncio.Queue()
+        await entrada.put({"type": "http.request", "body": b"", "more_body": False})
+        mensajes = []
+
+        async def send(mensaje):
+            mensajes.append(mensaje)
+
+        await ASGIHandler()(scope, entrada.get, send)
+        return mensajes
+
+    async def test_exportar_por_asgi_en_streaming(self):
+        """✅ Bajo ASGI la exportación se envía bloque a bloque sin consumir el iterador completo"""
+        with warnings.catch_warnings(record=True) as avisos:
+            warnings.simplefilter("always")
+            mensajes = await self._exportar()
+        self.assertEqual([str(a.message) for a in avisos if "iterators" in str(a.message)], [])
+
+        self.assertEqual(mensajes[0]["status"], 200)
+        cuerpos = [m["body"] for m in mensajes[1:] if m.get("body")]
+        # Un mensaje por bloque del cursor: 5 usuarios en bloques de 2.
+        self.assertEqual([c.count(b"\n") for c in cuerpos], [2, 2, 1])
+        filas = [json.loads(linea) for linea in b"".join(cuerpos).splitlines()]
+        self.assertEqual([f["id"] for f in filas], sorted(f["id"] for f in filas))
@@ -0,0 +1,164 @@
+import json
+import logging
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.handlers.asgi import ASGIHandler
+from django.test import AsyncClient, override_settings
+from rest_framework.authtoken.models import Token
+from feature_flags.context_builder import user_context
+from feature_flags.ld_client import obtener_cliente, reiniciar_cliente
+from users.tests.config import Usuario, UsuarioAPITestCase
+
+FLAGS = {
+    "flagValues": {"enable-login": False},
+    "flags": {
+        # Listado solo para superusuarios: depende del atributo rol del contexto.
+        "enable-user-list": {
+            "key": "enable-user-list", "on": True, "version": 1, "salt": "x",
+            "variations": [True, False], "offVariation": 1, "fallthrough": {"variation": 1},
+            "rules": [{"id": "r1", "variation": 0, "clauses": [
+                {"contextKind": "user", "attribute": "rol", "op": "in", "values": ["superuser"], "negate": False}
+            ]}],
+        },
+    },
+}
+
+
+def usar_flags(test, flags):
+    """
+    Activa los flags de `flags` (formato de archivo de LaunchDarkly) durante el test.
+    """
+    directorio = tempfile.TemporaryDirectory()
+    test.addCleanup(directorio.cleanup)
+    archivo = Path(directorio.name) / "flags.json"
+    archivo.write_text(json.dumps(flags))
+    ajustes = override_settings(FEATURE_FLAGS_ENABLED=True, LAUNCHDARKLY_FLAGS_FILE=str(archivo))
+    ajustes.enable()
+    test.addCleanup(ajustes.disable)
+    reiniciar_cliente()
+    test.addCleanup(reiniciar_cliente)
+
+
+class FeatureFlagsTestCase(UsuarioAPITestCase):
+    def setUp(self):
+        super().setUp()
+        usar_flags(self, FLAGS)
+
+    def test_flag_apagado_deshabilita_la_vista(self):
+        """❌ Con enable-login apagado el login responde 503 sin verificar credenciales"""
+        response = self.client.post("/api/login/", {
+            "nombre_usuario": "admin", "contrasenia_usuario": "admin123"
+        }, format="json")
+        self.assertEqual(response.status_code, 503)
+
+    def test_flag_segun_rol(self):
+        """✅ El contexto usa rol: el listado se habilita al superusuario y no al profesor"""
+        self.auth_as_superuser()
+        self.assertEqual(self.client.get("/api/users/").status_code, 200)
+        self.client.force_authenticate(user=self.profesor)
+        self.assertEqual(self.client.get("/api/users/").status_code, 503)
+
+    def test_flag_desconocido_usa_el_valor_por_defecto(self):
+        """✅ Un flag que no está en el archivo toma su valor por defecto (habilitado)"""
+        self.auth_as_superuser()
+        self.assertEqual(self.client.get("/api/users/profe/").status_code, 200)
+
+    def test_una_evaluacion_por_peticion(self):
+        """✅ Todos los flags se evalúan con una sola llamada al SDK por petición"""
+        self.auth_as_superuser()
+        cliente = obtener_cliente()
+        with patch.object(cliente, "all_flags_state", wraps=cliente.all_flags_state) as evaluar:
+            self.client.get("/api/users/")
+            self.client.get("/api/users/profe/")
+        self.assertEqual(evaluar.call_count, 2)
+
+    def test_un_solo_cliente(self):
+        """✅ El cliente se crea una vez y se reutiliza"""
+        self.assertIs(obtener_cliente(), obtener_cliente())
+        self.assertTrue(obtener_cliente().is_initialized())
+
+    def test_contexto_de_usuario(self):
+        """✅ user_context lee email_usuario y rol"""
+        contexto = user_context(self.profesor)
+        self.assertEqual(contexto.key, str(self.profesor.id))
+        self.assertEqual(contexto.get("email"), "profe@udla.edu.ec")
+        self.assertEqual(contexto.get("rol"), "profesor")
+        self.assertTrue(user_context(None).anonymous)
+
+    @override_settings(FEATURE_FLAGS_ENABLED=False)
+    def test_flags_desactivados_no_crean_cliente(self):
+        """✅ Con FEATURE_FLAGS_ENABLED=false las vistas no tocan el SDK"""
+        with patch("feature_flags.provider.obtener_cliente") as obtener:
+            response = self.client.post("/api/login/", {
+                "nombre_usuario": "admin", "contrasenia_usuario": "admin123"
+            }, format="json")
+        self.assertNotEqual(response.status_code, 503)
+        obtener.assert_not_called()
+
+    @override_settings(DEBUG=True)
+    def test_middleware_no_se_adapta_bajo_asgi(self):
+        """✅ ASGIHandler usa el middleware de flags en modo async, sin adaptarlo a un hilo"""
+        # Django solo registra las adaptaciones con DEBUG.
+        with self.assertLogs("django.request", level="DEBUG") as registro:
+            ASGIHandler()
+            logging.getLogger("django.request").debug("middleware cargado")
+        self.assertEqual([linea for linea in registro.output if "FeatureFlagsMiddleware" in linea], [])
+
+    async def test_flag_segun_rol_por_asgi(self):
+        """✅ Por ASGI los flags se evalúan igual: el listado se niega al profesor"""
+        token = await Token.objects.acreate(user=self.profesor)
+        cliente = AsyncClient(headers={"authorization": f"Token {token.key}"})
+        self.assertEqual((await cliente.get("/api/users/")).status_code, 503)
+
+
+class OperacionesMasivasConFlagsTestCase(UsuarioAPITestCase):
+    """Las versiones masivas respetan el flag de su operación individual."""
+
+    def setUp(self):
+        super().setUp()
+        self.auth_as_superuser()
+
+    def _apagar(self, flag):
+        usar_flags(self, {"flagValues": {flag: False}})
+
+    def test_registro_masivo(self):
+        """❌ Con enable-user-registration apagado el registro masivo responde 503 sin crear usuarios"""
+        self._apagar("enable-user-registration")
+        response = self.client.post("/api/register/bulk/", [
+            {"nombre_usuario": "nuevo", "email_usuario": "nuevo@udla.edu.ec", "contrasenia_usuario": "Clave12345"}
+        ], format="json")
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(Usuario.objects.filter(nombre_usuario="nuevo").exists())
+
+    def test_exportacion(self):
+        """❌ Con enable-user-list apagado la exportación responde 503"""
+        self._apagar("enable-user-list")
+        self.assertEqual(self.client.get("/api/users/export/").status_code, 503)
+
+    def test_consulta_masiva(self):
+        """❌ Con enable-user-detail apagado la consulta masiva responde 503"""
+        self._apagar("enable-user-detail")
+        response = self.client.post("/api/users/batch/", {"nombres_usuario": ["profe"]}, format="json")
+        self.assertEqual(response.status_code, 503)
+
+    def test_desactivacion_masiva(self):
+        """❌ Con enable-user-delete apagado no se desactiva en masa; reactivar sigue permitido"""
+        self._apagar("enable-user-delete")
+        response = self.client.post("/api/users/bulk-status/", {"nombres_usuario": ["profe"], "is_active": False},
+                                    format="json")
+        self.assertEqual(response.status_code, 503)
+        self.assertTrue(Usuario.objects.get(nombre_usuario="profe").is_active)
+        response = self.client.post("/api/users/bulk-status/", {"nombres_usuario": ["profe"], "is_active": True},
+                                    format="json")
+        self.assertEqual(response.status_code, 200)
+
+    def test_reactivacion_masiva(self):
+        """❌ Con enable-user-update apagado no se reactiva en masa"""
+        Usuario.objects.filter(nombre_usuario="profe").update(is_active=False)
+        self._apagar("enable-user-update")
+        response = self.client.post("/api/users/bulk-status/", {"nombres_usuario": ["profe"], "is_active": True},
+                                    format="json")
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(Usuario.objects.get(nombre_usuario="profe").is_active)
@@ -0,0 +1,45 @@
+from users.tests.config import UsuarioAPITestCase, Usuario
+
+
+class FiltrosListadoTestCase(UsuarioAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.auth_as_superuser()
+        Usuario.objects.bulk_create([
+            Usuario(nombre_usuario="Mariana", email_usuario="mariana@udla.edu.ec", password="!"),
+            Usuario(nombre_usuario="Mario", email_usuario="mrojas@udla.edu.ec", password="!", is_active=False),
+            Usuario(nombre_usuario="Rosa", email_usuario="rosa.mar@udla.edu.ec", password="!"),
+        ])
+
+    def _nombres(self, query):
+        response = self.client.get(f"/api/users/?{query}")
+        self.assertEqual(response.status_code, 200)
+        return [u["nombre_usuario"] for u in response.data["results"]]
+
+    def test_filtrar_por_rol(self):
+        """✅ ?rol= retorna solo los usuarios de ese rol"""
+        self.assertEqual(self._nombres("rol=superuser"), ["admin"])
+
+    def test_filtrar_por_estado(self):
+        """✅ ?is_active=false retorna solo los desactivados"""
+        self.assertEqual(self._nombres("is_active=false"), ["Mario"])
+
+    def test_busqueda_por_prefijo(self):
+        """✅ La búsqueda por prefijo ignora mayúsculas y cubre nombre y correo"""
+        self.assertEqual(self._nombres("search=mar"), ["Mariana", "Mario"])
+        self.assertEqual(self._nombres("search=MROJ"), ["Mario"])
+
+    def test_busqueda_por_subcadena(self):
+        """✅ search_mode=contains busca en cualquier posición"""
+        self.assertEqual(self._nombres("search=mar&search_mode=contains"), ["Mariana", "Mario", "Rosa"])
+
+    def test_filtros_combinados_con_cursor(self):
+        """✅ Los filtros se combinan con la paginación por cursor"""
+        response = self.client.get("/api/users/?search=mar&is_active=true&cursor=&offset=1")
+        self.assertEqual([u["nombre_usuario"] for u in response.data["results"]], ["Mariana"])
+        self.assertIsNone(response.data["cursor"]["next"])
+
+    def test_filtro_invalido(self):
+        """❌ Valores de filtro inválidos responden 400"""
+        for query in ("rol=director", "is_active=quizas", "search=a&search_mode=regex"):
+            self.assertEqual(self.client.get(f"/api/users/?{query}").status_code, 400)
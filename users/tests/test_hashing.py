@@ -0,0 +1,74 @@
+import json
+import threading
+from django.test import override_settings
+from users.hashers import obtener_pool, reiniciar_pool
+from users.tests.config import UsuarioAPITestCase
+from users.utils.metrics import metricas
+
+
+@override_settings(PASSWORD_HASHING_POOL={'WORKERS': 1, 'QUEUE': 0, 'RETRY_AFTER': 2})
+class PoolHashingTestCase(UsuarioAPITestCase):
+    def setUp(self):
+        reiniciar_pool()
+        metricas.reiniciar()
+        super().setUp()
+
+    def tearDown(self):
+        reiniciar_pool()
+        super().tearDown()
+
+    def _ocupar_pool(self):
+        """Bloquea el único worker hasta que se libere el evento retornado."""
+        liberar = threading.Event()
+        iniciado = threading.Event()
+
+        def bloquear():
+            iniciado.set()
+            liberar.wait(5)
+
+        hilo = threading.Thread(target=obtener_pool().ejecutar, args=(bloquear,))
+        hilo.start()
+        iniciado.wait(5)
+        return liberar, hilo
+
+    def test_login_usa_el_pool(self):
+        """✅ El login calcula el hash en el pool y reporta latencia"""
+        response = self.client.post("/api/login/", {
+            "nombre_usuario": "profe",
+            "contrasenia_usuario": "123456"
+        }, format="json")
+        self.assertEqual(response.status_code, 200)
+        hashing = json.loads(self.client.get("/api/metrics/").content.decode('utf-8'))['data']['hashing']
+        self.assertGreaterEqual(hashing['total'], 1)
+        self.assertGreater(hashing['latencia_ms_promedio'], 0)
+        self.assertEqual(hashing['cola'], 0)
+
+    def test_login_pool_saturado(self):
+        """❌ Con el pool lleno el login responde 503 con Retry-After"""
+        liberar, hilo = self._ocupar_pool()
+        try:
+            response = self.client.post("/api/login/", {
+                "nombre_usuario": "profe",
+                "contrasenia_usuario": "123456"
+            }, format="json")
+        finally:
+            liberar.set()
+            hilo.join()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "2")
+        self.assertEqual(metricas.valor('hashing.rechazos'), 1)
+
+    def test_registro_pool_saturado(self):
+        """❌ Con el pool lleno el registro responde 503"""
+        liberar, hilo = self._ocupar_pool()
+        try:
+            response = self.client.post("/api/register/", {
+                "nombre_usuario": "nuevo",
+                "email_usuario": "nuevo@udla.edu.ec",
+                "contrasenia_usuario": "test1234",
+            }, format="json")
+        finally:
+            liberar.set()
+            hilo.join()
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("Retry-After", response)
@@ -0,0 +1,67 @@
+import json
+from django.test import override_settings
+from rest_framework.authtoken.models import Token
+from users.tests.config import UsuarioAPITestCase, Usuario
+
+CLAVE = "clave-de-servicio"
+
+
+@override_settings(INTROSPECCION_CLAVE=CLAVE)
+class IntrospeccionTestCase(UsuarioAPITestCase):
+    def _post(self, tokens, **headers):
+        headers.setdefault("HTTP_X_AUTHSERVICE_CLAVE", CLAVE)
+        response = self.client.post("/api/introspect/", {"tokens": tokens}, format="json", **headers)
+        return response, json.loads(response.content.decode('utf-8'))
+
+    def test_verifica_varios_tokens_en_una_consulta(self):
+        """✅ Resuelve todos los tokens con una sola consulta"""
+        token_admin = Token.objects.get(user=self.superuser)
+        token_profe, _ = Token.objects.get_or_create(user=self.profesor)
+        with self.assertNumQueries(1):
+            response, data = self._post([token_admin.key, token_profe.key, "desconocido"])
+        self.assertEqual(response.status_code, 200)
+        resultados = data['data']
+        self.assertEqual([r['token'] for r in resultados], [token_admin.key, token_profe.key, "desconocido"])
+        self.assertTrue(resultados[0]['active'])
+        self.assertEqual(resultados[0]['rol'], "superuser")
+        self.assertEqual(resultados[1]['id'], self.profesor.id)
+        self.assertEqual(resultados[2], {"token": "desconocido", "active": False, "id": None, "rol": None})
+
+    def test_token_de_usuario_inactivo(self):
+        """✅ El token de un usuario desactivado se reporta inactivo"""
+        token_profe, _ = Token.objects.get_or_create(user=self.profesor)
+        Usuario.objects.filter(id=self.profesor.id).update(is_active=False)
+        _, data = self._post([token_profe.key])
+        self.assertFalse(data['data'][0]['active'])
+        self.assertEqual(data['data'][0]['rol'], "profesor")
+
+    def test_lista_vacia(self):
+        """❌ La lista de tokens no puede estar vacía"""
+        response, _ = self._post([])
+        self.assertEqual(response.status_code, 400)
+
+    def test_limite_de_tokens(self):
+        """❌ No se aceptan más de 100 tokens por petición"""
+        response, _ = self._post([f"t{i}" for i in range(101)])
+        self.assertEqual(response.status_code, 400)
+
+    def test_sin_credencial_de_servicio(self):
+        """❌ Sin la clave de servicio (o con otra) responde 403 sin revelar nada de los tokens"""
+        token_admin = Token.objects.get(user=self.superuser)
+        for headers in ({"HTTP_X_AUTHSERVICE_CLAVE": ""}, {"HTTP_X_AUTHSERVICE_CLAVE": "otra"}):
+            response, data = self._post([token_admin.key], **headers)
+            self.assertEqual(response.status_code, 403)
+            self.assertNotIn(token_admin.key, json.dumps(data))
+
+    def test_token_de_usuario_no_sirve_de_credencial(self):
+        """❌ Un token de usuario (incluso de superusuario) no autoriza la introspección"""
+        token_admin = Token.objects.get(user=self.superuser)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token_admin.key}")
+        response, _ = self._post([token_admin.key], HTTP_X_AUTHSERVICE_CLAVE="")
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(INTROSPECCION_CLAVE="")
+    def test_sin_clave_configurada(self):
+        """❌ Sin INTROSPECCION_CLAVE configurada el endpoint rechaza todo, incluso una clave vacía"""
+        response, _ = self._post(["x"], HTTP_X_AUTHSERVICE_CLAVE="")
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,125 @@
+import json
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+from users.tests.config import UsuarioAPITestCase, Usuario
+from users.tokens import signing_keys, token_backend
+
+CLAVE_PRIVADA = rsa.generate_private_key(public_exponent=65537, key_size=2048).private_bytes(
+    serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+).decode()
+
+
+def limpiar_claves(test):
+    """Las claves se cachean por proceso: cada test lee las de sus settings."""
+    signing_keys.cache_clear()
+    token_backend.cache_clear()
+    test.addCleanup(token_backend.cache_clear)
+    test.addCleanup(signing_keys.cache_clear)
+
+
+@override_settings(JWT_ENABLED=True, JWT_PRIVATE_KEY=CLAVE_PRIVADA)
+class UsuarioJWTTestCase(UsuarioAPITestCase):
+    def setUp(self):
+        super().setUp()
+        limpiar_claves(self)
+
+    def _login(self):
+        response = self.client.post("/api/login/", {
+            "nombre_usuario": "profe",
+            "contrasenia_usuario": "123456"
+        }, format="json")
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content.decode('utf-8'))['data']
+
+    def _public_key(self):
+        response = self.client.get("/api/.well-known/jwks.json")
+        self.assertEqual(response.status_code, 200)
+        jwk = json.loads(response.content.decode('utf-8'))['keys'][0]
+        return jwk, jwt.PyJWK(jwk).key
+
+    def test_login_devuelve_token_opaco_y_jwt(self):
+        """✅ El login mantiene el token opaco y agrega access/refresh"""
+        data = self._login()
+        self.assertIn("token", data)
+        self.assertIn("access", data)
+        self.assertIn("refresh", data)
+
+    def test_access_token_se_valida_con_jwks(self):
+        """✅ El access token se valida localmente con la clave pública publicada"""
+        data = self._login()
+        jwk, key = self._public_key()
+        self.assertEqual(jwt.get_unverified_header(data["access"])["kid"], jwk["kid"])
+        claims = jwt.decode(data["access"], key, algorithms=["RS256"], issuer="authservice")
+        self.assertEqual(claims["id"], self.profesor.id)
+        self.assertEqual(claims["nombre_usuario"], "profe")
+        self.assertEqual(claims["rol"], "profesor")
+        self.assertEqual(claims["token_type"], "access")
+
+    def test_refresh_emite_nuevo_access(self):
+        """✅ El refresh token permite obtener un nuevo access token"""
+        data = self._login()
+        response = self.client.post("/api/token/refresh/", {"refresh": data["refresh"]}, format="json")
+        self.assertEqual(response.status_code, 200)
+        payload = json.loads(response.content.decode('utf-8'))
+        self.assertIn("access", payload['data'])
+
+    def test_refresh_invalido(self):
+        """❌ Un refresh token alterado es rechazado"""
+        response = self.client.post("/api/token/refresh/", {"refresh": "no.es.valido"}, format="json")
+        self.assertEqual(response.status_code, 401)
+
+    def test_refresh_usuario_desactivado(self):
+        """❌ Un usuario desactivado no puede renovar su token"""
+        data = self._login()
+        Usuario.objects.filter(id=self.profesor.id).update(is_active=False)
+        response = self.client.post("/api/token/refresh/", {"refresh": data["refresh"]}, format="json")
+        self.assertEqual(response.status_code, 401)
+
+
+class UsuarioJWTDeshabilitadoTestCase(UsuarioAPITestCase):
+    def test_login_sin_jwt(self):
+        """✅ Sin JWT_ENABLED el login solo devuelve el token opaco"""
+        response = self.client.post("/api/login/", {
+            "nombre_usuario": "profe",
+            "contrasenia_usuario": "123456"
+        }, format="json")
+        data = json.loads(response.content.decode('utf-8'))['data']
+        self.assertIn("token", data)
+        self.assertNotIn("access", data)
+
+    def test_jwks_deshabilitado(self):
+        """❌ El JWKS no se publica si JWT está deshabilitado"""
+        response = self.client.get("/api/.well-known/jwks.json")
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(JWT_ENABLED=True, JWT_PRIVATE_KEY="", JWT_PUBLIC_KEY="")
+class ClavesJWTTestCase(SimpleTestCase):
+    def setUp(self):
+        limpiar_claves(self)
+
+    @override_settings(DEBUG=False)
+    def test_sin_clave_fuera_de_debug(self):
+        """❌ Sin JWT_PRIVATE_KEY y sin DEBUG no se genera una clave efímera: falla al arrancar"""
+        with self.assertRaises(ImproperlyConfigured):
+            signing_keys()
+        with self.assertRaises(ImproperlyConfigured):
+            apps.get_app_config("users").ready()
+
+    @override_settings(DEBUG=True)
+    def test_clave_efimera_en_debug(self):
+        """✅ En desarrollo (DEBUG) se usa una clave efímera por proceso"""
+        privada, publica = signing_keys()
+        self.assertIn("PRIVATE KEY", privada)
+        self.assertIn("PUBLIC KEY", publica)
+
+    @override_settings(DEBUG=False, JWT_PRIVATE_KEY=CLAVE_PRIVADA)
+    def test_clave_configurada(self):
+        """✅ Con JWT_PRIVATE_KEY la clave pública se deriva de ella"""
+        privada, publica = signing_keys()
+        self.assertEqual(privada, CLAVE_PRIVADA)
+        self.assertIn("PUBLIC KEY", publica)
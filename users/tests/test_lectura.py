@@ -0,0 +1,39 @@
+from rest_framework.renderers import JSONRenderer
+from users.serializers import RegistroUsuarioSerializer
+from users.tests.config import UsuarioAPITestCase, Usuario
+
+
+class LecturaTestCase(UsuarioAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.auth_as_superuser()
+
+    def test_listado_identico_al_serializer(self):
+        """✅ El listado con .values() produce el mismo JSON que el serializer"""
+        response = self.client.get("/api/users/?page=1&offset=10")
+        esperado = RegistroUsuarioSerializer(Usuario.objects.order_by("id"), many=True).data
+        self.assertEqual(JSONRenderer().render(response.data["results"]), JSONRenderer().render(esperado))
+
+    def test_detalle_identico_al_serializer(self):
+        """✅ El detalle produce el mismo JSON que el serializer"""
+        response = self.client.get("/api/users/profe/")
+        esperado = RegistroUsuarioSerializer(self.profesor).data
+        self.assertEqual(JSONRenderer().render(response.data["data"]), JSONRenderer().render(esperado))
+
+    def test_campos_dispersos(self):
+        """✅ ?fields= limita las columnas en listado y detalle"""
+        response = self.client.get("/api/users/?fields=nombre_usuario,id")
+        self.assertEqual(list(response.data["results"][0]), ["id", "nombre_usuario"])
+        response = self.client.get("/api/users/profe/?fields=email_usuario")
+        self.assertEqual(response.data["data"], {"email_usuario": "profe@udla.edu.ec"})
+
+    def test_campos_dispersos_con_cursor(self):
+        """✅ En modo cursor el id se lee para el cursor pero no se retorna si no se pide"""
+        response = self.client.get("/api/users/?fields=nombre_usuario&cursor=&offset=1")
+        self.assertEqual(response.data["results"], [{"nombre_usuario": "admin"}])
+        self.assertIsNotNone(response.data["cursor"]["next"])
+
+    def test_campo_invalido(self):
+        """❌ Un campo inexistente (o la contraseña) responde 400"""
+        self.assertEqual(self.client.get("/api/users/?fields=password").status_code, 400)
+        self.assertEqual(self.client.get("/api/users/profe/?fields=nada").status_code, 400)
@@ -0,0 +1,95 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from users.models import Usuario
+from users.tests.config import UsuarioAPITestCase
+
+
+# Dentro de TestCase cada transaction.atomic() anidado agrega SAVEPOINT y
+# RELEASE SAVEPOINT a la cuenta; en producción (autocommit) no son consultas.
+# Las escrituras agregan además el advisory lock y el INSERT del outbox
+# (users/cambios.py).
+@override_settings(PASSWORD_HASH_ITERATIONS=1000)
+class QueryBudgetTestCase(UsuarioAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.auth_as_superuser()
+
+    def test_registro_con_presupuesto_fijo(self):
+        """✅ Registrar es un INSERT del usuario, uno del token y el del outbox, sin consultas previas"""
+        payload = {
+            "nombre_usuario": "nuevo",
+            "email_usuario": "nuevo@udla.edu.ec",
+            "contrasenia_usuario": "abc123"
+        }
+        with self.assertNumQueries(8):
+            response = self.client.post("/api/register/", payload, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Token.objects.filter(user__nombre_usuario="nuevo").exists())
+
+    def test_registro_duplicado_por_restriccion(self):
+        """❌ Un nombre duplicado se detecta por la restricción única y conserva el mensaje del campo"""
+        payload = {
+            "nombre_usuario": "profe",
+            "email_usuario": "otro@udla.edu.ec",
+            "contrasenia_usuario": "abc123"
+        }
+        with self.assertNumQueries(7):
+            response = self.client.post("/api/register/", payload, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("El nombre de usuario ya está en uso.", response.data["data"])
+
+    def test_registro_correo_duplicado(self):
+        """❌ Un correo duplicado reporta el error del correo"""
+        payload = {
+            "nombre_usuario": "otro",
+            "email_usuario": "profe@udla.edu.ec",
+            "contrasenia_usuario": "abc123"
+        }
+        response = self.client.post("/api/register/", payload, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("El correo electrónico ya está en uso.", response.data["data"])
+
+    def test_actualizar_escribe_solo_columnas_cambiadas(self):
+        """✅ Actualizar lee una fila y escribe solo la columna modificada"""
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.patch(
+                "/api/users/profe/update/", {"email_usuario": "profe2@udla.edu.ec"}, format="json"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(consultas), 6)
+        update = next(q["sql"] for q in consultas if q["sql"].startswith("UPDATE"))
+        self.assertIn('"email_usuario"', update)
+        self.assertNotIn('"password"', update)
+        self.assertNotIn('"rol"', update)
+
+    def test_actualizar_sin_cambios_no_escribe(self):
+        """✅ Si ningún valor cambia no se ejecuta el UPDATE"""
+        with self.assertNumQueries(1):
+            response = self.client.patch("/api/users/profe/update/", {"rol": "profesor"}, format="json")
+        self.assertEqual(response.status_code, 200)
+
+    def test_actualizar_correo_duplicado(self):
+        """❌ Un correo en uso se detecta por la restricción única"""
+        response = self.client.patch(
+            "/api/users/profe/update/", {"email_usuario": "admin@udla.edu.ec"}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("El correo ya está en uso.", response.data["data"])
+        self.profesor.refresh_from_db()
+        self.assertEqual(self.profesor.email_usuario, "profe@udla.edu.ec")
+
+    def test_desactivar_con_presupuesto_fijo(self):
+        """✅ Desactivar es un SELECT de columnas mínimas, un UPDATE condicional y el cambio del outbox"""
+        with self.assertNumQueries(6):
+            response = self.client.delete("/api/users/profe/delete/")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Usuario.objects.get(pk=self.profesor.pk).is_active)
+
+    def test_desactivar_inactivo_no_escribe(self):
+        """❌ Un usuario ya desactivado se reporta sin UPDATE"""
+        Usuario.objects.filter(pk=self.profesor.pk).update(is_active=False)
+        with self.assertNumQueries(1):
+            response = self.client.delete("/api/users/profe/delete/")
+        self.assertEqual(response.status_code, 400)
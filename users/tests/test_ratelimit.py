@@ -0,0 +1,94 @@
+from django.core.cache import caches
+from django.test import override_settings
+from unittest import mock
+from users.ratelimit import LocalBackend, reiniciar_limites
+from users.tests.config import UsuarioAPITestCase
+from users.utils.metrics import metricas
+
+
+LIMITES = {
+    'ENABLED': True,
+    'BACKEND': 'local',
+    'ENDPOINTS': {
+        'login': {'ip': '100/min', 'usuario': '3/min'},
+        'register': {'ip': '2/min'},
+    },
+    'FALLOS_LOGIN': {'UMBRAL': 2, 'VENTANA': 300},
+}
+
+
+@override_settings(RATE_LIMITS=LIMITES)
+class RateLimitTestCase(UsuarioAPITestCase):
+    def setUp(self):
+        super().setUp()
+        metricas.reiniciar()
+
+    def _login(self, contrasenia, nombre="profe"):
+        return self.client.post("/api/login/", {
+            "nombre_usuario": nombre,
+            "contrasenia_usuario": contrasenia
+        }, format="json")
+
+    def test_limite_por_usuario(self):
+        """❌ Se rechaza el login al agotar el bucket del nombre de usuario"""
+        for _ in range(3):
+            self.assertEqual(self._login("123456").status_code, 200)
+        response = self._login("123456")
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+        self.assertEqual(metricas.valor('ratelimit.login.rechazadas'), 1)
+
+    def test_fallos_bloquean_antes_de_autenticar(self):
+        """❌ Superado el umbral de fallos no se llega a authenticate()"""
+        self.assertEqual(self._login("mala").status_code, 400)
+        self.assertEqual(self._login("mala").status_code, 400)
+        with mock.patch("users.serializers.authenticate") as authenticate:
+            response = self._login("123456")
+        self.assertEqual(response.status_code, 429)
+        authenticate.assert_not_called()
+
+    def test_login_exitoso_reinicia_fallos(self):
+        """✅ Un login correcto reinicia el contador de fallos del usuario"""
+        self.assertEqual(self._login("mala").status_code, 400)
+        self.assertEqual(self._login("123456").status_code, 200)
+        reiniciar_limites()
+        self.assertEqual(self._login("mala").status_code, 400)
+        self.assertEqual(self._login("123456").status_code, 200)
+
+    def test_limite_registro_por_ip(self):
+        """❌ El registro se limita por IP"""
+        for i in range(2):
+            self.client.post("/api/register/", {}, format="json")
+        response = self.client.post("/api/register/", {}, format="json")
+        self.assertEqual(response.status_code, 429)
+
+    @override_settings(RATE_LIMITS={**LIMITES, 'BACKEND': 'cache', 'CACHE_ALIAS': 'default'})
+    def test_backend_compartido(self):
+        """✅ El bucket compartido conserva el consumo entre procesos"""
+        reiniciar_limites()
+        caches['default'].clear()
+        for _ in range(3):
+            self.assertEqual(self._login("123456").status_code, 200)
+        # Un proceso nuevo (bucket local vacío) ve el consumo en la caché compartida.
+        reiniciar_limites()
+        self.assertEqual(self._login("123456").status_code, 429)
+
+    @override_settings(RATE_LIMITS={**LIMITES, 'ENABLED': False})
+    def test_limites_deshabilitados(self):
+        """✅ Con ENABLED=False no se limita"""
+        for _ in range(5):
+            self.assertEqual(self._login("123456").status_code, 200)
+
+
+class TokenBucketTestCase(UsuarioAPITestCase):
+    def test_recarga_del_bucket(self):
+        """✅ El bucket se recarga proporcionalmente al tiempo transcurrido"""
+        ahora = [0.0]
+        backend = LocalBackend(clock=lambda: ahora[0])
+        self.assertEqual(backend.consumir("k", 2, 60), (True, 0))
+        self.assertEqual(backend.consumir("k", 2, 60), (True, 0))
+        permitido, espera = backend.consumir("k", 2, 60)
+        self.assertFalse(permitido)
+        self.assertEqual(espera, 30)
+        ahora[0] = 30.0
+        self.assertEqual(backend.consumir("k", 2, 60), (True, 0))
@@ -0,0 +1,61 @@
+import io
+import json
+
+import msgpack
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from users.renderers import MessagePackParser, ORJSONParser
+from users.tests.config import UsuarioAPITestCase
+
+
+class RenderersTestCase(UsuarioAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.auth_as_superuser()
+
+    def test_json_por_defecto_igual_a_drf(self):
+        """✅ Sin Accept se responde JSON con orjson, idéntico al de DRF"""
+        response = self.client.get("/api/users/")
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(json.loads(response.content), json.loads(JSONRenderer().render(response.data)))
+
+    def test_msgpack_por_accept(self):
+        """✅ Accept: application/msgpack retorna el mismo sobre en MessagePack"""
+        response = self.client.get("/api/users/", HTTP_ACCEPT="application/msgpack")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        body = msgpack.unpackb(response.content)
+        self.assertEqual(body["count"], response.data["count"])
+        self.assertEqual(body["results"], json.loads(JSONRenderer().render(response.data["results"])))
+
+    def test_etag_por_representacion(self):
+        """✅ JSON y MessagePack tienen ETag distinto y responden con Vary: Accept"""
+        for ruta in ("/api/users/", "/api/users/profe/"):
+            json_ = self.client.get(ruta)
+            mp = self.client.get(ruta, HTTP_ACCEPT="application/msgpack")
+            self.assertNotEqual(json_["ETag"], mp["ETag"])
+            self.assertIn("Accept", json_["Vary"])
+            self.assertIn("Accept", mp["Vary"])
+
+            # El ETag de una representación no valida la otra.
+            response = self.client.get(ruta, HTTP_ACCEPT="application/msgpack", HTTP_IF_NONE_MATCH=json_["ETag"])
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response["Content-Type"], "application/msgpack")
+            response = self.client.get(ruta, HTTP_ACCEPT="application/msgpack", HTTP_IF_NONE_MATCH=mp["ETag"])
+            self.assertEqual(response.status_code, 304)
+            self.assertIn("Accept", response["Vary"])
+
+    def test_msgpack_en_cuerpo(self):
+        """✅ Un cuerpo application/msgpack es aceptado por los endpoints"""
+        payload = msgpack.packb({"nombres_usuario": ["profe"]})
+        response = self.client.post(
+            "/api/users/batch/", payload, content_type="application/msgpack", HTTP_ACCEPT="application/msgpack"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(msgpack.unpackb(response.content)["data"]["nombres_usuario"]["profe"]["rol"], "profesor")
+
+    def test_cuerpo_invalido(self):
+        """❌ Un cuerpo MessagePack o JSON corrupto lanza ParseError"""
+        for parser, cuerpo in ((MessagePackParser(), b"\xc1"), (ORJSONParser(), b"{")):
+            with self.assertRaises(ParseError):
+                parser.parse(io.BytesIO(cuerpo))
@@ -0,0 +1,67 @@
+from django.core.cache import caches
+from django.test import override_settings
+from rest_framework.authtoken.models import Token
+from users.authentication import estadisticas, reiniciar_cache, snapshot_usuario
+from users.tests.config import UsuarioAPITestCase
+from users.utils.metrics import metricas
+
+
+class TokenCacheTestCase(UsuarioAPITestCase):
+    def setUp(self):
+        super().setUp()
+        reiniciar_cache()
+        metricas.reiniciar()
+        caches['default'].clear()
+        self.token_profe, _ = Token.objects.get_or_create(user=self.profesor)
+
+    def _get_con_token(self, key):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {key}")
+        return self.client.get("/api/metrics/")
+
+    def test_segunda_peticion_no_consulta_la_base(self):
+        """✅ El token se resuelve desde la caché en memoria tras el primer acceso"""
+        self.assertEqual(self._get_con_token(self.token_profe.key).status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(self._get_con_token(self.token_profe.key).status_code, 200)
+        stats = estadisticas()
+        self.assertEqual(stats["miss"], 1)
+        self.assertEqual(stats["l1_hit"], 1)
+
+    def test_token_invalido(self):
+        """❌ Un token inexistente es rechazado"""
+        self.assertEqual(self._get_con_token("noexiste").status_code, 401)
+
+    def test_desactivar_invalida_la_cache(self):
+        """✅ Un usuario desactivado queda bloqueado de inmediato"""
+        self.assertEqual(self._get_con_token(self.token_profe.key).status_code, 200)
+        self.auth_as_superuser()
+        response = self.client.delete("/api/users/profe/delete/")
+        self.assertEqual(response.status_code, 200)
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self._get_con_token(self.token_profe.key).status_code, 401)
+
+    def test_cambio_de_contrasenia_invalida_la_cache(self):
+        """✅ Actualizar la contraseña expulsa la entrada cacheada"""
+        self._get_con_token(self.token_profe.key)
+        self.auth_as_superuser()
+        response = self.client.patch("/api/users/profe/update/", {"contrasenia_usuario": "otra1234"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(estadisticas()["l1_entradas"], 0)
+
+    @override_settings(TOKEN_AUTH_CACHE={'MAX_ENTRIES': 100, 'TTL': 30, 'SHARED_ALIAS': 'default', 'SHARED_TTL': 60})
+    def test_nivel_compartido(self):
+        """✅ Otro proceso (L1 vacío) resuelve el token desde la caché compartida"""
+        reiniciar_cache()
+        self._get_con_token(self.token_profe.key)
+        reiniciar_cache()
+        with self.assertNumQueries(0):
+            self.assertEqual(self._get_con_token(self.token_profe.key).status_code, 200)
+        self.assertEqual(estadisticas()["l2_hit"], 1)
+
+    @override_settings(TOKEN_AUTH_CACHE={'MAX_ENTRIES': 100, 'TTL': 30, 'SHARED_ALIAS': 'default', 'SHARED_TTL': 60})
+    def test_entrada_de_la_version_anterior(self):
+        """✅ Una entrada compartida con el formato anterior no rompe la autenticación"""
+        caches['default'].set(f"auth:token:{self.token_profe.key}", snapshot_usuario(self.profesor), 60)
+        reiniciar_cache()
+        self.assertEqual(self._get_con_token(self.token_profe.key).status_code, 200)
+        self.assertEqual(estadisticas()["miss"], 1)
@@ -0,0 +1,85 @@
+import json
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from users.authentication import reiniciar_cache
+from users.tests.config import UsuarioAPITestCase, Usuario
+
+
+@override_settings(AUTH_TOKEN_LIFETIME=3600, AUTH_TOKEN_SLIDING=True, INTROSPECCION_CLAVE="clave")
+class TokenExpiracionTestCase(UsuarioAPITestCase):
+    def setUp(self):
+        super().setUp()
+        reiniciar_cache()
+        self.token_profe, _ = Token.objects.get_or_create(user=self.profesor)
+
+    def _envejecer(self, token, segundos):
+        Token.objects.filter(key=token.key).update(created=timezone.now() - timedelta(seconds=segundos))
+
+    def _get_con_token(self, key):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {key}")
+        return self.client.get("/api/metrics/")
+
+    def test_token_vencido_es_rechazado(self):
+        """❌ Un token con más antigüedad que su vigencia es rechazado"""
+        self._envejecer(self.token_profe, 3601)
+        self.assertEqual(self._get_con_token(self.token_profe.key).status_code, 401)
+
+    def test_renovacion_deslizante(self):
+        """✅ Usar un token pasada la mitad de su vigencia la renueva"""
+        self._envejecer(self.token_profe, 2000)
+        self.assertEqual(self._get_con_token(self.token_profe.key).status_code, 200)
+        creado = Token.objects.get(key=self.token_profe.key).created
+        self.assertLess(timezone.now() - creado, timedelta(seconds=60))
+
+    def test_sin_renovacion_antes_de_media_vigencia(self):
+        """✅ Un token reciente no se reescribe en cada uso"""
+        self._get_con_token(self.token_profe.key)
+        with self.assertNumQueries(0):
+            self.assertEqual(self._get_con_token(self.token_profe.key).status_code, 200)
+
+    def test_login_rota_token_vencido(self):
+        """✅ El login reemplaza un token vencido por uno nuevo"""
+        self._envejecer(self.token_profe, 3601)
+        response = self.client.post("/api/login/", {
+            "nombre_usuario": "profe",
+            "contrasenia_usuario": "123456"
+        }, format="json")
+        nuevo = json.loads(response.content.decode('utf-8'))['data']['token']
+        self.assertNotEqual(nuevo, self.token_profe.key)
+        self.assertFalse(Token.objects.filter(key=self.token_profe.key).exists())
+
+    def test_introspeccion_token_vencido(self):
+        """✅ La introspección reporta inactivo un token vencido"""
+        self._envejecer(self.token_profe, 3601)
+        response = self.client.post("/api/introspect/", {"tokens": [self.token_profe.key]}, format="json",
+                                    HTTP_X_AUTHSERVICE_CLAVE="clave")
+        self.assertFalse(json.loads(response.content.decode('utf-8'))['data'][0]['active'])
+
+    def test_purgar_tokens(self):
+        """✅ La purga elimina por lotes los vencidos y los de usuarios inactivos"""
+        inactivo = Usuario.objects.create_user(
+            nombre_usuario="inactivo",
+            email_usuario="inactivo@udla.edu.ec",
+            contrasenia_usuario="abc12345",
+            is_active=False
+        ) # type: ignore
+        Token.objects.create(user=inactivo)
+        vigente = Token.objects.get(user=self.superuser)
+        self._envejecer(self.token_profe, 3601)
+
+        salida = StringIO()
+        call_command("purgar_tokens", "--lote", "1", "--pausa", "0", stdout=salida)
+        self.assertIn("Tokens eliminados: 2", salida.getvalue())
+        self.assertEqual(list(Token.objects.values_list('key', flat=True)), [vigente.key])
+
+    def test_purgar_tokens_simulacion(self):
+        """✅ Con --simular solo se cuentan los tokens"""
+        self._envejecer(self.token_profe, 3601)
+        salida = StringIO()
+        call_command("purgar_tokens", "--simular", stdout=salida)
+        self.assertIn("Tokens a eliminar (vencidos): 1", salida.getvalue())
+        self.assertTrue(Token.objects.filter(key=self.token_profe.key).exists())
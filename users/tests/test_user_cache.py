@@ -0,0 +1,87 @@
+import threading
+import time
+from unittest import mock
+from django.core.cache import caches
+from django.test import override_settings
+from users import cache_usuarios
+from users.cache_usuarios import estadisticas, obtener_detalle, reiniciar_cache
+from users.tests.config import UsuarioAPITestCase
+from users.utils.metrics import metricas
+
+
+class CacheDetalleTestCase(UsuarioAPITestCase):
+    def setUp(self):
+        super().setUp()
+        metricas.reiniciar()
+        caches['default'].clear()
+        self.auth_as_superuser()
+
+    def test_segunda_lectura_sin_consultas(self):
+        """✅ El detalle se sirve desde la caché tras la primera lectura"""
+        self.client.get("/api/users/profe/")
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/users/profe/")
+        self.assertEqual(response.data["data"]["nombre_usuario"], "profe")
+        self.assertEqual(estadisticas()["l1_hit"], 1)
+
+    def test_actualizar_invalida(self):
+        """✅ Actualizar un usuario invalida su detalle cacheado"""
+        self.client.get("/api/users/profe/")
+        self.client.patch("/api/users/profe/update/", {"rol": "superuser"}, format="json")
+        self.assertEqual(self.client.get("/api/users/profe/").data["data"]["rol"], "superuser")
+
+    def test_renombrar_invalida_ambos_nombres(self):
+        """✅ Al renombrar, el nombre anterior deja de resolverse"""
+        self.client.get("/api/users/profe/")
+        self.client.patch("/api/users/profe/update/", {"nombre_usuario": "profesora"}, format="json")
+        self.assertEqual(self.client.get("/api/users/profe/").status_code, 404)
+        self.assertEqual(self.client.get("/api/users/profesora/").status_code, 200)
+
+    def test_desactivar_invalida(self):
+        """✅ Desactivar un usuario invalida su detalle cacheado"""
+        self.client.get("/api/users/profe/")
+        self.client.delete("/api/users/profe/delete/")
+        self.assertFalse(self.client.get("/api/users/profe/").data["data"]["is_active"])
+
+    def test_registro_invalida_inexistente(self):
+        """✅ Un nombre cacheado como inexistente se resuelve tras registrarlo"""
+        self.assertEqual(self.client.get("/api/users/nuevo/").status_code, 404)
+        payload = {"nombre_usuario": "nuevo", "email_usuario": "nuevo@udla.edu.ec", "contrasenia_usuario": "abc123"}
+        with override_settings(PASSWORD_HASH_ITERATIONS=1000):
+            self.assertEqual(self.client.post("/api/register/", payload, format="json").status_code, 201)
+        self.assertEqual(self.client.get("/api/users/nuevo/").status_code, 200)
+
+    @override_settings(USER_DETAIL_CACHE={'MAX_ENTRIES': 100, 'TTL': 10, 'SHARED_ALIAS': 'default', 'SHARED_TTL': 60})
+    def test_nivel_compartido(self):
+        """✅ Otro proceso (L1 vacío) lee el detalle desde la caché compartida"""
+        reiniciar_cache()
+        self.client.get("/api/users/profe/")
+        reiniciar_cache()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get("/api/users/profe/").status_code, 200)
+        self.assertEqual(estadisticas()["l2_hit"], 1)
+
+    def test_fallos_concurrentes_una_consulta(self):
+        """✅ Fallos simultáneos del mismo nombre ejecutan una sola consulta"""
+        llamadas = []
+
+        def consultar_lento(nombre_usuario):
+            llamadas.append(nombre_usuario)
+            time.sleep(0.2)
+            return {"id": 1, "nombre_usuario": nombre_usuario}
+
+        resultados = []
+        with mock.patch.object(cache_usuarios, "_consultar", consultar_lento):
+            hilos = [
+                threading.Thread(target=lambda: resultados.append(obtener_detalle("concurrente")))
+                for _ in range(8)
+            ]
+            for hilo in hilos:
+                hilo.start()
+            for hilo in hilos:
+                hilo.join()
+
+        self.assertEqual(len(llamadas), 1)
+        self.assertEqual(len(resultados), 8)
+        self.assertTrue(all(r == {"id": 1, "nombre_usuario": "concurrente"} for r in resultados))
+        self.assertEqual(estadisticas()["coalescidas"], 7)
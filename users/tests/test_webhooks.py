@@ -0,0 +1,174 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from users.models import CambioUsuario, SuscriptorWebhook
+from users.tests.config import UsuarioAPITestCase
+from users.webhooks import Despachador, despachar, firmar
+
+WEBHOOKS = {'WORKERS': 2, 'LOTE': 2, 'TIMEOUT': 2, 'REINTENTOS': 2, 'BACKOFF': 0.01, 'BACKOFF_MAXIMO': 0.05, 'INTERVALO': 0}
+
+
+class Receptor:
+    """
+    Receptor HTTP local: responde con los códigos de `respuestas` en orden
+    (luego 200) y guarda cada petición.
+    """
+
+    def __init__(self, respuestas=(), demora=0.0):
+        self.respuestas = list(respuestas)
+        self.recibidos = []
+        receptor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                cuerpo = self.rfile.read(int(self.headers["Content-Length"]))
+                receptor.recibidos.append((dict(self.headers), cuerpo))
+                time.sleep(demora)
+                self.send_response(receptor.respuestas.pop(0) if receptor.respuestas else 200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.servidor = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.servidor.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.servidor.server_port}/webhook"
+
+    def cerrar(self):
+        self.servidor.shutdown()
+        self.servidor.server_close()
+
+    def cambios(self, indice):
+        return json.loads(self.recibidos[indice][1])["cambios"]
+
+
+@override_settings(PASSWORD_HASH_ITERATIONS=1000, WEBHOOKS=WEBHOOKS)
+class WebhooksTestCase(UsuarioAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.auth_as_superuser()
+        self.pool = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(self.pool.shutdown)
+
+    def _receptor(self, **kwargs):
+        receptor = Receptor(**kwargs)
+        self.addCleanup(receptor.cerrar)
+        return receptor
+
+    def _suscribir(self, receptor, nombre="reportes", **kwargs):
+        kwargs.setdefault("ultimo_seq", 0)
+        return SuscriptorWebhook.objects.create(nombre=nombre, url=receptor.url, secreto="s3creto", **kwargs)
+
+    def _cambiar_rol(self, *roles):
+        for rol in roles:
+            self.client.patch("/api/users/profe/update/", {"rol": rol}, format="json")
+
+    def test_entrega_por_lotes_y_avanza_cursor(self):
+        """✅ Las vistas no llaman al receptor; el despachador entrega en lotes firmados y en orden"""
+        receptor = self._receptor()
+        suscriptor = self._suscribir(receptor)
+        self._cambiar_rol("superuser", "profesor", "superuser")
+        self.assertEqual(receptor.recibidos, [])
+
+        self.assertEqual(despachar(self.pool), {"entregados": 2, "fallidos": 0})
+        self.assertEqual(despachar(self.pool), {"entregados": 1, "fallidos": 0})
+        self.assertEqual(despachar(self.pool), {"entregados": 0, "fallidos": 0})
+
+        seqs = list(CambioUsuario.objects.order_by("seq").values_list("seq", flat=True))
+        self.assertEqual([c["seq"] for c in receptor.cambios(0) + receptor.cambios(1)], seqs)
+        headers, cuerpo = receptor.recibidos[0]
+        self.assertEqual(headers["X-Authservice-Firma"], firmar("s3creto", cuerpo))
+        self.assertEqual(headers["X-Authservice-Entrega"], f"reportes:{seqs[0]}-{seqs[1]}")
+        suscriptor.refresh_from_db()
+        self.assertEqual(suscriptor.ultimo_seq, seqs[-1])
+
+    def test_suscriptor_nuevo_empieza_por_lo_ultimo(self):
+        """✅ Sin cursor inicial solo se entregan los cambios posteriores a la suscripción"""
+        self._cambiar_rol("superuser")
+        receptor = self._receptor()
+        self._suscribir(receptor, ultimo_seq=None)
+        despachar(self.pool)
+        self.assertEqual(receptor.recibidos, [])
+        self._cambiar_rol("profesor")
+        despachar(self.pool)
+        self.assertEqual([c["datos"]["rol"] for c in receptor.cambios(0)], ["profesor"])
+
+    def test_reintenta_errores_transitorios(self):
+        """✅ Un 503 y un 429 se reintentan con backoff y el mismo identificador de entrega"""
+        receptor = self._receptor(respuestas=[503, 429])
+        self._suscribir(receptor)
+        self._cambiar_rol("superuser")
+        self.assertEqual(despachar(self.pool), {"entregados": 1, "fallidos": 0})
+        self.assertEqual(len(receptor.recibidos), 3)
+        self.assertEqual(len({headers["X-Authservice-Entrega"] for headers, _ in receptor.recibidos}), 1)
+
+    def test_reintentos_agotados_posponen_al_suscriptor(self):
+        """❌ Si los reintentos se agotan el cursor no avanza y el suscriptor se pospone"""
+        receptor = self._receptor(respuestas=[500] * 3)
+        suscriptor = self._suscribir(receptor)
+        self._cambiar_rol("superuser")
+        self.assertEqual(despachar(self.pool), {"entregados": 0, "fallidos": 1})
+        suscriptor.refresh_from_db()
+        self.assertEqual((suscriptor.ultimo_seq, suscriptor.fallos, suscriptor.ultimo_error), (0, 1, "HTTP 500"))
+        self.assertIsNotNone(suscriptor.proximo_intento)
+
+        SuscriptorWebhook.objects.filter(pk=suscriptor.pk).update(proximo_intento=None)
+        self.assertEqual(despachar(self.pool), {"entregados": 1, "fallidos": 0})
+        suscriptor.refresh_from_db()
+        self.assertEqual((suscriptor.fallos, suscriptor.proximo_intento), (0, None))
+
+    def test_error_del_cliente_no_se_reintenta(self):
+        """❌ Un 400 no se reintenta dentro del ciclo"""
+        receptor = self._receptor(respuestas=[400])
+        self._suscribir(receptor)
+        self._cambiar_rol("superuser")
+        self.assertEqual(despachar(self.pool)["fallidos"], 1)
+        self.assertEqual(len(receptor.recibidos), 1)
+
+    def test_suscriptores_en_paralelo(self):
+        """✅ Un receptor lento no retrasa a los demás: las entregas son concurrentes"""
+        receptores = [self._receptor(demora=0.5) for _ in range(2)]
+        for i, receptor in enumerate(receptores):
+            self._suscribir(receptor, nombre=f"lento{i}")
+        self._cambiar_rol("superuser")
+        inicio = time.perf_counter()
+        self.assertEqual(despachar(self.pool), {"entregados": 2, "fallidos": 0})
+        self.assertLess(time.perf_counter() - inicio, 0.9)
+
+    def test_suscriptor_lento_no_frena_ciclos(self):
+        """✅ Con un lote en curso el suscriptor se omite y los demás siguen recibiendo en cada ciclo"""
+        lento, rapido = self._receptor(demora=1.0), self._receptor()
+        self._suscribir(lento, nombre="lento")
+        self._suscribir(rapido, nombre="rapido")
+        despachador = Despachador(self.pool)
+
+        inicio = time.perf_counter()
+        self._cambiar_rol("superuser")
+        self.assertEqual(despachador.ciclo(timeout=0.5), {"entregados": 1, "fallidos": 0})
+        self._cambiar_rol("profesor")
+        self.assertEqual(despachador.ciclo(timeout=0.5), {"entregados": 1, "fallidos": 0})
+        self.assertLess(time.perf_counter() - inicio, 0.9)
+        self.assertEqual(len(rapido.recibidos), 2)
+        self.assertEqual(len(lento.recibidos), 1)
+
+        # El lote en curso se registra al terminar; el siguiente lleva el resto.
+        self.assertEqual(despachador.esperar(), {"entregados": 1, "fallidos": 0})
+        self.assertEqual(despachador.ciclo(todos=True), {"entregados": 1, "fallidos": 0})
+        self.assertEqual([c["datos"]["rol"] for c in lento.cambios(1)], ["profesor"])
+
+    def test_comando_una_vez(self):
+        """✅ despachar_webhooks --una-vez ejecuta un ciclo"""
+        receptor = self._receptor()
+        self._suscribir(receptor)
+        self._cambiar_rol("superuser")
+        salida = StringIO()
+        call_command("despachar_webhooks", una_vez=True, stdout=salida)
+        self.assertEqual(len(receptor.recibidos), 1)
+        self.assertIn("Cambios entregados: 1", salida.getvalue())
@@ -0,0 +1,147 @@
+"""
+Tokens JWT firmados (RS256) para que otros microservicios validen el acceso
+localmente con la clave pública publicada en el JWKS, sin consultar la base
+de datos de este servicio.
+"""
+import logging
+from functools import lru_cache
+
+import jwt
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from jwt.algorithms import RSAAlgorithm
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+logger = logging.getLogger(__name__)
+
+JWT_ALGORITHM = 'RS256'
+
+
+@lru_cache(maxsize=1)
+def signing_keys() -> tuple[str, str]:
+    """
+    Retorna el par (clave privada, clave pública) en formato PEM.
+
+    Si no se configuró JWT_PRIVATE_KEY se genera un par efímero por proceso,
+    solo con DEBUG: con varios workers o réplicas cada proceso firmaría con
+    una clave distinta y rechazaría los tokens de los demás. Fuera de DEBUG
+    lanza ImproperlyConfigured.
+    """
+    private_pem = settings.JWT_PRIVATE_KEY
+    public_pem = settings.JWT_PUBLIC_KEY
+
+    if not private_pem:
+        if not settings.DEBUG:
+            raise ImproperlyConfigured(
+                'JWT_ENABLED requiere JWT_PRIVATE_KEY fuera de DEBUG: una clave efímera '
+                'por proceso no valida los tokens firmados por los demás.'
+            )
+        from cryptography.hazmat.primitives.asymmetric import rsa
+        from cryptography.hazmat.primitives import serialization
+
+        logger.warning('JWT_PRIVATE_KEY no configurada: se usa una clave efímera.')
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        private_pem = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        ).decode()
+        public_pem = key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo
+        ).decode()
+    elif not public_pem:
+        from cryptography.hazmat.primitives import serialization
+
+        key = serialization.load_pem_private_key(private_pem.encode(), password=None)
+        public_pem = key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo
+        ).decode()
+
+    return private_pem, public_pem
+
+
+class UsuarioTokenBackend(TokenBackend):
+    """
+    Igual que el backend de simplejwt, pero incluye el 'kid' en la cabecera
+    para que los clientes JWKS seleccionen la clave correcta.
+    """
+    def encode(self, payload: dict) -> str:
+        jwt_payload = payload.copy()
+        if self.audience is not None:
+            jwt_payload['aud'] = self.audience
+        if self.issuer is not None:
+            jwt_payload['iss'] = self.issuer
+
+        return jwt.encode(
+            jwt_payload,
+            self.prepared_signing_key,
+            algorithm=self.algorithm,
+            headers={'kid': settings.JWT_KEY_ID},
+            json_encoder=self.json_encoder,
+        )
+
+
+@lru_cache(maxsize=1)
+def token_backend() -> TokenBackend:
+    private_pem, public_pem = signing_keys()
+    return UsuarioTokenBackend(
+        JWT_ALGORITHM,
+        signing_key=private_pem,
+        verifying_key=public_pem,
+        issuer=settings.SIMPLE_JWT.get('ISSUER'),
+        leeway=settings.SIMPLE_JWT.get('LEEWAY', 0),
+    )
+
+
+def jwks() -> dict:
+    """
+    Documento JWKS con la clave pública de verificación.
+    """
+    _, public_pem = signing_keys()
+    jwk = RSAAlgorithm.to_jwk(RSAAlgorithm(RSAAlgorithm.SHA256).prepare_key(public_pem), as_dict=True)
+    jwk.update({'kid': settings.JWT_KEY_ID, 'use': 'sig', 'alg': JWT_ALGORITHM})
+    return {'keys': [jwk]}
+
+
+class UsuarioAccessToken(AccessToken):
+    @property
+    def token_backend(self) -> TokenBackend:
+        return token_backend()
+
+
+class UsuarioRefreshToken(RefreshToken):
+    access_token_class = UsuarioAccessToken
+
+    @property
+    def token_backend(self) -> TokenBackend:
+        return token_backend()
+
+    @classmethod
+    def for_user(cls, user):
+        """
+        Agrega nombre_usuario y rol a los claims; el access token los hereda.
+        """
+        token = super().for_user(user)
+        token['id'] = user.id
+        token['nombre_usuario'] = user.nombre_usuario
+        token['rol'] = user.rol
+        return token
+
+
+class UsuarioTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = UsuarioRefreshToken
+
+
+def emitir_tokens_jwt(user) -> dict:
+    """
+    Emite el par access/refresh para el usuario autenticado.
+    """
+    refresh = UsuarioRefreshToken.for_user(user)
+    return {
+        'access': str(refresh.access_token),
+        'refresh': str(refresh),
+    }
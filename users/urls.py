@@ -1,13 +1,24 @@
 from django.urls import path
-from .views import HealthView, RegistroUsuarioView, LoginUsuarioView, TestDarklyView, UsuarioAllView, UsuarioDeleteView, UsuarioDetailView, UsuarioUpdateView
+from .views import CambioEstadoMasivoView, CambiosUsuariosView, ConsultaMasivaUsuariosView, ExportacionUsuariosView, HealthView, IntrospeccionTokensView, JWKSView, RegistroMasivoView, RegistroUsuarioView, LoginUsuarioView, MetricsView, ReadyView, TestDarklyView, TokenRefreshView, UsuarioAllView, UsuarioDeleteView, UsuarioDetailView, UsuarioUpdateView
 
 urlpatterns = [
     path('register/', RegistroUsuarioView.as_view(), name='registro-usuario'),
+    path('register/bulk/', RegistroMasivoView.as_view(), name='registro-masivo'),
     path('login/', LoginUsuarioView.as_view(), name='login-usuario'),
+    path('token/refresh/', TokenRefreshView.as_view(), name='token-refresh'),
+    path('introspect/', IntrospeccionTokensView.as_view(), name='token-introspeccion'),
+    path('.well-known/jwks.json', JWKSView.as_view(), name='jwks'),
     path('users/', UsuarioAllView.as_view(), name='usuarios'),
+    # Antes del detalle: 'export', 'batch', 'bulk-status' y 'changes' también serían nombres de usuario válidos.
+    path('users/export/', ExportacionUsuariosView.as_view(), name='usuarios-exportar'),
+    path('users/batch/', ConsultaMasivaUsuariosView.as_view(), name='usuarios-consulta-masiva'),
+    path('users/bulk-status/', CambioEstadoMasivoView.as_view(), name='usuarios-estado-masivo'),
+    path('users/changes/', CambiosUsuariosView.as_view(), name='usuarios-cambios'),
     path('users/<str:nombre_usuario>/', UsuarioDetailView.as_view(), name='usuario-detalle'),
     path('users/<str:nombre_usuario>/update/', UsuarioUpdateView.as_view(), name='usuario-actualizar'),
     path('users/<str:nombre_usuario>/delete/', UsuarioDeleteView.as_view(), name='usuario-eliminar'),
     path('ld-test/', TestDarklyView.as_view(), name='launchdarkly-test'),
     path('health/', HealthView.as_view(), name='health'),
+    path('ready/', ReadyView.as_view(), name='ready'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
 ]
@@ -1,2 +1,3 @@
 from .format_serializer import format_serializer_errors
-from .responses import error_response, success_response, pagination_response
\ No newline at end of file
+from .responses import error_response, success_response, pagination_response, rate_limited_response, service_busy_response, feature_disabled_response
+from .condicional import agregar_validadores, calcular_etag, etag_version, no_modificado, versiones_if_match
@@ -0,0 +1,74 @@
+"""
+Lecturas condicionales (ETag / Last-Modified).
+
+El validador se calcula antes de serializar. Si el cliente ya tiene esa
+versión (If-None-Match / If-Modified-Since) se responde 304 sin cuerpo.
+
+Las ETag de `etag_version` llevan la versión de la fila como prefijo, para
+que el PATCH pueda condicionar el UPDATE con If-Match.
+
+La misma URL se negocia en JSON o MessagePack (Accept): las vistas incluyen
+`request.accepted_media_type` en el hash y las respuestas llevan
+`Vary: Accept`, para que ni el cliente ni una caché intermedia confundan
+una representación con la otra.
+"""
+import hashlib
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, parse_etags
+
+
+def calcular_etag(*partes) -> str:
+    """
+    ETag fuerte a partir de los valores que determinan la representación.
+    """
+    return '"%s"' % hashlib.blake2b(repr(partes).encode(), digest_size=16).hexdigest()
+
+
+def etag_version(version: int, *partes) -> str:
+    """
+    ETag fuerte "<version>-<hash>": el hash distingue la representación
+    (p. ej. `?fields=`) y el prefijo es la versión de la fila.
+    """
+    return '"%d-%s"' % (version, hashlib.blake2b(repr(partes).encode(), digest_size=8).hexdigest())
+
+
+def versiones_if_match(request) -> set[int] | None:
+    """
+    Versiones aceptadas por If-Match, o None si no se envió (o es `*`).
+
+    Las ETag débiles o ajenas no aportan versión: si ninguna sirve el
+    conjunto queda vacío y la precondición falla.
+    """
+    valor = request.META.get('HTTP_IF_MATCH')
+    if not valor:
+        return None
+    etags = parse_etags(valor)
+    if etags == ['*']:
+        return None
+    versiones = set()
+    for etag in etags:
+        prefijo = etag.strip('"').split('-', 1)[0]
+        if etag.startswith('"') and prefijo.isdigit():
+            versiones.add(int(prefijo))
+    return versiones
+
+
+def no_modificado(request, etag: str, ultima_modificacion=None):
+    """
+    Retorna la respuesta 304 (con los mismos validadores) si el cliente tiene
+    la versión vigente, o None si hay que responder normalmente.
+    """
+    base = agregar_validadores(HttpResponse(), etag, ultima_modificacion)
+    timestamp = int(ultima_modificacion.timestamp()) if ultima_modificacion else None
+    respuesta = get_conditional_response(request, etag=etag, last_modified=timestamp, response=base)
+    return None if respuesta is base else respuesta
+
+
+def agregar_validadores(response, etag: str, ultima_modificacion=None):
+    response['ETag'] = etag
+    patch_vary_headers(response, ('Accept',))
+    if ultima_modificacion:
+        response['Last-Modified'] = http_date(ultima_modificacion.timestamp())
+    return response
@@ -0,0 +1,39 @@
+import threading
+from collections import defaultdict
+
+
+class Metricas:
+    """
+    Contadores y medidores en memoria del proceso, expuestos en /api/metrics/.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._contadores = defaultdict(int)
+        self._medidores = {}
+
+    def incrementar(self, nombre: str, valor: int = 1) -> None:
+        with self._lock:
+            self._contadores[nombre] += valor
+
+    def medir(self, nombre: str, valor: float) -> None:
+        with self._lock:
+            self._medidores[nombre] = valor
+
+    def valor(self, nombre: str) -> float:
+        with self._lock:
+            if nombre in self._medidores:
+                return self._medidores[nombre]
+            return self._contadores.get(nombre, 0)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {**self._contadores, **self._medidores}
+
+    def reiniciar(self) -> None:
+        with self._lock:
+            self._contadores.clear()
+            self._medidores.clear()
+
+
+metricas = Metricas()
@@ -21,20 +21,35 @@ def error_response(message: str, data: Any, status) -> Response:
         status=status
     )
 
+def service_busy_response(message: str, retry_after: int) -> Response:
+    response = error_response(message=message, data=None, status=503)
+    response["Retry-After"] = str(retry_after)
+    return response
+
+def feature_disabled_response(message: str) -> Response:
+    return error_response(message=message, data=None, status=503)
+
+def rate_limited_response(message: str, retry_after: int) -> Response:
+    response = error_response(message=message, data=None, status=429)
+    response["Retry-After"] = str(retry_after)
+    return response
+
 def pagination_response(
         data: Any,
         page: int,
         offset: int,
         pages: int,
         total_items: int,
-        status) -> Response:
-    return Response(
-        {
-            "count": total_items,
-            "page": page,
-            "offset": offset,
-            "pages": pages,
-            "results": data
-        },
-        status=status
-    )
\ No newline at end of file
+        status,
+        cursor: dict | None = None) -> Response:
+    body = {
+        "count": total_items,
+        "page": page,
+        "offset": offset,
+        "pages": pages,
+        "results": data
+    }
+    if cursor is not None:
+        # Modo keyset: {"next": ..., "prev": ...}; page y pages no aplican.
+        body["cursor"] = cursor
+    return Response(body, status=status)
\ No newline at end of file
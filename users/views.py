@@ -1,17 +1,50 @@
+import hmac
 from decouple import config
+from itertools import islice
 from math import ceil
+from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.http import Http404
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from ldclient import Context
-from authservice.launchdarkly import ld_client
+from adrf.views import APIView as AsyncAPIView
+from feature_flags.flags import ENABLE_LOGIN, ENABLE_USER_DELETE, ENABLE_USER_DETAIL, ENABLE_USER_LIST, ENABLE_USER_REGISTRATION, ENABLE_USER_UPDATE
+from feature_flags.ld_client import cliente_listo, obtener_cliente
+from feature_flags.middleware import flag_activo
 from rest_framework.views import APIView
-from rest_framework import status, permissions
+from rest_framework import serializers, status, permissions
 from rest_framework.authtoken.models import Token
-from django.db import IntegrityError
-from .serializers import ActualizarUsuarioSerializer, RegistroUsuarioSerializer, LoginUsuarioSerializer
-from .models import Usuario
-from .utils import error_response, success_response, pagination_response, format_serializer_errors
+from rest_framework.exceptions import AuthenticationFailed, ParseError, UnsupportedMediaType
+from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import TokenError
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from .serializers import ActualizarUsuarioSerializer, CambioEstadoMasivoSerializer, ConsultaMasivaSerializer, IntrospeccionTokensSerializer, RegistroUsuarioSerializer, LoginUsuarioSerializer
+from .authentication import emitir_token, estadisticas, invalidar_usuario, invalidar_usuarios, token_expirado
+from .cambios import ParametroInvalido, aultimo_seq, leer_cambios, registrar_cambios
+from .cache_usuarios import aobtener_detalle, estadisticas as estadisticas_detalle, invalidar_detalle
+from .exportacion import CONTENT_TYPES, FORMATOS as FORMATOS_EXPORTACION, exportar, exportar_async, nombre_archivo
+from .lectura import CAMPOS, CampoInvalido, campos_solicitados, leer, proyectar
+from .importacion import FORMATOS, filas_json, importar_usuarios, leer_filas
+from .hashers import HashingSaturado, estadisticas as estadisticas_hashing
+from .models import Usuario, VersionObsoleta
+from .filtros import FiltroInvalido, filtrar_usuarios
+from .paginacion import MODOS_TOTAL, CursorInvalido, acontar, apaginar_por_cursor
+from .ratelimit import (
+    estadisticas as estadisticas_ratelimit, limpiar_fallos_login, login_bloqueado,
+    registrar_fallo_login, verificar_limite
+)
+from .tokens import UsuarioTokenRefreshSerializer, emitir_tokens_jwt, jwks
+from .utils import agregar_validadores, calcular_etag, etag_version, no_modificado, versiones_if_match, error_response, success_response, pagination_response, rate_limited_response, service_busy_response, feature_disabled_response, format_serializer_errors
+
+FUNCIONALIDAD_DESHABILITADA = 'Funcionalidad deshabilitada temporalmente.'
+
+
+def _nombre_usuario(request):
+    data = request.data
+    return data.get('nombre_usuario') if hasattr(data, 'get') else None
+
 
 class EsSuperUsuario(permissions.BasePermission):
     """Permiso: solo los superusuarios pueden acceder"""
@@ -19,6 +52,16 @@ class EsSuperUsuario(permissions.BasePermission):
         return request.user and request.user.is_authenticated and request.user.is_superuser
 
 
+class EsServicioInterno(permissions.BasePermission):
+    """Permiso: solo servicios con la clave compartida (header X-Authservice-Clave)"""
+    message = 'Se requiere la credencial de servicio.'
+
+    def has_permission(self, request, view):
+        clave = settings.INTROSPECCION_CLAVE
+        recibida = request.headers.get('X-Authservice-Clave', '')
+        return bool(clave) and hmac.compare_digest(recibida.encode(), clave.encode())
+
+
 class RegistroUsuarioView(APIView):
     """
     Solo los superusuarios pueden registrar nuevos usuarios (profesores o superusuarios).
@@ -27,6 +70,12 @@ class RegistroUsuarioView(APIView):
 
     def post(self, request):
         try:
+            if not flag_activo(request, ENABLE_USER_REGISTRATION):
+                return feature_disabled_response(FUNCIONALIDAD_DESHABILITADA)
+            permitido, espera = verificar_limite('register', request, _nombre_usuario(request))
+            if not permitido:
+                return rate_limited_response('Demasiadas solicitudes, intente más tarde.', espera)
+
             serializer = RegistroUsuarioSerializer(data=request.data)
             if not serializer.is_valid():
                 return error_response(
@@ -34,8 +83,13 @@ class RegistroUsuarioView(APIView):
                     message='Error de validación.',
                     status=status.HTTP_400_BAD_REQUEST
                 ) 
-            user = serializer.save() 
-            token, _ = Token.objects.get_or_create(user=user)
+            # Sin consultas previas de unicidad: un duplicado llega como
+            # IntegrityError y el serializer lo traduce al error del campo.
+            with transaction.atomic():
+                user = serializer.save()
+                Token.objects.create(user=user)
+                registrar_cambios('create', [user.id])
+            invalidar_detalle(user.nombre_usuario)
             return success_response(
                 message='Usuario creado exitosamente',
                 data={
@@ -46,6 +100,12 @@ class RegistroUsuarioView(APIView):
                 },
                 status=status.HTTP_201_CREATED
             )
+        except serializers.ValidationError as e:
+            return error_response(
+                data=format_serializer_errors(e.detail),
+                message='Error de validación.',
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except IntegrityError:
             return error_response(
                 data=None,
@@ -58,6 +118,8 @@ class RegistroUsuarioView(APIView):
                 message=str(e),
                 status=status.HTTP_400_BAD_REQUEST
             )
+        except HashingSaturado as e:
+            return service_busy_response(str(e), e.retry_after)
         except Exception as e:
             return error_response(
                 data=None,
@@ -66,30 +128,349 @@ class RegistroUsuarioView(APIView):
             )
 
 
-class UsuarioDetailView(APIView):
+class RegistroMasivoView(APIView):
+    """
+    Registra muchos usuarios en una sola petición.
+
+    Acepta JSON (lista o {"usuarios": [...]}), NDJSON (application/x-ndjson)
+    o CSV (text/csv); el formato se toma de ?formato= o del Content-Type.
+    Retorna un reporte por fila.
+    """
+    # permission_classes = [permissions.IsAuthenticated, EsSuperUsuario]
+
+    def post(self, request):
+        try:
+            if not flag_activo(request, ENABLE_USER_REGISTRATION):
+                return feature_disabled_response(FUNCIONALIDAD_DESHABILITADA)
+            formato = request.query_params.get('formato') or self._formato(request.content_type)
+            if formato not in FORMATOS:
+                return error_response(
+                    data=None,
+                    message=f"Formato no soportado. Use uno de: {', '.join(FORMATOS)}.",
+                    status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+                )
+
+            max_filas = settings.BULK_IMPORT_MAX_FILAS
+            if formato == 'json':
+                filas = filas_json(request.data)
+            else:
+                filas = leer_filas(request.stream, formato) if request.stream else []
+            filas = list(islice(filas, max_filas + 1))
+            if not filas:
+                return error_response(
+                    data=None,
+                    message='No se recibieron usuarios.',
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if len(filas) > max_filas:
+                return error_response(
+                    data=None,
+                    message=f'Se permiten como máximo {max_filas} usuarios por petición.',
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            reporte = importar_usuarios(filas, tamanio_lote=max_filas)
+            return success_response(
+                message=f"{reporte['creados']} de {reporte['total']} usuarios creados",
+                data=reporte,
+                status=status.HTTP_201_CREATED if reporte['creados'] else status.HTTP_400_BAD_REQUEST
+            )
+        except UnsupportedMediaType as e:
+            return error_response(
+                data=None,
+                message=str(e.detail),
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+            )
+        except (ValueError, ParseError) as e:
+            return error_response(
+                data=None,
+                message=str(e),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception:
+            return error_response(
+                data=None,
+                message='Error interno del servidor',
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    def _formato(self, content_type):
+        content_type = (content_type or '').split(';')[0].strip()
+        return {
+            'application/json': 'json',
+            'application/x-ndjson': 'ndjson',
+            'application/ndjson': 'ndjson',
+            'text/csv': 'csv',
+        }.get(content_type)
+
+
+class ExportacionUsuariosView(APIView):
+    """
+    Exporta todos los usuarios en una sola respuesta en streaming.
+
+    Formato con ?formato=ndjson|csv (o el header Accept); default NDJSON.
+    Acepta los mismos filtros que el listado (?rol=, ?is_active=, ?search=).
+    """
+    # permission_classes = [permissions.IsAuthenticated, EsSuperUsuario]
+
+    def get(self, request):
+        try:
+            if not flag_activo(request, ENABLE_USER_LIST):
+                return feature_disabled_response(FUNCIONALIDAD_DESHABILITADA)
+            formato = request.query_params.get('formato') or self._formato(request.headers.get('Accept'))
+            if formato not in FORMATOS_EXPORTACION:
+                return error_response(
+                    data=None,
+                    message=f"Formato no soportado. Use uno de: {', '.join(FORMATOS_EXPORTACION)}.",
+                    status=status.HTTP_406_NOT_ACCEPTABLE
+                )
+            usuarios = filtrar_usuarios(Usuario.objects.all(), request.query_params)
+
+            # Bajo ASGI el iterador debe ser async para no cargar todo en memoria.
+            generar = exportar_async if isinstance(request._request, ASGIRequest) else exportar
+            response = StreamingHttpResponse(
+                generar(usuarios, formato, settings.EXPORTACION_CHUNK_SIZE),
+                content_type=CONTENT_TYPES[formato]
+            )
+            response['Content-Disposition'] = f'attachment; filename="{nombre_archivo(formato)}"'
+            return response
+        except FiltroInvalido as e:
+            return error_response(
+                data=None,
+                message=str(e),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception:
+            return error_response(
+                data=None,
+                message='Error interno del servidor',
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    def perform_content_negotiation(self, request, force=False):
+        # Accept: text/csv o application/x-ndjson eligen el formato de la
+        # exportación; no deben rechazarse con 406 por no tener renderer DRF.
+        return super().perform_content_negotiation(request, force=True)
+
+    def _formato(self, accept):
+        for tipo in (accept or '').split(','):
+            formato = {
+                'application/x-ndjson': 'ndjson',
+                'application/ndjson': 'ndjson',
+                'text/csv': 'csv',
+            }.get(tipo.split(';')[0].strip())
+            if formato:
+                return formato
+        return 'ndjson'
+
+
+class ConsultaMasivaUsuariosView(AsyncAPIView):
+    """
+    Resuelve muchos usuarios por id o nombre_usuario con una sola consulta.
+
+    Body: {"ids": [1, 2], "nombres_usuario": ["profe"]} (máximo
+    BATCH_MAX_USUARIOS en total). Retorna un mapa por identificador pedido;
+    los no encontrados aparecen con valor null.
+    """
+    # permission_classes = [permissions.IsAuthenticated, EsSuperUsuario]
+
+    async def post(self, request):
+        try:
+            if not flag_activo(request, ENABLE_USER_DETAIL):
+                return feature_disabled_response(FUNCIONALIDAD_DESHABILITADA)
+            serializer = ConsultaMasivaSerializer(
+                data=request.data, context={'maximo': settings.BATCH_MAX_USUARIOS}
+            )
+            if not serializer.is_valid():
+                return error_response(
+                    data=format_serializer_errors(serializer.errors),
+                    message='Error de validación.',
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            ids = serializer.validated_data.get('ids', [])
+            nombres = serializer.validated_data.get('nombres_usuario', [])
+            campos = campos_solicitados(request.query_params)
+
+            filas = leer(
+                Usuario.objects.filter(Q(id__in=set(ids)) | Q(nombre_usuario__in=set(nombres))),
+                tuple(dict.fromkeys(campos + ('id', 'nombre_usuario')))
+            )
+            por_id, por_nombre = {}, {}
+            async for fila in filas:
+                usuario = {campo: fila[campo] for campo in campos}
+                por_id[fila['id']] = usuario
+                por_nombre[fila['nombre_usuario']] = usuario
+
+            return success_response(
+                data={
+                    'ids': {str(i): por_id.get(i) for i in ids},
+                    'nombres_usuario': {nombre: por_nombre.get(nombre) for nombre in nombres},
+                },
+                message=f'{len(por_id)} usuarios encontrados',
+                status=status.HTTP_200_OK
+            )
+        except CampoInvalido as e:
+            return error_response(data=None, message=str(e), status=status.HTTP_400_BAD_REQUEST)
+        except Exception:
+            return error_response(
+                data=None,
+                message='Error interno del servidor',
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class CambioEstadoMasivoView(APIView):
+    """
+    Activa o desactiva muchos usuarios a la vez.
+
+    Body: {"ids": [...], "nombres_usuario": [...], "is_active": false}
+    (máximo BATCH_MAX_USUARIOS identificadores). En una sola transacción se
+    bloquean las filas, se cambia `is_active` con un único UPDATE y, al
+    desactivar, se eliminan los tokens de esos usuarios. Reporta los que ya
+    estaban en el estado pedido y los identificadores no encontrados.
+    """
+    # permission_classes = [permissions.IsAuthenticated, EsSuperUsuario]
+
+    def post(self, request):
+        try:
+            serializer = CambioEstadoMasivoSerializer(
+                data=request.data, context={'maximo': settings.BATCH_MAX_USUARIOS}
+            )
+            if not serializer.is_valid():
+                return error_response(
+                    data=format_serializer_errors(serializer.errors),
+                    message='Error de validación.',
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            ids = serializer.validated_data.get('ids', [])
+            nombres = serializer.validated_data.get('nombres_usuario', [])
+            is_active = serializer.validated_data['is_active']
+            # Mismo flag que la operación individual: desactivar es la baja y
+            # reactivar, una actualización.
+            if not flag_activo(request, ENABLE_USER_UPDATE if is_active else ENABLE_USER_DELETE):
+                return feature_disabled_response(FUNCIONALIDAD_DESHABILITADA)
+
+            with transaction.atomic():
+                # FOR UPDATE solo sobre usuarios (el token está del lado
+                # opcional del LEFT JOIN) y en orden de id, para que dos
+                # cambios masivos concurrentes no se bloqueen mutuamente.
+                filas = list(
+                    Usuario.objects.filter(Q(id__in=set(ids)) | Q(nombre_usuario__in=set(nombres)))
+                    .order_by('id')
+                    .select_for_update(of=('self',))
+                    .values('id', 'nombre_usuario', 'is_active', 'auth_token__key')
+                )
+                cambiar = [fila for fila in filas if fila['is_active'] != is_active]
+                ids_cambiar = [fila['id'] for fila in cambiar]
+                tokens = [fila['auth_token__key'] for fila in cambiar if fila['auth_token__key']]
+                if ids_cambiar:
+                    Usuario.objects.filter(id__in=ids_cambiar).update(
+                        is_active=is_active, updated_at=timezone.now(), version=F('version') + 1
+                    )
+                    if not is_active and tokens:
+                        Token.objects.filter(key__in=tokens).delete()
+                    registrar_cambios('activate' if is_active else 'deactivate', ids_cambiar)
+                    invalidar_usuarios(ids_cambiar, tokens)
+                    invalidar_detalle(*(fila['nombre_usuario'] for fila in cambiar))
+
+            encontrados_id = {fila['id'] for fila in filas}
+            encontrados_nombre = {fila['nombre_usuario'] for fila in filas}
+            return success_response(
+                data={
+                    'actualizados': [fila['nombre_usuario'] for fila in cambiar],
+                    'sin_cambios': [fila['nombre_usuario'] for fila in filas if fila['is_active'] == is_active],
+                    'no_encontrados': {
+                        'ids': [i for i in ids if i not in encontrados_id],
+                        'nombres_usuario': [nombre for nombre in nombres if nombre not in encontrados_nombre],
+                    },
+                    'tokens_revocados': 0 if is_active else len(tokens),
+                },
+                message=f'{len(cambiar)} usuarios {"activados" if is_active else "desactivados"}',
+                status=status.HTTP_200_OK
+            )
+        except Exception:
+            return error_response(
+                data=None,
+                message='Error interno del servidor',
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class CambiosUsuariosView(APIView):
+    """
+    Feed incremental de cambios de usuarios (outbox, ver users/cambios.py).
+
+    Parámetros:
+        ?since=<seq> (default 0): retorna los cambios posteriores.
+        ?limit=<n> (default 500, máximo 5000).
+
+    El consumidor guarda `siguiente` y lo envía como `since` en la próxima
+    lectura; mientras `hay_mas` sea true puede seguir leyendo de inmediato.
+    """
+    # permission_classes = [permissions.IsAuthenticated, EsSuperUsuario]
+
+    def get(self, request):
+        try:
+            pagina = leer_cambios(request.query_params)
+            return success_response(
+                data=pagina,
+                message=f"{len(pagina['cambios'])} cambios",
+                status=status.HTTP_200_OK
+            )
+        except ParametroInvalido as e:
+            return error_response(data=None, message=str(e), status=status.HTTP_400_BAD_REQUEST)
+        except Exception:
+            return error_response(
+                data=None,
+                message='Error interno del servidor',
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class UsuarioDetailView(AsyncAPIView):
     """
     Solo los superusuarios pueden acceder a los detalles de un usuario.
     """
     # permission_classes = [permissions.IsAuthenticated, EsSuperUsuario]
 
-    def get_object(self, nombre_usuario):
+    async def get_object(self, nombre_usuario):
         """
-        Retorna el usuario correspondiente al nombre de usuario.
+        Retorna la fila del usuario desde la caché de detalle (ver
+        users/cache_usuarios.py) o la base de datos.
         """
-        return get_object_or_404(Usuario, nombre_usuario=nombre_usuario)
+        usuario = await aobtener_detalle(nombre_usuario)
+        if usuario is None:
+            raise Http404
+        return usuario
 
-    def get(self, request, nombre_usuario):
+    async def get(self, request, nombre_usuario):
         """
         Obtiene los detalles de un usuario por su nombre de usuario.
+
+        Responde 304 si If-None-Match / If-Modified-Since coinciden con la
+        versión vigente. El ETag sirve como If-Match del PATCH.
+
+        Parámetros:
+            ?fields=<campos separados por coma> (opcional)
         """
         try:
-            usuario = self.get_object(nombre_usuario)
-            serializer = RegistroUsuarioSerializer(usuario)
-            return success_response(
-                data=serializer.data,
+            if not flag_activo(request, ENABLE_USER_DETAIL):
+                return feature_disabled_response(FUNCIONALIDAD_DESHABILITADA)
+            campos = campos_solicitados(request.query_params)
+            fila = await self.get_object(nombre_usuario)
+            ultima_modificacion = fila['updated_at']
+            etag = etag_version(fila['version'], nombre_usuario, campos, request.accepted_media_type)
+            no_modificada = no_modificado(request, etag, ultima_modificacion)
+            if no_modificada is not None:
+                return no_modificada
+
+            return agregar_validadores(success_response(
+                data={campo: fila[campo] for campo in campos},
                 status=status.HTTP_200_OK,
                 message="Usuario encontrado"
-            )
+            ), etag, ultima_modificacion)
+        except CampoInvalido as e:
+            return error_response(status=status.HTTP_400_BAD_REQUEST, message=str(e), data=None)
         except Http404:
             return error_response(status=status.HTTP_404_NOT_FOUND, message="Usuario no encontrado", data=None)
         except Exception as e:
@@ -102,7 +483,8 @@ class UsuarioUpdateView(APIView):
     # permission_classes = [permissions.IsAuthenticated, EsSuperUsuario]
 
     def get_object(self, nombre_usuario):
-        return get_object_or_404(Usuario, nombre_usuario=nombre_usuario)
+        # El token viene en el mismo SELECT para invalidar la caché sin otra consulta.
+        return get_object_or_404(Usuario.objects.select_related('auth_token'), nombre_usuario=nombre_usuario)
 
     def patch(self, request, nombre_usuario):
         """
@@ -112,12 +494,20 @@ class UsuarioUpdateView(APIView):
         
         Parámetros:
             nombre_usuario (str): nombre de usuario del usuario a actualizar.
+            If-Match (header, opcional): ETag del detalle; si la versión ya
+                no es la vigente responde 412 sin escribir.
         
         Retorna:
-            Response: respuesta con los detalles del usuario actualizado.
+            Response: respuesta con los detalles del usuario actualizado y
+            el ETag de la nueva versión.
         """
         try:
+            if not flag_activo(request, ENABLE_USER_UPDATE):
+                return feature_disabled_response(FUNCIONALIDAD_DESHABILITADA)
             usuario = self.get_object(nombre_usuario)
+            versiones = versiones_if_match(request)
+            if versiones is not None and usuario.version not in versiones:
+                raise VersionObsoleta(f'If-Match no coincide con la versión {usuario.version}.')
             serializer = ActualizarUsuarioSerializer(usuario, data=request.data, partial=True)
             if not serializer.is_valid():
                 return error_response(
@@ -126,15 +516,33 @@ class UsuarioUpdateView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 ) 
             serializer.save()
-            return success_response(
+            invalidar_detalle(nombre_usuario, usuario.nombre_usuario)
+            token = getattr(usuario, 'auth_token', None)
+            invalidar_usuario(usuario.id, keys=[token.key] if token else [])
+            return agregar_validadores(success_response(
                 data=serializer.data,
                 message=f"Usuario {nombre_usuario} actualizado",
-                status=status.HTTP_200_OK)
+                status=status.HTTP_200_OK
+            ), etag_version(usuario.version, usuario.nombre_usuario, CAMPOS, request.accepted_media_type), usuario.updated_at)
+        except VersionObsoleta:
+            return error_response(
+                data=None,
+                message="El usuario fue modificado por otra petición. Consúltelo de nuevo y reintente.",
+                status=status.HTTP_412_PRECONDITION_FAILED
+            )
+        except serializers.ValidationError as e:
+            return error_response(
+                data=format_serializer_errors(e.detail),
+                message='Error de validación.',
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except Http404:
             return error_response(
                 message=f"Usuario {nombre_usuario} no encontrado",
                 data=None,
                 status=status.HTTP_404_NOT_FOUND)
+        except HashingSaturado as e:
+            return service_busy_response(str(e), e.retry_after)
         except Exception as e:
             return error_response(
                 data=None,
@@ -149,21 +557,42 @@ class UsuarioDeleteView(APIView):
     # permission_classes = [permissions.IsAuthenticated, EsSuperUsuario]
 
     def get_object(self, nombre_usuario):
-        return get_object_or_404(Usuario, nombre_usuario=nombre_usuario)
+        """
+        Solo las columnas necesarias (y el token, para invalidar la caché).
+        """
+        fila = Usuario.objects.filter(nombre_usuario=nombre_usuario).values(
+            'id', 'is_active', 'auth_token__key'
+        ).first()
+        if fila is None:
+            raise Http404
+        return fila
 
     def delete(self, request, nombre_usuario):
         try:
+            if not flag_activo(request, ENABLE_USER_DELETE):
+                return feature_disabled_response(FUNCIONALIDAD_DESHABILITADA)
             usuario = self.get_object(nombre_usuario)
 
-            if not usuario.is_active:
+            # El filtro por is_active hace que dos bajas concurrentes no
+            # reporten ambas éxito.
+            desactivados = 0
+            if usuario['is_active']:
+                with transaction.atomic():
+                    desactivados = Usuario.objects.filter(pk=usuario['id'], is_active=True).update(
+                        is_active=False, updated_at=timezone.now(), version=F('version') + 1
+                    )
+                    if desactivados:
+                        registrar_cambios('deactivate', [usuario['id']])
+            if not desactivados:
                 return error_response(
                     data=None,
                     message="El usuario ya está desactivado.",
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            usuario.is_active = False
-            usuario.save()
+            token = usuario['auth_token__key']
+            invalidar_usuario(usuario['id'], keys=[token] if token else [])
+            invalidar_detalle(nombre_usuario)
 
             return success_response(
                 message=f"Usuario {nombre_usuario} desactivado exitosamente",
@@ -184,29 +613,43 @@ class UsuarioDeleteView(APIView):
             )
 
        
-class UsuarioAllView(APIView):
+class UsuarioAllView(AsyncAPIView):
     """
     Solo los superusuarios pueden ver todos los usuarios.
     Permite paginar resultados con los parámetros:
     - ?page=<número de página>
     - ?offset=<cantidad de items por página>
+    - ?cursor=<cursor opaco> (modo keyset; vacío para la primera página)
+    - ?include_total=true|false|estimate
+    - ?rol=, ?is_active=, ?search= y ?search_mode=prefix|contains (ver users/filtros.py)
+    - ?fields=<campos separados por coma>
     """
     # permission_classes = [permissions.IsAuthenticated, EsSuperUsuario]
 
-    def get(self, request):
+    async def get(self, request):
         """
         Lista todos los usuarios con paginación.
 
         Parámetros:
             ?page=<número de página>
             ?offset=<cantidad de items por página>
+            ?cursor=<cursor de la respuesta anterior>
+            ?include_total=<true (default), false o estimate>
+            ?rol=<superuser|profesor>
+            ?is_active=<true|false>
+            ?search=<texto en nombre o correo>
+            ?search_mode=<prefix (default) o contains>
+            ?fields=<campos separados por coma>
 
         Retorna:
             Response: respuesta con los detalles de los usuarios y la paginación.
         """
         try:
+            if not flag_activo(request, ENABLE_USER_LIST):
+                return feature_disabled_response(FUNCIONALIDAD_DESHABILITADA)
             page = int(request.query_params.get('page', 1))
             offset = int(request.query_params.get('offset', 10))
+            include_total = request.query_params.get('include_total', 'true').lower()
 
             if page < 1 or offset < 1:
                 return error_response(
@@ -214,28 +657,53 @@ class UsuarioAllView(APIView):
                     message="Los parámetros 'page' y 'offset' deben ser mayores a 0.",
                     status=status.HTTP_400_BAD_REQUEST
                 )
+            if include_total not in MODOS_TOTAL:
+                return error_response(
+                    data=None,
+                    message=f"'include_total' debe ser uno de: {', '.join(MODOS_TOTAL)}.",
+                    status=status.HTTP_400_BAD_REQUEST
+                )
 
-            usuarios = Usuario.objects.all().order_by('id')
-
-            total_items = usuarios.count()
-            total_pages = ceil(total_items / offset)
-
-            start = (page - 1) * offset
-            end = start + offset
-
-            usuarios_paginados = usuarios[start:end]
-
-            # Serializar los datos
-            serializer = RegistroUsuarioSerializer(usuarios_paginados, many=True)
+            usuarios = filtrar_usuarios(Usuario.objects.all(), request.query_params).order_by('id')
+            campos = campos_solicitados(request.query_params)
+            cursor = None
+            # La página se lee con id y updated_at para el validador.
+            columnas = leer(usuarios, campos + ('updated_at',), con_id=True)
+            if 'cursor' in request.query_params:
+                filas, siguiente, anterior = await apaginar_por_cursor(columnas, request.query_params['cursor'], offset)
+                cursor = {'next': siguiente, 'prev': anterior}
+            else:
+                start = (page - 1) * offset
+                filas = [fila async for fila in columnas[start:start + offset]]
+
+            # Validador sin recorrer el conjunto filtrado: las filas de la
+            # página y el último seq del outbox, que cambia con cualquier
+            # escritura (también si una fila sale del filtro o de la página).
+            ultima = max((fila['updated_at'] for fila in filas), default=None)
+            etag = calcular_etag(
+                await aultimo_seq(), [(fila['id'], fila['updated_at']) for fila in filas],
+                sorted(request.query_params.lists()), request.accepted_media_type
+            )
+            no_modificada = no_modificado(request, etag, ultima)
+            if no_modificada is not None:
+                return no_modificada
 
-            return pagination_response(
-                page=page,
+            total_items = await acontar(usuarios, include_total)
+            return agregar_validadores(pagination_response(
+                page=None if cursor else page,
                 total_items=total_items,
-                data=serializer.data,
+                data=proyectar(filas, campos),
                 status=status.HTTP_200_OK,
                 offset=offset,
-                pages=total_pages)
+                pages=ceil(total_items / offset) if total_items is not None and not cursor else None,
+                cursor=cursor), etag, ultima)
 
+        except (CursorInvalido, FiltroInvalido, CampoInvalido) as e:
+            return error_response(
+                str(e),
+                None,
+                status.HTTP_400_BAD_REQUEST
+            )
         except ValueError:
             return error_response(
                 "Los parámetros 'page' y 'offset' deben ser enteros.",
@@ -256,25 +724,41 @@ class LoginUsuarioView(APIView):
     Devuelve el token y los datos del usuario.
     """
     def post(self, request):
-        try: 
+        try:
+            if not flag_activo(request, ENABLE_LOGIN):
+                return feature_disabled_response(FUNCIONALIDAD_DESHABILITADA)
+            nombre_usuario = _nombre_usuario(request)
+            permitido, espera = verificar_limite('login', request, nombre_usuario)
+            if not permitido:
+                return rate_limited_response('Demasiadas solicitudes, intente más tarde.', espera)
+            bloqueado, espera = login_bloqueado(request, nombre_usuario)
+            if bloqueado:
+                return rate_limited_response('Demasiados intentos fallidos, intente más tarde.', espera)
+
             serializer = LoginUsuarioSerializer(data=request.data, context={'request': request})
             if not serializer.is_valid():
+                if 'non_field_errors' in serializer.errors:
+                    registrar_fallo_login(request, nombre_usuario)
                 return error_response(
                     data=format_serializer_errors(serializer.errors),
                     message='Error de validación.',
                     status=status.HTTP_400_BAD_REQUEST
                 )
             user = serializer.validated_data
-            token, _ = Token.objects.get_or_create(user=user)
+            limpiar_fallos_login(request, nombre_usuario)
+            token = emitir_token(user)
+            data = {
+                'id': user.id, #type: ignore
+                'nombre_usuario': user.nombre_usuario, #type: ignore
+                'email_usuario': user.email_usuario, #type: ignore
+                'rol': user.rol, #type: ignore
+                'token': token.key
+            }
+            if settings.JWT_ENABLED:
+                data.update(emitir_tokens_jwt(user))
             return success_response(
                 message='Inicio de sesión exitoso',
-                data= {
-                    'id': user.id, #type: ignore
-                    'nombre_usuario': user.nombre_usuario, #type: ignore
-                    'email_usuario': user.email_usuario, #type: ignore
-                    'rol': user.rol, #type: ignore
-                    'token': token.key
-                },
+                data=data,
                 status=status.HTTP_200_OK
             )
         except Http404:
@@ -283,6 +767,8 @@ class LoginUsuarioView(APIView):
                 message='Usuario o contraseña incorrectos.',
                 status=status.HTTP_404_NOT_FOUND
             )
+        except HashingSaturado as e:
+            return service_busy_response(str(e), e.retry_after)
         except Exception as e:
             return error_response(
                 data=None,
@@ -290,6 +776,116 @@ class LoginUsuarioView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+class TokenRefreshView(APIView):
+    """
+    Intercambia un refresh token JWT por un nuevo access token.
+    """
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+
+    def post(self, request):
+        if not settings.JWT_ENABLED:
+            return error_response(
+                data=None,
+                message='Los tokens JWT no están habilitados.',
+                status=status.HTTP_404_NOT_FOUND
+            )
+        try:
+            serializer = UsuarioTokenRefreshSerializer(data=request.data)
+            if not serializer.is_valid():
+                return error_response(
+                    data=format_serializer_errors(serializer.errors),
+                    message='Error de validación.',
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            return success_response(
+                message='Token renovado',
+                data=serializer.validated_data,
+                status=status.HTTP_200_OK
+            )
+        except (TokenError, AuthenticationFailed, Usuario.DoesNotExist):
+            return error_response(
+                data=None,
+                message='Refresh token inválido o expirado.',
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+        except Exception:
+            return error_response(
+                data=None,
+                message='Error interno del servidor',
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class IntrospeccionTokensView(AsyncAPIView):
+    """
+    Verifica varios tokens opacos en una sola consulta (uso entre servicios).
+
+    Body: {"tokens": ["<key>", ...]} (máximo 100). Requiere la clave de
+    servicio en X-Authservice-Clave: revela si cada token es válido y el
+    id y rol de su usuario.
+    """
+    permission_classes = [EsServicioInterno]
+    authentication_classes = []
+
+    async def post(self, request):
+        try:
+            serializer = IntrospeccionTokensSerializer(data=request.data)
+            if not serializer.is_valid():
+                return error_response(
+                    data=format_serializer_errors(serializer.errors),
+                    message='Error de validación.',
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            keys = serializer.validated_data['tokens']
+            encontrados = {
+                fila['key']: fila
+                async for fila in Token.objects.filter(key__in=set(keys)).values(
+                    'key', 'created', 'user_id', 'user__rol', 'user__is_active'
+                )
+            }
+            resultados = []
+            for key in keys:
+                fila = encontrados.get(key)
+                resultados.append({
+                    'token': key,
+                    'active': bool(fila and fila['user__is_active'] and not token_expirado(fila['created'])),
+                    'id': fila['user_id'] if fila else None,
+                    'rol': fila['user__rol'] if fila else None,
+                })
+            return success_response(
+                data=resultados,
+                message='Tokens verificados',
+                status=status.HTTP_200_OK
+            )
+        except Exception:
+            return error_response(
+                data=None,
+                message='Error interno del servidor',
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class JWKSView(APIView):
+    """
+    Publica la clave pública (formato JWKS estándar, sin el sobre de respuesta)
+    para que otros microservicios validen los access tokens localmente.
+    """
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+
+    def get(self, request):
+        if not settings.JWT_ENABLED:
+            return error_response(
+                data=None,
+                message='Los tokens JWT no están habilitados.',
+                status=status.HTTP_404_NOT_FOUND
+            )
+        response = Response(jwks(), status=status.HTTP_200_OK)
+        response['Cache-Control'] = 'public, max-age=3600'
+        return response
+
+
 class TestDarklyView(APIView):
     """
     Vista de prueba para LaunchDarkly.
@@ -297,8 +893,10 @@ class TestDarklyView(APIView):
     permission_classes = [permissions.IsAuthenticated, EsSuperUsuario]
 
     def get(self, request):
+        from ldclient import Context
+
         try:
-            client = ld_client()
+            client = obtener_cliente()
             if not client.is_initialized():
                 print('SDK failed to initialize')
                 return error_response(
@@ -317,7 +915,7 @@ class TestDarklyView(APIView):
 
             # Tracking your memberId lets us know you are connected.
             ld_client_id = str(config('LDCLIENT_ID', cast=str, default=''))
-            ld_client().track(ld_client_id, context)
+            client.track(ld_client_id, context)
             print('SDK successfully initialized')
             return success_response(
                 data=None,
@@ -331,15 +929,51 @@ class TestDarklyView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-class HealthView(APIView):
+class MetricsView(APIView):
     """
-    Vista de salud para verificar que el servicio está funcionando.
+    Expone los contadores internos del proceso (cachés, colas, límites).
     """
     permission_classes = [permissions.AllowAny]
 
     def get(self, request):
+        return success_response(
+            data={
+                'token_cache': estadisticas(),
+                'user_cache': estadisticas_detalle(),
+                'hashing': estadisticas_hashing(),
+                'ratelimit': estadisticas_ratelimit(),
+            },
+            message="Métricas del servicio",
+            status=status.HTTP_200_OK
+        )
+
+
+class HealthView(AsyncAPIView):
+    """
+    Vista de salud para verificar que el servicio está funcionando.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    async def get(self, request):
         return success_response(
             data={"status": "ok"},
             message="Servicio funcionando correctamente",
             status=status.HTTP_200_OK
         )
+
+
+class ReadyView(AsyncAPIView):
+    """
+    Readiness: 503 mientras el cliente de LaunchDarkly se inicializa en
+    segundo plano (ver feature_flags/ld_client.py).
+    """
+    permission_classes = [permissions.AllowAny]
+
+    async def get(self, request):
+        if not cliente_listo():
+            return service_busy_response("Servicio iniciando", 1)
+        return success_response(
+            data={"status": "ready"},
+            message="Servicio listo para recibir tráfico",
+            status=status.HTTP_200_OK
+        )
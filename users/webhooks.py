@@ -0,0 +1,197 @@
+"""
+Entrega por webhook de los cambios de usuarios a los servicios suscritos.
+
+Las vistas no hacen llamadas HTTP: solo escriben el outbox (users/cambios.py)
+dentro de su transacción. El despachador (`python manage.py
+despachar_webhooks`, un proceso aparte) lee el outbox desde el cursor de cada
+suscriptor (`SuscriptorWebhook.ultimo_seq`) y le envía los cambios en lotes:
+
+- Un POST por suscriptor con hasta `WEBHOOKS['LOTE']` cambios en orden de
+  `seq`; los suscriptores se atienden en paralelo en un pool de hilos. Un
+  ciclo no espera a todas las entregas: el suscriptor con un lote en curso
+  se omite en los ciclos siguientes hasta que termine, y los demás siguen.
+- Errores de red, 5xx, 408 y 429 se reintentan con backoff exponencial con
+  jitter. Agotados los reintentos, el suscriptor se pospone
+  (`proximo_intento`) según sus `fallos` consecutivos sin frenar a los demás.
+- El cursor avanza solo con una respuesta 2xx: la entrega es al menos una
+  vez. `X-Authservice-Entrega` identifica el lote para descartar repeticiones.
+
+Los hilos del pool solo hacen HTTP; las consultas y el avance de cursores
+ocurren en el hilo del despachador.
+"""
+import hashlib
+import hmac
+import random
+import threading
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, wait
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .cambios import CAMPOS_CAMBIO, ultimo_seq
+from .models import CambioUsuario, SuscriptorWebhook
+from .renderers import ORJSONRenderer
+
+# 4xx que sí se reintentan; los demás no cambiarían al repetir el envío.
+REINTENTABLES = {408, 429}
+
+_local = threading.local()
+_renderer = ORJSONRenderer()
+
+
+def _config() -> dict:
+    return getattr(settings, 'WEBHOOKS', {})
+
+
+def firmar(secreto: str, cuerpo: bytes) -> str:
+    return 'sha256=' + hmac.new(secreto.encode(), cuerpo, hashlib.sha256).hexdigest()
+
+
+def espera(intento: int, config: dict | None = None) -> float:
+    """
+    Segundos antes del reintento número `intento` (desde 0).
+    """
+    config = _config() if config is None else config
+    tope = min(config.get('BACKOFF_MAXIMO', 300), config.get('BACKOFF', 0.5) * 2 ** intento)
+    return tope * random.uniform(0.5, 1)
+
+
+def _sesion() -> requests.Session:
+    # Una sesión por hilo: reutiliza conexiones y Session no es thread-safe.
+    if not hasattr(_local, 'sesion'):
+        _local.sesion = requests.Session()
+    return _local.sesion
+
+
+def entregar(url: str, secreto: str, cuerpo: bytes, entrega: str, config: dict) -> str | None:
+    """
+    Envía un lote con reintentos. Retorna None si el receptor respondió 2xx
+    o la descripción del último error.
+    """
+    headers = {'Content-Type': 'application/json', 'X-Authservice-Entrega': entrega}
+    if secreto:
+        headers['X-Authservice-Firma'] = firmar(secreto, cuerpo)
+
+    error = None
+    for intento in range(config.get('REINTENTOS', 3) + 1):
+        if intento:
+            time.sleep(espera(intento - 1, config))
+        try:
+            respuesta = _sesion().post(url, data=cuerpo, headers=headers, timeout=config.get('TIMEOUT', 5))
+        except requests.RequestException as e:
+            error = f'{type(e).__name__}: {e}'
+            continue
+        if 200 <= respuesta.status_code < 300:
+            return None
+        error = f'HTTP {respuesta.status_code}'
+        if respuesta.status_code < 500 and respuesta.status_code not in REINTENTABLES:
+            break
+    return error
+
+
+def _iniciar_cursores(suscriptores) -> None:
+    """
+    Los suscriptores nuevos (`ultimo_seq` None) empiezan por el último cambio.
+    """
+    nuevos = [suscriptor for suscriptor in suscriptores if suscriptor.ultimo_seq is None]
+    if not nuevos:
+        return
+    ultimo = ultimo_seq()
+    SuscriptorWebhook.objects.filter(pk__in=[s.pk for s in nuevos], ultimo_seq__isnull=True).update(ultimo_seq=ultimo)
+    for suscriptor in nuevos:
+        suscriptor.ultimo_seq = ultimo
+
+
+class Despachador:
+    """
+    Envía lotes en `pool` y recuerda los que siguen en curso entre ciclos.
+
+    Cada ciclo registra las entregas terminadas y envía un lote a cada
+    suscriptor activo, no pospuesto y sin un lote en curso. Así un receptor
+    lento (reintentos y timeouts) solo se retrasa a sí mismo.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        # pk del suscriptor -> (suscriptor, cambios, futuro)
+        self.en_curso = {}
+
+    def ciclo(self, timeout: float | None = None, todos: bool = False) -> dict:
+        """
+        Envía los lotes pendientes y espera hasta `timeout` segundos a que
+        termine alguna entrega (con `todos`, a que terminen todas).
+
+        Retorna {'entregados': cambios entregados, 'fallidos': suscriptores
+        con error} de las entregas terminadas en este ciclo.
+        """
+        config = _config()
+        self._enviar(config)
+        return self._registrar(config, ALL_COMPLETED if todos else FIRST_COMPLETED, timeout)
+
+    def esperar(self) -> dict:
+        """
+        Espera y registra las entregas en curso sin enviar lotes nuevos.
+        """
+        return self._registrar(_config(), ALL_COMPLETED, None)
+
+    def _enviar(self, config: dict) -> None:
+        suscriptores = list(
+            SuscriptorWebhook.objects.filter(activo=True)
+            .filter(Q(proximo_intento__isnull=True) | Q(proximo_intento__lte=timezone.now()))
+            .exclude(pk__in=list(self.en_curso))
+            .order_by('id')
+        )
+        _iniciar_cursores(suscriptores)
+
+        for suscriptor in suscriptores:
+            cambios = list(
+                CambioUsuario.objects.filter(seq__gt=suscriptor.ultimo_seq)
+                .order_by('seq').values(*CAMPOS_CAMBIO)[:config.get('LOTE', 100)]
+            )
+            if not cambios:
+                continue
+            cuerpo = _renderer.render({'suscriptor': suscriptor.nombre, 'cambios': cambios})
+            entrega = f"{suscriptor.nombre}:{cambios[0]['seq']}-{cambios[-1]['seq']}"
+            futuro = self.pool.submit(entregar, suscriptor.url, suscriptor.secreto, cuerpo, entrega, config)
+            self.en_curso[suscriptor.pk] = (suscriptor, cambios, futuro)
+
+    def _registrar(self, config: dict, return_when: str, timeout: float | None) -> dict:
+        resultado = {'entregados': 0, 'fallidos': 0}
+        if self.en_curso:
+            wait([futuro for _, _, futuro in self.en_curso.values()], timeout=timeout, return_when=return_when)
+
+        for pk, (suscriptor, cambios, futuro) in list(self.en_curso.items()):
+            if not futuro.done():
+                continue
+            del self.en_curso[pk]
+            error = futuro.result()
+            if error is None:
+                # Condicionado al cursor leído: otro despachador no lo hace retroceder.
+                SuscriptorWebhook.objects.filter(pk=suscriptor.pk, ultimo_seq=suscriptor.ultimo_seq).update(
+                    ultimo_seq=cambios[-1]['seq'], fallos=0, proximo_intento=None, ultimo_error=''
+                )
+                resultado['entregados'] += len(cambios)
+            else:
+                fallos = suscriptor.fallos + 1
+                pausa = espera(config.get('REINTENTOS', 3) + fallos, config)
+                SuscriptorWebhook.objects.filter(pk=suscriptor.pk).update(
+                    fallos=fallos,
+                    proximo_intento=timezone.now() + timedelta(seconds=pausa),
+                    ultimo_error=error[:500]
+                )
+                resultado['fallidos'] += 1
+        return resultado
+
+
+def despachar(pool) -> dict:
+    """
+    Un ciclo completo: envía un lote por suscriptor activo que no esté
+    pospuesto y espera todas las entregas.
+
+    Retorna {'entregados': cambios entregados, 'fallidos': suscriptores con error}.
+    """
+    return Despachador(pool).ciclo(todos=True)